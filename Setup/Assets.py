@@ -0,0 +1,210 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import os
+import re
+import gzip
+import json
+import hashlib
+import mimetypes
+from jinja2 import FileSystemBytecodeCache
+from Setup.Config import APP_Settings
+
+# Define Asset Folders Inside The Static Folder
+Source_Folder = 'src'
+Build_Folder = 'dist'
+Manifest_Name = 'manifest.json'
+
+# Define Cache Lifetime For Hashed Assets, One Year
+Asset_Max_Age = 31536000
+
+# Define Encodings In Preference Order
+Encodings = (('br', '.br'), ('gzip', '.gz'))
+
+# Minify CSS
+def Minify_CSS(Text):
+
+	# Drop Comments And Collapse Whitespace
+	Text = re.sub(r'/\*.*?\*/', '', Text, flags=re.S)
+	Text = re.sub(r'\s+', ' ', Text)
+
+	# Drop Spaces Around Punctuation And Trailing Semicolons
+	Text = re.sub(r'\s*([{}:;,>])\s*', r'\1', Text)
+	return Text.replace(';}', '}').strip()
+
+# Minify JS
+def Minify_JS(Text):
+
+	# Only Strip Indentation, Blank Lines And Whole Line Comments, Which Never Changes Behaviour
+	Lines = [Line.strip() for Line in Text.splitlines()]
+	return '\n'.join(Line for Line in Lines if Line and not Line.startswith('//'))
+
+# Define Minifiers Per Extension
+Minifiers = {'.css': Minify_CSS, '.js': Minify_JS}
+
+# Compress Brotli
+def Compress_Brotli(Data):
+
+	# Try to import the optional brotli package
+	try:
+		import brotli
+	except ImportError:
+		return None
+
+	# Return Compressed Data
+	return brotli.compress(Data, quality=11)
+
+# Build Assets
+def Build_Assets(Static_Path):
+
+	# Create Build Folder
+	Build_Path = os.path.join(Static_Path, Build_Folder)
+	os.makedirs(Build_Path, exist_ok=True)
+
+	# Minify, Hash And Compress Every Source Asset
+	Manifest, Report = {}, []
+	Source_Path = os.path.join(Static_Path, Source_Folder)
+	for Name in sorted(os.listdir(Source_Path)):
+
+		# Minify Known Types, Copy The Rest
+		Base, Extension = os.path.splitext(Name)
+		with open(os.path.join(Source_Path, Name), 'rb') as File:
+			Data = File.read()
+		if Extension in Minifiers:
+			Data = Minifiers[Extension](Data.decode('utf-8')).encode('utf-8')
+
+		# Name The File After Its Content, So A Changed Asset Gets A New URL
+		Built_Name = f'{Base}.{hashlib.md5(Data).hexdigest()[:10]}{Extension}'
+		Manifest[Name] = Built_Name
+
+		# Write Plain And Precompressed Copies, Without Timestamps So Builds Are Reproducible
+		Outputs = {'': Data, '.gz': gzip.compress(Data, 9, mtime=0), '.br': Compress_Brotli(Data)}
+		for Suffix, Output in Outputs.items():
+			if Output is not None:
+				with open(os.path.join(Build_Path, Built_Name + Suffix), 'wb') as File:
+					File.write(Output)
+
+		# Record Sizes
+		Report.append({'Name': Name, 'Built_Name': Built_Name, 'Source': os.path.getsize(os.path.join(Source_Path, Name)), **{Suffix or 'Minified': len(Output) if Output is not None else None for Suffix, Output in Outputs.items()}})
+
+	# Write Manifest Last, So Pages Only Point At Files That Exist
+	with open(os.path.join(Build_Path, Manifest_Name), 'w') as File:
+		json.dump(Manifest, File, indent=2, sort_keys=True)
+
+	# Return Report
+	return Report
+
+# Define Asset Manifest
+class Asset_Manifest:
+
+	# Initialize Manifest
+	def __init__(self, Static_Path, Auto_Reload):
+
+		# Set Manifest State
+		self.Build_Path = os.path.join(Static_Path, Build_Folder)
+		self.Auto_Reload = Auto_Reload
+		self.Assets = {}
+		self.Files = set()
+		self.Load_Time = None
+		self.Template_Version = ''
+
+	# Load Manifest
+	def Load(self):
+
+		# Read Once, Or Again After A Rebuild When Reloading Is On
+		Path = os.path.join(self.Build_Path, Manifest_Name)
+		if self.Load_Time is not None and not self.Auto_Reload:
+			return self.Assets
+
+		# Try to read the manifest
+		try:
+			Modified_Time = os.stat(Path).st_mtime
+			if Modified_Time != self.Load_Time:
+				with open(Path) as File:
+					self.Assets = json.load(File)
+				self.Files = set(self.Assets.values())
+				self.Load_Time = Modified_Time
+
+		# Serve Source Assets Until The First Build
+		except (OSError, ValueError):
+			self.Assets, self.Files, self.Load_Time = {}, set(), 0
+
+		# Return Assets
+		return self.Assets
+
+	# Get Asset URL
+	def Get_URL(self, Name, URL_For):
+
+		# Point At The Hashed Build, Or At The Source Before A Build
+		Built_Name = self.Load().get(Name)
+		if Built_Name:
+			return URL_For('Static_Asset', Name=Built_Name)
+		return URL_For('static', filename=f'{Source_Folder}/{Name}')
+
+	# Get Version
+	def Get_Version(self):
+
+		# Change With Every Template Or Asset Build, So Cached Pages Expire On Deploy
+		return hashlib.md5((self.Template_Version + json.dumps(self.Load(), sort_keys=True)).encode()).hexdigest()
+
+	# Resolve Asset
+	def Resolve(self, Name, Accept_Encodings):
+
+		# Serve Only Files Listed In The Manifest
+		self.Load()
+		if Name not in self.Files:
+			return None
+
+		# Pick The Smallest Precompressed Copy The Client Accepts
+		Path = os.path.join(self.Build_Path, Name)
+		Mimetype = mimetypes.guess_type(Name)[0] or 'application/octet-stream'
+		for Encoding, Suffix in Encodings:
+			if Accept_Encodings[Encoding] and os.path.exists(Path + Suffix):
+				return Path + Suffix, Mimetype, Encoding
+
+		# Return Plain Copy
+		return Path, Mimetype, None
+
+# Set Asset Headers
+def Set_Headers(Response, Encoding):
+
+	# Hashed Names Never Change Content, So Browsers May Keep Them For A Year
+	Response.headers['Cache-Control'] = f'public, max-age={Asset_Max_Age}, immutable'
+	Response.headers['Vary'] = 'Accept-Encoding'
+	if Encoding:
+		Response.headers['Content-Encoding'] = Encoding
+
+	# Return Response
+	return Response
+
+# Install Template And Asset Handling
+def Install(App, Is_Async=False):
+
+	# Stop Checking Template Files On Every Render Unless Asked To
+	App.config['TEMPLATES_AUTO_RELOAD'] = APP_Settings.TEMPLATE_AUTO_RELOAD
+
+	# Keep Compiled Templates On Disk, So New Workers Skip The Jinja Compiler, Apart Per App Since Async Templates Compile Differently
+	if APP_Settings.TEMPLATE_CACHE_PATH:
+		Cache_Path = os.path.join(APP_Settings.TEMPLATE_CACHE_PATH, 'Async' if Is_Async else 'Sync')
+		os.makedirs(Cache_Path, exist_ok=True)
+		App.jinja_options = dict(App.jinja_options, bytecode_cache=FileSystemBytecodeCache(Cache_Path))
+
+	# Expose Asset URLs To Templates
+	if Is_Async:
+		from quart import url_for
+	else:
+		from flask import url_for
+	Manifest = Asset_Manifest(App.static_folder, APP_Settings.TEMPLATE_AUTO_RELOAD)
+	App.jinja_env.globals['Asset_URL'] = lambda Name: Manifest.Get_URL(Name, url_for)
+
+	# Compile Every Template At Startup Instead Of On Its First Request, Hashing Their Sources On The Way
+	Sources = hashlib.md5()
+	for Name in sorted(App.jinja_env.list_templates()):
+		App.jinja_env.get_template(Name)
+		Sources.update(App.jinja_env.loader.get_source(App.jinja_env, Name)[0].encode())
+	Manifest.Template_Version = Sources.hexdigest()
+
+	# Return Manifest
+	return Manifest
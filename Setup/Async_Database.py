@@ -0,0 +1,187 @@
+# Setup Root Path
+import sys
+sys.path.append('/root/PostOffice')
+
+# Import Packages
+import os
+from sqlalchemy.exc import OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from contextlib import asynccontextmanager
+from Setup import Database, Dimension, Calibration, Device_Detail, Operators
+from Setup.Config import APP_Settings
+
+# Define Timed Async Queue Pool
+class Timed_Async_Queue_Pool(Database.Timed_Pool_Mixin, AsyncAdaptedQueuePool):
+	pass
+
+# Define Connection Arguments
+Connect_Args = {}
+if APP_Settings.DB_STATEMENT_TIMEOUT > 0:
+	Connect_Args['server_settings'] = {'statement_timeout': str(APP_Settings.DB_STATEMENT_TIMEOUT)}
+
+# Create Async Engine
+def Create_Async_Engine(Host, Port):
+
+	# Return Engine With Configured Pool
+	return create_async_engine(
+		f'postgresql+asyncpg://{APP_Settings.DB_USERNAME}:{APP_Settings.DB_PASSWORD}@{Host}:{Port}/{APP_Settings.DB_NAME}',
+		poolclass=Timed_Async_Queue_Pool,
+		pool_size=Database.DB_POOL_SIZE,
+		max_overflow=Database.DB_MAX_OVERFLOW,
+		pool_timeout=APP_Settings.DB_POOL_TIMEOUT,
+		pool_recycle=APP_Settings.DB_POOL_RECYCLE,
+		pool_pre_ping=APP_Settings.DB_POOL_PRE_PING,
+		connect_args=Connect_Args,
+	)
+
+# Create Async Database Engine
+DB_Async_Engine = Create_Async_Engine(APP_Settings.DB_HOSTNAME, APP_Settings.DB_PORT)
+
+# Create Async Read Replica Engine
+DB_Async_Replica_Engine = None
+if APP_Settings.DB_REPLICA_HOSTNAME:
+	DB_Async_Replica_Engine = Create_Async_Engine(APP_Settings.DB_REPLICA_HOSTNAME, APP_Settings.DB_REPLICA_PORT or APP_Settings.DB_PORT)
+
+# Define Read Only Engines Sharing The Pools Above
+DB_Async_Primary_Read_Engine = DB_Async_Engine.execution_options(postgresql_readonly=True)
+DB_Async_Read_Engine = DB_Async_Replica_Engine.execution_options(postgresql_readonly=True) if DB_Async_Replica_Engine is not None else DB_Async_Primary_Read_Engine
+
+# Reset Engines After Fork
+def Reset_Async_Engine():
+
+	# Give The Child Fresh Pools Without Closing The Parent's Connections
+	DB_Async_Engine.sync_engine.dispose(close=False)
+	if DB_Async_Replica_Engine is not None:
+		DB_Async_Replica_Engine.sync_engine.dispose(close=False)
+
+# Reset Engines In Every Forked Worker
+os.register_at_fork(after_in_child=Reset_Async_Engine)
+
+# Define Async Read Only Connection
+@asynccontextmanager
+async def DB_Async_Read_Connection():
+
+	# Try to connect to the read engine
+	try:
+
+		# Connect Read Engine
+		Connection = await DB_Async_Read_Engine.connect()
+
+	# Fall Back To The Primary When The Replica Is Unreachable
+	except OperationalError:
+
+		# Raise Error Without A Replica
+		if DB_Async_Replica_Engine is None:
+			raise
+
+		# Connect Primary
+		Connection = await DB_Async_Primary_Read_Engine.connect()
+
+	# Return Connection Inside A Read Only Transaction
+	try:
+		yield Connection
+	finally:
+		await Connection.close()
+
+# Read Rows
+async def Read_Rows(Statement):
+
+	# Open a read only connection without a session
+	async with DB_Async_Read_Connection() as Connection:
+
+		# Return Lightweight Row Tuples
+		return (await Connection.execute(Statement)).all()
+
+# Read Scalar
+async def Read_Scalar(Statement):
+
+	# Open a read only connection without a session
+	async with DB_Async_Read_Connection() as Connection:
+
+		# Return First Column Of First Row
+		return (await Connection.execute(Statement)).scalar()
+
+# Stream Rows
+async def Stream_Rows(Statement, Chunk_Size):
+
+	# Open a read only connection without a session
+	async with DB_Async_Read_Connection() as Connection:
+
+		# Fetch Through A Server Side Cursor One Chunk At A Time
+		Result = await Connection.stream(Statement.execution_options(yield_per=Chunk_Size))
+		async for Rows in Result.partitions():
+			yield Rows
+
+# Refresh Dimensions
+async def Refresh_Dimensions(Rows, Columns):
+
+	# Load Stale Maps Or Maps Missing A Key In This Batch, Recording Keys Still Missing So Formatting Never Reloads
+	for Table, Column in Columns.items():
+		Keys = {getattr(Row, Column) for Row in Rows}
+		if Dimension.Dimensions.Needs_Load(Table, Keys):
+
+			# Try to query the database
+			try:
+				Dimension.Dimensions.Store(Table, dict(await Read_Rows(Dimension.Dimensions.Get_Statement(Table))), Keys)
+
+			# Keep The Previous Map When The Load Failed
+			except SQLAlchemyError:
+				pass
+
+# Refresh Calibrations
+async def Refresh_Calibrations():
+
+	# Load Stale Calibration Lookup
+	if Calibration.Calibrations.Needs_Load():
+
+		# Try to query the database
+		try:
+			Calibration_Statement, Limit_Statement = Calibration.Calibrations.Get_Statements()
+			Calibration.Calibrations.Store(await Read_Rows(Calibration_Statement), await Read_Rows(Limit_Statement))
+
+		# Keep Serving The Previous Lookup, Never Falling Back To A Blocking Load
+		except SQLAlchemyError as e:
+			Calibration.Logger.warning('Calibration refresh failed, keeping the previous lookup: %s', str(e.orig if hasattr(e, 'orig') else e).splitlines()[0])
+
+# Refresh Operators
+async def Refresh_Operators(Keys):
+
+	# Load Stale Operator Map Or A Map Missing An Operator On This Page
+	if Operators.Directory.Needs_Load(Keys):
+
+		# Try to query the database
+		try:
+			Operators.Directory.Store(await Read_Rows(Operators.Directory.Get_Statement()), Keys)
+
+		# Keep The Previous Map When The Load Failed
+		except SQLAlchemyError:
+			pass
+
+# Load Device
+async def Load_Device(Device_ID):
+
+	# Open a read only connection
+	async with DB_Async_Read_Connection() as Connection:
+
+		# Create Session Without Commit
+		db = AsyncSession(bind=Connection)
+
+		# Try to load the page
+		try:
+
+			# Query Device With Its Attributes And Calibrations
+			Device = (await db.execute(Device_Detail.Build_Device_Query(Device_ID))).unique().scalar_one_or_none()
+			if Device is None:
+				return None
+
+			# Query Recent Streams And Logs
+			Streams = (await db.execute(Device_Detail.Build_Stream_Query(Device_ID))).unique().scalars().all()
+			Logs = (await db.execute(Device_Detail.Build_Log_Query(Device_ID))).all()
+
+			# Return Device Page
+			return Device_Detail.Format_Device(Device, Streams, Logs)
+
+		# Close Session
+		finally:
+			await db.close()
@@ -0,0 +1,161 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import Column, UniqueConstraint
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Database
+
+# Define Query Registry
+Query_Registry = {}
+
+# Register Query
+def Register_Query(Name, Builder):
+
+	# Store Query Builder
+	Query_Registry[Name] = Builder
+
+# Sample Cursor Key
+def Sample_Cursor_Key():
+
+	# Return A Cursor Key Pointing At The Newest Row
+	return datetime.now(timezone.utc), 2**31 - 1
+
+# Sample Range
+def Sample_Range():
+
+	# Return The Last Day Ending Now
+	End_Time = datetime.now(timezone.utc)
+	return End_Time - timedelta(days=1), End_Time
+
+# Get Index Key
+def Get_Index_Key(Index):
+
+	# Define Index Key
+	Key = []
+
+	# Resolve Column Names Through Ordering Modifiers
+	for Expression in Index.expressions:
+		while not isinstance(Expression, Column) and hasattr(Expression, 'element'):
+			Expression = Expression.element
+		Key.append(Expression.name if isinstance(Expression, Column) else str(Expression))
+
+	# Return Index Key
+	return tuple(Key)
+
+# Find Redundant Indexes
+def Find_Redundant_Indexes(Metadata=Database.Base.metadata):
+
+	# Define Findings
+	Findings = []
+
+	# Check Each Table
+	for Table in Metadata.sorted_tables:
+
+		# Collect Keys Backed By Implicit Unique Indexes
+		Implicit_Keys = [('primary key', tuple(Column.name for Column in Table.primary_key.columns))]
+		for Constraint in Table.constraints:
+			if isinstance(Constraint, UniqueConstraint):
+				Columns = tuple(Column.name for Column in Constraint.columns)
+				Implicit_Keys.append((Constraint.name or f'unique ({", ".join(Columns)})', Columns))
+		Implicit_Names = [Name for Name, Key in Implicit_Keys]
+
+		# Collect Declared Indexes, Partial Ones Only Hold Some Rows So They Neither Cover Nor Are Covered
+		Full_Indexes = [Index for Index in sorted(Table.indexes, key=lambda Index: Index.name) if Index.dialect_options['postgresql']['where'] is None]
+		Declared_Keys = [(Index.name, Get_Index_Key(Index)) for Index in Full_Indexes]
+
+		# Check Each Declared Non Unique Index
+		for Index in Full_Indexes:
+
+			# Skip Indexes That Enforce Uniqueness
+			if Index.unique:
+				continue
+
+			# Get Index Key
+			Name, Key = Index.name, Get_Index_Key(Index)
+
+			# Compare Against Every Wider Or Equal Key
+			for Other_Name, Other_Key in Implicit_Keys + Declared_Keys:
+
+				# Skip Self
+				if Other_Name == Name or Other_Key[:len(Key)] != Key:
+					continue
+
+				# Leading Prefix Of A Wider, Unique Or Earlier Duplicate Key Makes The Index Redundant
+				if len(Other_Key) > len(Key) or Other_Name in Implicit_Names or Other_Name < Name:
+					Findings.append((Table.name, Name, Other_Name))
+					break
+
+	# Return Findings
+	return Findings
+
+# Find Sequential Scans
+def Find_Sequential_Scans(Plan):
+
+	# Collect Scanned Relations
+	Relations = [Plan['Relation Name']] if Plan.get('Node Type') == 'Seq Scan' else []
+
+	# Walk Child Plans
+	for Child in Plan.get('Plans', []):
+		Relations += Find_Sequential_Scans(Child)
+
+	# Return Relations
+	return Relations
+
+# Explain Query
+def Explain_Query(Connection, Statement):
+
+	# Compile Statement For The Driver
+	Compiled = Statement.compile(dialect=Connection.dialect)
+
+	# Run Explain Without Executing The Query
+	Result = Connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {Compiled}', Compiled.params).scalar()
+
+	# Return Root Plan
+	return Result[0]['Plan']
+
+# Run Audit
+def Run_Audit():
+
+	# Define Clean Flag
+	Is_Clean = True
+
+	# Open a database connection
+	with Database.DB_Engine.connect() as Connection:
+
+		# Force Index Paths Where Any Exist
+		Connection.exec_driver_sql('SET enable_seqscan = off')
+
+		# Explain Each Registered Query
+		for Name, Builder in Query_Registry.items():
+
+			# Try to explain the query inside a savepoint
+			try:
+				with Connection.begin_nested():
+					Relations = Find_Sequential_Scans(Explain_Query(Connection, Builder()))
+
+			# Report Queries That Cannot Be Planned
+			except SQLAlchemyError as e:
+				Is_Clean = False
+				print(f'[ERROR] {Name}: {str(e.orig if hasattr(e, "orig") else e).splitlines()[0]}')
+				continue
+
+			# Report Query
+			if Relations:
+				Is_Clean = False
+				print(f'[SEQ SCAN] {Name}: {", ".join(sorted(set(Relations)))}')
+			else:
+				print(f'[OK] {Name}')
+
+		# Roll Back Session Settings
+		Connection.rollback()
+
+	# Report Redundant Indexes
+	for Table_Name, Index_Name, Covering_Name in Find_Redundant_Indexes():
+		Is_Clean = False
+		print(f'[REDUNDANT] {Table_Name}.{Index_Name} is covered by {Covering_Name}: DROP INDEX "{Index_Name}";')
+
+	# Return Clean Flag
+	return Is_Clean
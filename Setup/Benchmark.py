@@ -0,0 +1,406 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import os
+import json
+import time
+import platform
+import resource
+import subprocess
+import threading
+import numpy
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import select, func, cast, literal, true, String, Float
+from sqlalchemy.dialects.postgresql import insert, array
+from Setup import Database, Models, Audit, Query, Cache
+from Setup.Config import APP_Settings
+
+# Define Benchmark Prefix
+Prefix = 'BENCH'
+
+# Define Benchmark Variables (Variable_ID, Description, Unit, Min, Max)
+Benchmark_Variables = (
+	('BENCH_T', 'Benchmark Temperature', 'C', -40, 85),
+	('BENCH_H', 'Benchmark Humidity', '%', 0, 100),
+	('BENCH_V', 'Benchmark Battery', 'V', 0, 5),
+)
+
+# Define Benchmark Dimension Rows (Model, Conflict Column, Rows)
+Benchmark_Dimensions = (
+	(Models.Status, 'Description', [{'Description': f'{Prefix} Active'}]),
+	(Models.Model, 'Model_Name', [{'Model_Name': f'{Prefix} Model'}]),
+	(Models.Manufacturer, 'Manufacturer_Name', [{'Manufacturer_Name': f'{Prefix} Manufacturer'}]),
+	(Models.Project, 'Project_Name', [{'Project_Name': f'{Prefix} Project'}]),
+	(Models.Data_Segment, 'Segment_Name', [{'Segment_Name': f'{Prefix} Segment', 'Description': 'Benchmark'}]),
+	(Models.Log_Level, 'Log_Level_Name', [{'Log_Level_Name': f'{Prefix}_{Level}', 'Log_Level_Description': 'Benchmark'} for Level in ('INFO', 'WARN', 'ERROR')]),
+	(Models.Service, 'Service_Name', [{'Service_Name': f'{Prefix} Service', 'Service_Description': 'Benchmark'}]),
+	(Models.Log_Description, 'Log_Description', [{'Log_Description': f'{Prefix} {Text}'} for Text in ('Stream Received', 'Parse Failed', 'Device Offline')]),
+	(Models.Connection, 'IP_Address', [{'IP_Address': f'10.255.0.{Index}'} for Index in range(1, 5)]),
+)
+
+# Define Benchmark Routes
+Benchmark_Routes = (
+	('Home', '/'),
+	('Log Feed', '/api/logs'),
+	('Log Feed By Device', f'/api/logs?device={Prefix}-000001'),
+	('Fleet', '/fleet'),
+	('Device Page', f'/device/{Prefix}-000001'),
+	('Series', f'/api/series?variable=BENCH_T&device={Prefix}-000001'),
+	('Fleet Series', '/api/series?variable=BENCH_T'),
+	('Rule Triggers', '/rules/triggers'),
+	('Operators', '/operators'),
+	('Unknown Data Groups', '/unknown'),
+	('Unknown Data Search', '/unknown?q=timeout'),
+	('Firmware Rollout', '/firmware'),
+)
+
+# Define Seeded Tables
+Seeded_Tables = ('Device', 'Stream', 'Measurement', 'Log')
+
+# Get Device ID Expression
+def Device_ID_Expression(Number):
+
+	# Zero Pad So Device IDs Sort Like Their Numbers
+	return literal(f'{Prefix}-') + func.lpad(cast(Number, String), 6, '0')
+
+# Get ICCID Expression
+def ICCID_Expression(Number):
+
+	# Give Each Device Its Own SIM
+	return literal(Prefix) + func.lpad(cast(Number, String), 12, '0')
+
+# Pick Expression
+def Pick(Values, Number):
+
+	# Spread Rows Over A Fixed List Of IDs
+	return array(Values)[Number % len(Values) + 1]
+
+# Get Time Expression
+def Time_Expression(Number, Start_Epoch, Step):
+
+	# Space Rows Evenly Across The Seeded Range
+	return func.to_timestamp(Start_Epoch + cast(Number, Float) * Step)
+
+# Get IDs
+def Get_IDs(Connection, Key, Column, Values):
+
+	# Return Primary Keys Of Seeded Rows In A Stable Order
+	return Connection.execute(select(Key).where(Column.in_(Values)).order_by(Key)).scalars().all()
+
+# Seed Dimensions
+def Seed_Dimensions(Connection, Devices):
+
+	# Upsert Fixed Dimension Rows
+	for Model, Conflict_Column, Rows in Benchmark_Dimensions:
+		Connection.execute(insert(Model).values(Rows).on_conflict_do_nothing(index_elements=[Conflict_Column]))
+
+	# Add Firmware Versions Once
+	Firmwares = [f'{Prefix}-{Index}.0' for Index in range(1, 6)]
+	if not Get_IDs(Connection, Models.Version.Version_ID, Models.Version.Firmware, Firmwares):
+		Connection.execute(insert(Models.Version).values([{'Firmware': Firmware} for Firmware in Firmwares]))
+
+	# Add Operators Once
+	if not Get_IDs(Connection, Models.GSM_Operator.Operator_ID, Models.GSM_Operator.MNC_Brand_Name, [f'{Prefix} Operator 1', f'{Prefix} Operator 2']):
+		Connection.execute(insert(Models.GSM_Operator).values([{'MCC_ID': 999, 'MCC_ISO': 'XX', 'MCC_Country_Name': 'Benchmark', 'MNC_ID': Index, 'MNC_Brand_Name': f'{Prefix} Operator {Index}', 'MNC_Operator_Name': f'{Prefix} Operator {Index}'} for Index in (1, 2)]))
+
+	# Resolve Dimension Keys
+	Keys = {
+		'Status': Get_IDs(Connection, Models.Status.Status_ID, Models.Status.Description, [f'{Prefix} Active']),
+		'Version': Get_IDs(Connection, Models.Version.Version_ID, Models.Version.Firmware, Firmwares),
+		'Model': Get_IDs(Connection, Models.Model.Model_ID, Models.Model.Model_Name, [f'{Prefix} Model']),
+		'Manufacturer': Get_IDs(Connection, Models.Manufacturer.Manufacturer_ID, Models.Manufacturer.Manufacturer_Name, [f'{Prefix} Manufacturer']),
+		'Project': Get_IDs(Connection, Models.Project.Project_ID, Models.Project.Project_Name, [f'{Prefix} Project']),
+		'Segment': Get_IDs(Connection, Models.Data_Segment.Segment_ID, Models.Data_Segment.Segment_Name, [f'{Prefix} Segment']),
+		'Operator': Get_IDs(Connection, Models.GSM_Operator.Operator_ID, Models.GSM_Operator.MNC_Brand_Name, [f'{Prefix} Operator 1', f'{Prefix} Operator 2']),
+		'Log_Level': Get_IDs(Connection, Models.Log_Level.Log_Level_ID, Models.Log_Level.Log_Level_Name, [Row['Log_Level_Name'] for Row in Benchmark_Dimensions[5][2]]),
+		'Service': Get_IDs(Connection, Models.Service.Service_ID, Models.Service.Service_Name, [f'{Prefix} Service']),
+		'Log_Description': Get_IDs(Connection, Models.Log_Description.Log_Description_ID, Models.Log_Description.Log_Description, [Row['Log_Description'] for Row in Benchmark_Dimensions[7][2]]),
+	}
+
+	# Upsert Variables
+	Connection.execute(insert(Models.Variable).values([{'Variable_ID': Variable_ID, 'Variable_Description': Description, 'Variable_Unit': Unit, 'Variable_Min_Value': Low, 'Variable_Max_Value': High, 'Segment_ID': Keys['Segment'][0]} for Variable_ID, Description, Unit, Low, High in Benchmark_Variables]).on_conflict_do_nothing(index_elements=['Variable_ID']))
+
+	# Generate Device Numbers
+	Number = func.generate_series(1, Devices).column_valued('Number')
+
+	# Add One Modem And SIM Per Device
+	Connection.execute(insert(Models.Modem).from_select(['IMEI', 'Model_ID', 'Manufacturer_ID'], select(literal('99') + func.lpad(cast(Number, String), 13, '0'), literal(Keys['Model'][0]), literal(Keys['Manufacturer'][0]))).on_conflict_do_nothing(index_elements=['IMEI']))
+	Connection.execute(insert(Models.SIM).from_select(['ICCID', 'Operator_ID'], select(ICCID_Expression(Number), Pick(Keys['Operator'], Number))).on_conflict_do_nothing(index_elements=['ICCID']))
+
+	# Add Devices
+	Connection.execute(insert(Models.Device).from_select(
+		['Device_ID', 'Status_ID', 'Version_ID', 'Project_ID', 'Model_ID', 'Manufacturer_ID', 'IMEI', 'Device_Name'],
+		select(
+			Device_ID_Expression(Number),
+			literal(Keys['Status'][0]),
+			Pick(Keys['Version'], Number),
+			literal(Keys['Project'][0]),
+			literal(Keys['Model'][0]),
+			literal(Keys['Manufacturer'][0]),
+			literal('99') + func.lpad(cast(Number, String), 13, '0'),
+			literal('Benchmark Device ') + cast(Number, String),
+		),
+	).on_conflict_do_nothing(index_elements=['Device_ID']))
+
+	# Return Dimension Keys
+	return Keys
+
+# Seed Streams
+def Seed_Streams(Connection, Keys, Devices, Low, High, Start_Epoch, Step):
+
+	# Generate Stream Numbers
+	Series = func.generate_series(Low, High - 1).table_valued('Number').render_derived()
+	Device_Number = Series.c.Number % Devices + 1
+
+	# Remember Where This Batch Starts
+	First_ID = Connection.execute(select(func.coalesce(func.max(Models.Stream.Stream_ID), 0))).scalar()
+
+	# Add Streams Round Robin Over The Fleet
+	Connection.execute(insert(Models.Stream).from_select(
+		['Device_ID', 'SIM_ID', 'IP_Address', 'Size', 'Device_Time', 'Stream_Time'],
+		select(
+			Device_ID_Expression(Device_Number),
+			Models.SIM.SIM_ID,
+			Pick([Row['IP_Address'] for Row in Benchmark_Dimensions[8][2]], Series.c.Number),
+			100 + Series.c.Number % 50,
+			Time_Expression(Series.c.Number, Start_Epoch, Step),
+			Time_Expression(Series.c.Number, Start_Epoch, Step),
+		).select_from(Series).join(Models.SIM, Models.SIM.ICCID == ICCID_Expression(Device_Number)),
+	))
+
+	# Add One Measurement Per Variable Per Stream With A Repeatable Value
+	Variables = func.unnest(array([Row[0] for Row in Benchmark_Variables])).table_valued('Variable_ID').render_derived()
+	Connection.execute(insert(Models.Measurement).from_select(
+		['Stream_ID', 'Variable_ID', 'Measurement_Value', 'Create_Time'],
+		select(
+			Models.Stream.Stream_ID,
+			Variables.c.Variable_ID,
+			50 + 25 * func.sin(Models.Stream.Stream_ID / 97.0) + func.length(Variables.c.Variable_ID),
+			Models.Stream.Stream_Time,
+		).select_from(Models.Stream).join(Variables, true()).where(
+			Models.Stream.Stream_ID > First_ID,
+			Models.Stream.Device_ID.startswith(f'{Prefix}-'),
+		),
+	))
+
+# Seed Logs
+def Seed_Logs(Connection, Keys, Devices, Low, High, Start_Epoch, Step):
+
+	# Generate Log Numbers
+	Number = func.generate_series(Low, High - 1).column_valued('Number')
+
+	# Add Logs Round Robin Over The Fleet
+	Connection.execute(insert(Models.Log).from_select(
+		['Log_Level_ID', 'Log_Description_ID', 'Service_ID', 'Device_ID', 'Log_Message', 'Create_Time'],
+		select(
+			Pick(Keys['Log_Level'], Number),
+			Pick(Keys['Log_Description'], Number // 3),
+			literal(Keys['Service'][0]),
+			Device_ID_Expression(Number % Devices + 1),
+			literal('Benchmark log ') + cast(Number, String),
+			Time_Expression(Number, Start_Epoch, Step),
+		),
+	))
+
+# Seed In Batches
+def Seed_Batches(Name, Seed, Keys, Devices, Rows, Days, Batch_Size):
+
+	# Space Rows Over The Last Days Ending Now
+	End_Epoch = time.time()
+	Start_Epoch = End_Epoch - Days * 86400
+	Step = Days * 86400 / max(Rows, 1)
+
+	# Insert One Batch Per Transaction
+	for Low in range(0, Rows, Batch_Size):
+		Start = time.monotonic()
+		with Database.DB_Engine.begin() as Connection:
+			Seed(Connection, Keys, Devices, Low, min(Low + Batch_Size, Rows), Start_Epoch, Step)
+		yield Name, min(Low + Batch_Size, Rows), (min(Low + Batch_Size, Rows) - Low) / max(time.monotonic() - Start, 1e-9)
+
+# Seed Fleet
+def Seed_Fleet(Devices=1000, Streams=1000000, Logs=1000000, Days=30, Batch_Size=100000):
+
+	# Create Missing Tables
+	Database.Base.metadata.create_all(Database.DB_Engine)
+
+	# Add Dimensions And Devices
+	with Database.DB_Engine.begin() as Connection:
+		Keys = Seed_Dimensions(Connection, Devices)
+	yield 'Device', Devices, None
+
+	# Add Streams With Their Measurements, Then Logs
+	yield from Seed_Batches('Stream', Seed_Streams, Keys, Devices, Streams, Days, Batch_Size)
+	yield from Seed_Batches('Log', Seed_Logs, Keys, Devices, Logs, Days, Batch_Size)
+
+	# Refresh Planner Statistics
+	with Database.DB_Engine.connect().execution_options(isolation_level='AUTOCOMMIT') as Connection:
+		for Table_Name in Seeded_Tables:
+			Connection.exec_driver_sql(f'ANALYZE "{Table_Name}"')
+
+# Count Rows
+def Count_Rows():
+
+	# Read Planner Estimates Instead Of Scanning Large Tables
+	with Database.DB_Engine.connect() as Connection:
+		Rows = Connection.exec_driver_sql('SELECT relname, reltuples::bigint FROM pg_class WHERE relname = ANY(%(Names)s)', {'Names': list(Seeded_Tables)}).all()
+
+	# Return Estimates By Table
+	return {Name: max(Count, 0) for Name, Count in Rows}
+
+# Get Revision
+def Get_Revision():
+
+	# Try to read the checked out commit
+	try:
+		return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+
+	# Outside A Git Checkout
+	except (OSError, subprocess.CalledProcessError):
+		return None
+
+# Get Peak Memory
+def Get_Peak_Memory():
+
+	# Return Peak Resident Set Size In Megabytes (Kilobytes On Linux, Bytes On macOS)
+	Peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return Peak / (1024 * 1024) if sys.platform == 'darwin' else Peak / 1024
+
+# Get Route Targets
+def Get_Route_Targets(App):
+
+	# Give Each Thread Its Own Test Client
+	Clients = threading.local()
+
+	# Build Route Callable
+	def Route(Path):
+
+		# Call Route
+		def Call():
+
+			# Create Client Once Per Thread
+			if not hasattr(Clients, 'Client'):
+				Clients.Client = App.test_client()
+
+			# Request Route And Read The Whole Body
+			Response = Clients.Client.get(Path)
+			Response.get_data()
+			return Response.status_code < 500
+
+		# Return Callable
+		return Call
+
+	# Return Route Targets
+	return [(f'GET {Name}', Route(Path)) for Name, Path in Benchmark_Routes]
+
+# Get Query Targets
+def Get_Query_Targets():
+
+	# Build Query Callable
+	def Run(Builder):
+
+		# Run Registered Query
+		def Call():
+			Query.Read_Rows(Builder())
+			return True
+
+		# Return Callable
+		return Call
+
+	# Return Every Audited UI Query
+	return [(f'SQL {Name}', Run(Builder)) for Name, Builder in Audit.Query_Registry.items()]
+
+# Time Call
+def Time_Call(Call):
+
+	# Try to run the call
+	Start = time.perf_counter()
+	try:
+		Is_OK = Call()
+
+	# Count Exceptions As Errors
+	except Exception:
+		Is_OK = False
+
+	# Return Latency And Outcome
+	return time.perf_counter() - Start, Is_OK
+
+# Run Target
+def Run_Target(Call, Concurrency, Requests, Warmup):
+
+	# Run Concurrent Calls On A Fixed Worker Pool
+	with ThreadPoolExecutor(max_workers=Concurrency) as Executor:
+
+		# Warm Caches And Pool Connections Outside The Measurement
+		list(Executor.map(lambda Index: Time_Call(Call), range(Warmup)))
+
+		# Measure Calls
+		Start = time.perf_counter()
+		Results = list(Executor.map(lambda Index: Time_Call(Call), range(Requests)))
+		Elapsed = time.perf_counter() - Start
+
+	# Summarize Latency In Milliseconds
+	Latency = numpy.array([Result[0] for Result in Results]) * 1000
+	P50, P95, P99 = numpy.percentile(Latency, (50, 95, 99))
+
+	# Return Target Result
+	return {
+		'Requests': Requests,
+		'Errors': sum(1 for Result in Results if not Result[1]),
+		'P50_MS': round(float(P50), 3),
+		'P95_MS': round(float(P95), 3),
+		'P99_MS': round(float(P99), 3),
+		'Mean_MS': round(float(Latency.mean()), 3),
+		'Max_MS': round(float(Latency.max()), 3),
+		'Throughput': round(Requests / Elapsed, 2),
+		'Peak_RSS_MB': round(Get_Peak_Memory(), 1),
+	}
+
+# Run Benchmark
+def Run_Benchmark(App, Concurrency=8, Requests=200, Warmup=20, Use_Cache=False, Filter=None):
+
+	# Measure Uncached Work Unless Asked Otherwise, Skipping Both The Backend And Request Coalescing
+	Previous_Bypass = Cache.Results.Bypass
+	Cache.Results.Bypass = not Use_Cache
+
+	# Try to run every target
+	try:
+
+		# Collect Targets
+		Targets = [(Name, Call) for Name, Call in Get_Route_Targets(App) + Get_Query_Targets() if Filter is None or Filter.lower() in Name.lower()]
+
+		# Define Run Result
+		Result = {
+			'Time': datetime.now(timezone.utc).isoformat(),
+			'Revision': Get_Revision(),
+			'Python': platform.python_version(),
+			'Concurrency': Concurrency,
+			'Requests': Requests,
+			'Cache': Use_Cache,
+			'Pool_Size': Database.DB_POOL_SIZE,
+			'Rows': Count_Rows(),
+			'Targets': {},
+		}
+
+		# Run Each Target In Turn
+		for Name, Call in Targets:
+			Result['Targets'][Name] = Run_Target(Call, Concurrency, Requests, Warmup)
+			yield Name, Result['Targets'][Name]
+
+	# Restore The Cache For Whatever Runs In This Process Next
+	finally:
+		Cache.Results.Bypass = Previous_Bypass
+
+	# Add Pool Statistics
+	Result['Pool'] = Database.Get_Pool_Status()
+
+	# Write Result File
+	os.makedirs(APP_Settings.BENCHMARK_PATH, exist_ok=True)
+	Path = os.path.join(APP_Settings.BENCHMARK_PATH, f'{datetime.now(timezone.utc):%Y%m%d_%H%M%S}.json')
+	with open(Path, 'w') as File:
+		json.dump(Result, File, indent=2, default=str)
+
+	# Return Result File
+	yield Path, None
@@ -0,0 +1,216 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import json
+import time
+import asyncio
+import hashlib
+import threading
+from Setup.Config import APP_Settings
+
+# Define Memory Backend
+class Memory_Backend:
+
+	# Initialize Backend
+	def __init__(self, Max_Entries=1024):
+
+		# Set Backend State
+		self.Max_Entries = Max_Entries
+		self.Entries = {}
+		self.Lock = threading.Lock()
+
+	# Get Entry
+	def Get(self, Key):
+
+		# Look Up Entry
+		Item = self.Entries.get(Key)
+
+		# Return Live Entries Only
+		if Item is None or Item[0] < time.monotonic():
+			return None
+		return Item[1]
+
+	# Set Entry
+	def Set(self, Key, Entry, TTL):
+
+		# Store Entry
+		with self.Lock:
+
+			# Drop Expired Entries When Full
+			if len(self.Entries) >= self.Max_Entries:
+				Now = time.monotonic()
+				self.Entries = {Old_Key: Item for Old_Key, Item in self.Entries.items() if Item[0] >= Now}
+
+			# Drop Oldest Entries When Still Full
+			while len(self.Entries) >= self.Max_Entries:
+				self.Entries.pop(next(iter(self.Entries)))
+
+			# Store Entry With Expiry
+			self.Entries[Key] = (time.monotonic() + TTL, Entry)
+
+# Define Redis Backend
+class Redis_Backend:
+
+	# Initialize Backend
+	def __init__(self, URL):
+
+		# Import Optional Client
+		try:
+			import redis
+		except ImportError:
+			raise RuntimeError('RESULT_CACHE_URL requires the redis package')
+
+		# Connect Client
+		self.Client = redis.Redis.from_url(URL)
+
+	# Get Entry
+	def Get(self, Key):
+
+		# Look Up Entry
+		Value = self.Client.get(Key)
+
+		# Return Decoded Entry
+		return None if Value is None else json.loads(Value)
+
+	# Set Entry
+	def Set(self, Key, Entry, TTL):
+
+		# Store Entry With Expiry
+		self.Client.set(Key, json.dumps(Entry, default=str), px=max(1, int(TTL * 1000)))
+
+# Get Backend
+def Get_Backend(URL):
+
+	# Use Shared Backend When Configured
+	if URL.startswith(('redis://', 'rediss://', 'unix://')):
+		return Redis_Backend(URL)
+
+	# Use In Process Backend
+	return Memory_Backend()
+
+# Make Cache Key
+def Make_Key(Name, *Arguments):
+
+	# Hash Arguments
+	return f'postoffice-ui:{Name}:' + hashlib.sha1(repr(Arguments).encode()).hexdigest()
+
+# Make Entry
+def Make_Entry(Value):
+
+	# Wrap Value, ETags Come From The Data Version Instead Of The Content
+	return {'Value': Value}
+
+# Define Result Cache
+class Result_Cache:
+
+	# Initialize Cache
+	def __init__(self, Backend, TTL):
+
+		# Set Cache State
+		self.Backend = Backend
+		self.TTL = TTL
+		self.Bypass = False
+		self.Lock = threading.Lock()
+		self.In_Flight = {}
+		self.Async_In_Flight = {}
+
+	# Get Entry
+	def Get(self, Key, Loader):
+
+		# Load Every Call On Its Own While Bypassed
+		if self.Bypass:
+			return Make_Entry(Loader())
+
+		# Return Cached Entry
+		Entry = self.Backend.Get(Key)
+		if Entry is not None:
+			return Entry
+
+		# Join Or Lead The Load For This Key
+		with self.Lock:
+			Flight = self.In_Flight.get(Key)
+			Is_Leader = Flight is None
+			if Is_Leader:
+				Flight = self.In_Flight[Key] = {'Event': threading.Event(), 'Entry': None}
+
+		# Wait For The Leader
+		if not Is_Leader:
+			Flight['Event'].wait()
+
+			# Load Directly When The Leader Failed
+			return Flight['Entry'] if Flight['Entry'] is not None else Make_Entry(Loader())
+
+		# Try to load entry
+		try:
+
+			# Load And Store Entry
+			Entry = Make_Entry(Loader())
+			self.Backend.Set(Key, Entry, self.TTL)
+			Flight['Entry'] = Entry
+
+			# Return Entry
+			return Entry
+
+		# Release Waiting Requests
+		finally:
+			with self.Lock:
+				self.In_Flight.pop(Key, None)
+			Flight['Event'].set()
+
+	# Get Entry Inside An Event Loop
+	async def Async_Get(self, Key, Loader):
+
+		# Load Every Call On Its Own While Bypassed
+		if self.Bypass:
+			return Make_Entry(await Loader())
+
+		# Return Cached Entry
+		Entry = await self.Call(self.Backend.Get, Key)
+		if Entry is not None:
+			return Entry
+
+		# Join The Load Already Running For This Key
+		Flight = self.Async_In_Flight.get(Key)
+		if Flight is not None:
+			return await asyncio.shield(Flight)
+
+		# Lead The Load For This Key
+		Flight = self.Async_In_Flight[Key] = asyncio.get_running_loop().create_future()
+
+		# Try to load entry
+		try:
+
+			# Load And Store Entry
+			Entry = Make_Entry(await Loader())
+			await self.Call(self.Backend.Set, Key, Entry, self.TTL)
+			Flight.set_result(Entry)
+
+			# Return Entry
+			return Entry
+
+		# Fail Waiting Requests With The Same Error
+		except Exception as e:
+			Flight.set_exception(e)
+			Flight.exception()
+			raise
+
+		# Release The Key
+		finally:
+			self.Async_In_Flight.pop(Key, None)
+			if not Flight.done():
+				Flight.cancel()
+
+	# Call Backend Without Blocking The Event Loop
+	async def Call(self, Method, *Arguments):
+
+		# Memory Backend Never Blocks
+		if isinstance(self.Backend, Memory_Backend):
+			return Method(*Arguments)
+
+		# Run Network Backends In A Thread
+		return await asyncio.to_thread(Method, *Arguments)
+
+# Set Result Cache
+Results = Result_Cache(Get_Backend(APP_Settings.RESULT_CACHE_URL), APP_Settings.RESULT_CACHE_TTL)
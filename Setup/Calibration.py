@@ -0,0 +1,120 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import logging
+import threading
+from collections import namedtuple
+import numpy
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Models, Query
+from Setup.Config import APP_Settings
+
+# Define Calibration Logger
+Logger = logging.getLogger('PostOffice.Calibration')
+
+# Define Calibration Lookup, Swapped As A Whole So Readers Never Mix Two Loads
+Calibration_Lookup = namedtuple('Calibration_Lookup', ['Pair_Index', 'Gain', 'Offset', 'Variable_Index', 'Lower', 'Upper'])
+
+# Define Calibration Table
+class Calibration_Table:
+
+	# Initialize Table
+	def __init__(self, TTL):
+
+		# Set Table State
+		self.TTL = TTL
+		self.Lock = threading.Lock()
+
+		# Set Empty Lookup Until The First Load
+		self.Store([], [])
+		self.Load_Time = float('-inf')
+
+	# Get Calibration Statements
+	def Get_Statements(self):
+
+		# Query Only Lookup Columns
+		return (
+			select(Models.Calibration.Device_ID, Models.Calibration.Variable_ID, Models.Calibration.Gain, Models.Calibration.Offset),
+			select(Models.Variable.Variable_ID, Models.Variable.Variable_Min_Value, Models.Variable.Variable_Max_Value),
+		)
+
+	# Check Table Freshness
+	def Needs_Load(self):
+
+		# Missing Or Expired
+		return time.monotonic() - self.Load_Time > self.TTL
+
+	# Store Calibration Lookup
+	def Store(self, Calibration_Rows, Limit_Rows):
+
+		# Index Calibrations By Device And Variable, Slot Zero Is The Identity
+		Pair_Index = {(Row[0], Row[1]): Index + 1 for Index, Row in enumerate(Calibration_Rows)}
+		Gain = numpy.array([1.0] + [Row[2] for Row in Calibration_Rows], dtype=numpy.float64)
+		Offset = numpy.array([0.0] + [Row[3] for Row in Calibration_Rows], dtype=numpy.float64)
+
+		# Index Limits By Variable, Slot Zero Is Unbounded
+		Variable_Index = {Row[0]: Index + 1 for Index, Row in enumerate(Limit_Rows)}
+		Lower = numpy.array([-numpy.inf] + [-numpy.inf if Row[1] is None else Row[1] for Row in Limit_Rows], dtype=numpy.float64)
+		Upper = numpy.array([numpy.inf] + [numpy.inf if Row[2] is None else Row[2] for Row in Limit_Rows], dtype=numpy.float64)
+
+		# Swap In The New Lookup
+		with self.Lock:
+			self.Lookup = Calibration_Lookup(Pair_Index, Gain, Offset, Variable_Index, Lower, Upper)
+			self.Load_Time = time.monotonic()
+
+	# Load Calibration Table
+	def Load(self):
+
+		# Try to query the database
+		try:
+
+			# Query Calibrations And Variable Limits
+			Calibration_Statement, Limit_Statement = self.Get_Statements()
+			self.Store(Query.Read_Rows(Calibration_Statement), Query.Read_Rows(Limit_Statement))
+
+		# Keep The Previous Lookup When The Load Failed
+		except SQLAlchemyError as e:
+			Logger.warning('Calibration load failed, keeping the previous lookup: %s', str(e.orig if hasattr(e, 'orig') else e).splitlines()[0])
+
+	# Refresh Expired Lookup
+	def Refresh(self):
+
+		# Reload Missing Or Expired Lookup
+		if self.Needs_Load():
+			self.Load()
+
+	# Get Value Array
+	def Get_Values(self, Values):
+
+		# Missing Readings Become NaN And Stay NaN
+		return numpy.array(Values, dtype=numpy.float64)
+
+	# Apply Calibration To One Device Variable, Callers Refresh The Lookup First
+	def Apply(self, Device_ID, Variable_ID, Values):
+
+		# Resolve Coefficients And Limits Once For The Whole Array, From One Lookup
+		Lookup = self.Lookup
+		Pair = Lookup.Pair_Index.get((Device_ID, Variable_ID), 0)
+		Variable = Lookup.Variable_Index.get(Variable_ID, 0)
+
+		# Scale, Shift And Clip In One Pass
+		return numpy.clip(self.Get_Values(Values) * Lookup.Gain[Pair] + Lookup.Offset[Pair], Lookup.Lower[Variable], Lookup.Upper[Variable])
+
+	# Apply Calibration To Mixed Rows, Callers Refresh The Lookup First
+	def Apply_Batch(self, Device_IDs, Variable_IDs, Values):
+
+		# Resolve Each Distinct Key Once, From One Lookup
+		Lookup = self.Lookup
+		Pair_Slots, Variable_Slots = {}, {}
+		Pair = numpy.fromiter((Pair_Slots[Key] if Key in Pair_Slots else Pair_Slots.setdefault(Key, Lookup.Pair_Index.get(Key, 0)) for Key in zip(Device_IDs, Variable_IDs)), dtype=numpy.int64, count=len(Values))
+		Variable = numpy.fromiter((Variable_Slots[Key] if Key in Variable_Slots else Variable_Slots.setdefault(Key, Lookup.Variable_Index.get(Key, 0)) for Key in Variable_IDs), dtype=numpy.int64, count=len(Values))
+
+		# Scale, Shift And Clip In One Pass
+		return numpy.clip(self.Get_Values(Values) * Lookup.Gain[Pair] + Lookup.Offset[Pair], Lookup.Lower[Variable], Lookup.Upper[Variable])
+
+# Set Calibration Table
+Calibrations = Calibration_Table(APP_Settings.DIMENSION_CACHE_TTL)
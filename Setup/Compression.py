@@ -0,0 +1,191 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import zlib
+from Setup.Config import APP_Settings
+
+# Define Compressible Types, Event Streams Stay Plain So Live Rows Are Never Held In A Compressor
+Compressible_Types = {
+	'text/html',
+	'text/css',
+	'text/plain',
+	'text/csv',
+	'text/javascript',
+	'application/javascript',
+	'application/json',
+	'application/xml',
+	'image/svg+xml',
+}
+
+# Define Compression Levels, Moderate Because Pages Are Compressed Per Request
+Gzip_Level = 6
+Brotli_Quality = 5
+
+# Get Brotli
+def Get_Brotli():
+
+	# Try to import the optional brotli package
+	try:
+		import brotli
+		return brotli
+	except ImportError:
+		return None
+
+# Define Stream Compressor
+class Stream_Compressor:
+
+	# Initialize Compressor
+	def __init__(self, Encoding):
+
+		# Open A Brotli Or Gzip Stream
+		self.Encoding = Encoding
+		if Encoding == 'br':
+			self.Compressor = Get_Brotli().Compressor(quality=Brotli_Quality)
+		else:
+			self.Compressor = zlib.compressobj(Gzip_Level, zlib.DEFLATED, 31)
+
+	# Compress Chunk
+	def Compress(self, Data, Flush=True):
+
+		# Flush After Each Chunk, So Streamed Output Reaches The Client As It Is Produced
+		if self.Encoding == 'br':
+			return self.Compressor.process(Data) + (self.Compressor.flush() if Flush else b'')
+		return self.Compressor.compress(Data) + (self.Compressor.flush(zlib.Z_SYNC_FLUSH) if Flush else b'')
+
+	# Finish Stream
+	def Finish(self):
+
+		# Return Trailing Bytes
+		if self.Encoding == 'br':
+			return self.Compressor.finish()
+		return self.Compressor.flush(zlib.Z_FINISH)
+
+# Compress Body
+def Compress_Body(Data, Encoding):
+
+	# Compress In One Pass
+	Compressor = Stream_Compressor(Encoding)
+	return Compressor.Compress(Data, Flush=False) + Compressor.Finish()
+
+# Compress Chunks
+def Compress_Chunks(Chunks, Encoding):
+
+	# Compress Each Chunk As The Generator Yields It
+	Compressor = Stream_Compressor(Encoding)
+	try:
+		for Chunk in Chunks:
+			Output = Compressor.Compress(Chunk.encode() if isinstance(Chunk, str) else Chunk)
+			if Output:
+				yield Output
+		yield Compressor.Finish()
+
+	# Close The Wrapped Generator Even When The Client Went Away
+	finally:
+		if hasattr(Chunks, 'close'):
+			Chunks.close()
+
+# Compress Async Chunks
+async def Async_Compress_Chunks(Body, Encoding):
+
+	# Compress Each Chunk As The Generator Yields It
+	Compressor = Stream_Compressor(Encoding)
+	async with Body as Chunks:
+		async for Chunk in Chunks:
+			Output = Compressor.Compress(Chunk.encode() if isinstance(Chunk, str) else Chunk)
+			if Output:
+				yield Output
+	yield Compressor.Finish()
+
+# Get Encoding
+def Get_Encoding(Request, Response):
+
+	# Compress Only Successful, Plain, Text Like Responses
+	if not APP_Settings.COMPRESS_ENABLED or Response.status_code != 200 or Response.mimetype not in Compressible_Types:
+		return None
+	if 'Content-Encoding' in Response.headers or Response.cache_control.no_transform:
+		return None
+
+	# Cached Copies Depend On What The Client Accepts
+	Response.vary.add('Accept-Encoding')
+
+	# Prefer Brotli When Installed, Then Gzip
+	if Request.accept_encodings['br'] and Get_Brotli() is not None:
+		return 'br'
+	if Request.accept_encodings['gzip']:
+		return 'gzip'
+
+# Set Encoding
+def Set_Encoding(Response, Encoding):
+
+	# Mark The Body Encoded
+	Response.headers['Content-Encoding'] = Encoding
+
+	# Strong ETags Must Differ Between Encodings, Weak Ones May Be Shared
+	ETag, Is_Weak = Response.get_etag()
+	if ETag and not Is_Weak:
+		Response.set_etag(ETag, weak=True)
+
+	# Return Response
+	return Response
+
+# Compress Response
+def Compress_Response(Request, Response):
+
+	# Negotiate Encoding, Skipping Files Sent Straight From Disk
+	Encoding = Get_Encoding(Request, Response)
+	if Encoding is None or Response.direct_passthrough:
+		return Response
+
+	# Wrap Streamed Bodies, Whose Length Is Unknown Up Front
+	if Response.is_streamed:
+		Response.response = Compress_Chunks(Response.response, Encoding)
+		Response.headers.pop('Content-Length', None)
+		return Set_Encoding(Response, Encoding)
+
+	# Leave Small Bodies, Where Compression Saves Less Than It Costs
+	Data = Response.get_data()
+	if len(Data) < APP_Settings.COMPRESS_MIN_SIZE:
+		return Response
+
+	# Compress Whole Body
+	Response.set_data(Compress_Body(Data, Encoding))
+	return Set_Encoding(Response, Encoding)
+
+# Compress Async Response
+async def Async_Compress_Response(Request, Response):
+
+	# Negotiate Encoding, Skipping Files Sent Straight From Disk
+	from quart.wrappers.response import DataBody, IterableBody
+	Encoding = Get_Encoding(Request, Response)
+	if Encoding is None or not isinstance(Response.response, (DataBody, IterableBody)):
+		return Response
+
+	# Wrap Streamed Bodies, Whose Length Is Unknown Up Front
+	if isinstance(Response.response, IterableBody):
+		Response.response = IterableBody(Async_Compress_Chunks(Response.response, Encoding))
+		Response.headers.pop('Content-Length', None)
+		return Set_Encoding(Response, Encoding)
+
+	# Leave Small Bodies, Where Compression Saves Less Than It Costs
+	Data = await Response.get_data()
+	if len(Data) < APP_Settings.COMPRESS_MIN_SIZE:
+		return Response
+
+	# Compress Whole Body
+	Response.set_data(Compress_Body(Data, Encoding))
+	return Set_Encoding(Response, Encoding)
+
+# Install Compression
+def Install(App, Is_Async=False):
+
+	# Compress Responses On Their Way Out
+	if Is_Async:
+		from quart import request
+		async def Async_Compress(Response):
+			return await Async_Compress_Response(request, Response)
+		App.after_request(Async_Compress)
+	else:
+		from flask import request
+		App.after_request(lambda Response: Compress_Response(request, Response))
@@ -0,0 +1,53 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import json
+import hashlib
+from datetime import datetime
+
+# Make ETag
+def Make_ETag(Version, *Parts):
+
+	# Hash The Data Version Together With Whatever Else Shapes The Response
+	return hashlib.sha1(json.dumps([Version, Parts], default=str, sort_keys=True).encode()).hexdigest()
+
+# Get Last Modified
+def Get_Last_Modified(Version):
+
+	# Newest Log Time, When There Is One
+	if Version and Version.get('Newest_Time'):
+		return datetime.fromisoformat(Version['Newest_Time'])
+
+# Get Validators
+def Get_Validators(Version, *Parts):
+
+	# Return ETag And Last Modified Time
+	return Make_ETag(Version, *Parts), Get_Last_Modified(Version)
+
+# Check Not Modified
+def Is_Not_Modified(Request, Validators):
+
+	# ETags Win When The Client Sent Any, Compared Weakly As Compressed Copies Share Them
+	ETag, Last_Modified = Validators
+	if Request.if_none_match:
+		return Request.if_none_match.contains_weak(ETag)
+
+	# Otherwise Compare Times At The Second Precision Of HTTP Dates
+	return Last_Modified is not None and Request.if_modified_since is not None and Last_Modified.replace(microsecond=0) <= Request.if_modified_since
+
+# Set Validators
+def Set_Validators(Response, Validators):
+
+	# Weak, Since The Same Page May Go Out Plain Or Compressed
+	ETag, Last_Modified = Validators
+	Response.set_etag(ETag, weak=True)
+	if Last_Modified is not None:
+		Response.last_modified = Last_Modified
+
+	# Let Clients Revalidate Every Time
+	Response.headers['Cache-Control'] = 'no-cache'
+
+	# Return Response
+	return Response
@@ -19,6 +19,61 @@ class Settings(BaseSettings):
 	DB_NAME: str
 	DB_USERNAME: str
 
+	# Database Pool Settings
+	DB_POOL_SIZE: int = 0
+	DB_MAX_OVERFLOW: int = -1
+	DB_MAX_CONNECTIONS: int = 80
+	DB_POOL_LIMIT: int = 10
+	WEB_CONCURRENCY: int = 1
+	DB_POOL_TIMEOUT: float = 30
+	DB_POOL_RECYCLE: int = -1
+	DB_POOL_PRE_PING: bool = False
+	DB_STATEMENT_TIMEOUT: int = 0
+
+	# Read Replica Settings
+	DB_REPLICA_HOSTNAME: str = ''
+	DB_REPLICA_PORT: str = ''
+
+	# Cache Settings
+	DIMENSION_CACHE_TTL: int = 300
+	RESULT_CACHE_TTL: float = 1.0
+	RESULT_CACHE_URL: str = ''
+
+	# Live Stream Settings
+	LIVE_POLL_INTERVAL: float = 1.0
+	LIVE_BUFFER_SIZE: int = 1000
+	LIVE_HEARTBEAT: int = 15
+
+	# Partition Settings
+	PARTITION_MONTHS_AHEAD: int = 3
+	PARTITION_RETENTION_MONTHS: int = 0
+	PARTITION_LOCK_TIMEOUT: int = 5000
+	PARTITION_MEASUREMENT_LAG: int = 86400
+
+	# Retention Settings
+	RETENTION_LOG_DAYS: int = 0
+	RETENTION_UNKNOWN_DATA_DAYS: int = 0
+	RETENTION_MEASUREMENT_DAYS: int = 0
+	RETENTION_BATCH_SIZE: int = 5000
+	RETENTION_PAUSE: float = 0.5
+	RETENTION_ARCHIVE_PATH: str = 'Archive'
+
+	# Profiling Settings
+	PROFILE_ENABLED: bool = False
+	PROFILE_SLOW_QUERY_MS: float = 200
+	PROFILE_EXPLAIN: bool = True
+
+	# Benchmark Settings
+	BENCHMARK_PATH: str = 'Benchmark'
+
+	# Template Settings
+	TEMPLATE_AUTO_RELOAD: bool = False
+	TEMPLATE_CACHE_PATH: str = 'Template_Cache'
+
+	# Compression Settings
+	COMPRESS_ENABLED: bool = True
+	COMPRESS_MIN_SIZE: int = 1024
+
 	# Load env File
 	model_config = {
 		"env_file": "Setup/.env"
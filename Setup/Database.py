@@ -3,8 +3,13 @@ import sys
 sys.path.append('/root/PostOffice')
 
 # Import Packages
-from sqlalchemy import create_engine
+import os
+import time
+import threading
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError, TimeoutError as Pool_Timeout_Error
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import QueuePool
 from contextlib import contextmanager
 from sqlalchemy.orm import sessionmaker
 from Setup.Config import APP_Settings
@@ -12,8 +17,163 @@ from Setup.Config import APP_Settings
 # Define Database Connection
 SQLALCHEMY_DATABASE_URL = f'postgresql://{APP_Settings.DB_USERNAME}:{APP_Settings.DB_PASSWORD}@{APP_Settings.DB_HOSTNAME}:{APP_Settings.DB_PORT}/{APP_Settings.DB_NAME}'
 
+# Get Pool Limits
+def Get_Pool_Limits():
+
+	# Split The Connection Budget Between Worker Processes
+	Per_Worker = max(2, APP_Settings.DB_MAX_CONNECTIONS // max(1, APP_Settings.WEB_CONCURRENCY))
+
+	# Keep Half Open And Allow Half As Overflow, Each Capped, Unless Set Explicitly
+	Pool_Size = APP_Settings.DB_POOL_SIZE if APP_Settings.DB_POOL_SIZE > 0 else min(APP_Settings.DB_POOL_LIMIT, Per_Worker // 2)
+	Max_Overflow = APP_Settings.DB_MAX_OVERFLOW if APP_Settings.DB_MAX_OVERFLOW >= 0 else max(0, min(APP_Settings.DB_POOL_LIMIT, Per_Worker - Pool_Size))
+
+	# Return Pool Size And Overflow
+	return Pool_Size, Max_Overflow
+
+# Set Pool Limits
+DB_POOL_SIZE, DB_MAX_OVERFLOW = Get_Pool_Limits()
+
+# Define Pool Statistics
+Pool_Statistics = {
+	'Checkouts': 0,
+	'Checkout_Timeouts': 0,
+	'Checkout_Wait_Total': 0.0,
+	'Checkout_Wait_Max': 0.0,
+}
+Pool_Statistics_Lock = threading.Lock()
+
+# Define Checkout Listeners Called With Each Wait Time
+Checkout_Listeners = []
+
+# Define Timed Pool Mixin
+class Timed_Pool_Mixin:
+
+	# Checkout Connection
+	def _do_get(self):
+
+		# Start Wait Timer
+		Start_Time = time.perf_counter()
+		Is_Timeout = False
+
+		# Try to check out a connection
+		try:
+
+			# Return Connection
+			return super()._do_get()
+
+		# Count Pool Timeouts
+		except Pool_Timeout_Error:
+			Is_Timeout = True
+			raise
+
+		# Record Wait Time
+		finally:
+			Wait_Time = time.perf_counter() - Start_Time
+			with Pool_Statistics_Lock:
+				Pool_Statistics['Checkouts'] += 1
+				Pool_Statistics['Checkout_Timeouts'] += Is_Timeout
+				Pool_Statistics['Checkout_Wait_Total'] += Wait_Time
+				Pool_Statistics['Checkout_Wait_Max'] = max(Pool_Statistics['Checkout_Wait_Max'], Wait_Time)
+
+			# Notify Checkout Listeners
+			for Listener in Checkout_Listeners:
+				Listener(Wait_Time)
+
+# Define Timed Queue Pool
+class Timed_Queue_Pool(Timed_Pool_Mixin, QueuePool):
+	pass
+
+# Define Statement Timeout For Web Requests, Lifted By Maintenance Commands
+Statement_Timeout = {'Milliseconds': APP_Settings.DB_STATEMENT_TIMEOUT}
+
+# Set Connection Options
+def Set_Connect_Options(Dialect, Record, Args, Params):
+
+	# Pass The Timeout As A Startup Option, So It Costs No Extra Round Trip, The Parameters Are Reused By Later Connections
+	if Statement_Timeout['Milliseconds'] > 0:
+		Params['options'] = f'-c statement_timeout={Statement_Timeout["Milliseconds"]}'
+	else:
+		Params.pop('options', None)
+
+# Create Engine
+def Create_Engine(URL):
+
+	# Create Engine With Configured Pool
+	Engine = create_engine(
+		URL,
+		poolclass=Timed_Queue_Pool,
+		pool_size=DB_POOL_SIZE,
+		max_overflow=DB_MAX_OVERFLOW,
+		pool_timeout=APP_Settings.DB_POOL_TIMEOUT,
+		pool_recycle=APP_Settings.DB_POOL_RECYCLE,
+		pool_pre_ping=APP_Settings.DB_POOL_PRE_PING,
+	)
+
+	# Read The Timeout On Every New Connection
+	event.listen(Engine, 'do_connect', Set_Connect_Options)
+
+	# Return Engine
+	return Engine
+
 # Create Database Engine
-DB_Engine = create_engine(SQLALCHEMY_DATABASE_URL, pool_size=30, max_overflow=10)
+DB_Engine = Create_Engine(SQLALCHEMY_DATABASE_URL)
+
+# Create Read Replica Engine
+DB_Replica_Engine = None
+if APP_Settings.DB_REPLICA_HOSTNAME:
+	DB_Replica_Engine = Create_Engine(f'postgresql://{APP_Settings.DB_USERNAME}:{APP_Settings.DB_PASSWORD}@{APP_Settings.DB_REPLICA_HOSTNAME}:{APP_Settings.DB_REPLICA_PORT or APP_Settings.DB_PORT}/{APP_Settings.DB_NAME}')
+
+# Define Read Only Engines Sharing The Pools Above
+DB_Primary_Read_Engine = DB_Engine.execution_options(postgresql_readonly=True)
+DB_Read_Engine = DB_Replica_Engine.execution_options(postgresql_readonly=True) if DB_Replica_Engine is not None else DB_Primary_Read_Engine
+
+# Lift Statement Timeout
+def Lift_Statement_Timeout():
+
+	# Maintenance Commands Run Long Statements, So New Connections Open Without The Web Timeout
+	Statement_Timeout['Milliseconds'] = 0
+
+	# Drop Connections Already Opened With It
+	DB_Engine.dispose()
+	if DB_Replica_Engine is not None:
+		DB_Replica_Engine.dispose()
+
+# Reset Engine After Fork
+def Reset_Engine():
+
+	# Give The Child A Fresh Pool Without Closing The Parent's Connections
+	DB_Engine.dispose(close=False)
+	if DB_Replica_Engine is not None:
+		DB_Replica_Engine.dispose(close=False)
+
+	# Reset Pool Statistics
+	with Pool_Statistics_Lock:
+		Pool_Statistics.update(Checkouts=0, Checkout_Timeouts=0, Checkout_Wait_Total=0.0, Checkout_Wait_Max=0.0)
+
+# Reset Engine In Every Forked Worker
+os.register_at_fork(after_in_child=Reset_Engine)
+
+# Get Pool Status
+def Get_Pool_Status(Engine=None):
+
+	# Default To The Primary Engine
+	Pool = (Engine or DB_Engine).pool
+
+	# Copy Pool Statistics
+	with Pool_Statistics_Lock:
+		Status = dict(Pool_Statistics)
+
+	# Add Live Pool Counters
+	Status.update(
+		Pool_Size=Pool.size(),
+		Checked_In=Pool.checkedin(),
+		Checked_Out=Pool.checkedout(),
+		Overflow=Pool.overflow(),
+		Max_Overflow=DB_MAX_OVERFLOW,
+	)
+
+	# Return Status
+	return Status
 
 # Create Session
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=DB_Engine)
@@ -41,7 +201,54 @@ def DB_Session_Scope():
 		# Rollback Changes
 		db.rollback()
 
+		# Raise Error
+		raise
+
 	finally:
 
 		# Close Database
-		db.close()
\ No newline at end of file
+		db.close()
+
+# Define Read Only Connection
+@contextmanager
+def DB_Read_Connection():
+
+	# Try to connect to the read engine
+	try:
+
+		# Connect Read Engine
+		Connection = DB_Read_Engine.connect()
+
+	# Fall Back To The Primary When The Replica Is Unreachable
+	except OperationalError:
+
+		# Raise Error Without A Replica
+		if DB_Replica_Engine is None:
+			raise
+
+		# Connect Primary
+		Connection = DB_Primary_Read_Engine.connect()
+
+	# Return Connection Inside A Read Only Transaction
+	with Connection:
+		yield Connection
+
+# Define Read Only Session Scope
+@contextmanager
+def DB_Read_Session_Scope():
+
+	# Open Read Only Connection
+	with DB_Read_Connection() as Connection:
+
+		# Create Session Without Commit
+		db = SessionLocal(bind=Connection)
+
+		try:
+
+			# Return Session
+			yield db
+
+		finally:
+
+			# Close Database
+			db.close()
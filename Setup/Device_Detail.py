@@ -0,0 +1,109 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from sqlalchemy import select, desc
+from sqlalchemy.orm import joinedload, selectinload, raiseload
+from Setup import Database, Models, Audit, Query
+
+# Define Row Limits
+Stream_Limit = 20
+Log_Limit = 20
+
+# Build Device Query
+def Build_Device_Query(Device_ID):
+
+	# Join Many To One Attributes, Batch Calibrations, Refuse Anything Else
+	return select(Models.Device).where(Models.Device.Device_ID == Device_ID).options(
+		joinedload(Models.Device.status),
+		joinedload(Models.Device.version),
+		joinedload(Models.Device.model),
+		joinedload(Models.Device.manufacturer),
+		joinedload(Models.Device.modem),
+		joinedload(Models.Device.project),
+		selectinload(Models.Device.calibrations).joinedload(Models.Calibration.variable),
+		raiseload('*'),
+	)
+
+# Build Stream Query
+def Build_Stream_Query(Device_ID):
+
+	# Newest Streams With Their SIM And Operator In One Join
+	return select(Models.Stream).where(Models.Stream.Device_ID == Device_ID).order_by(desc(Models.Stream.Stream_Time)).limit(Stream_Limit).options(
+		joinedload(Models.Stream.sim).joinedload(Models.SIM.operator),
+		raiseload('*'),
+	)
+
+# Build Log Query
+def Build_Log_Query(Device_ID):
+
+	# Newest Logs With Dimension Names Joined In
+	return select(
+		Models.Log.Log_ID,
+		Models.Log_Level.Log_Level_Name,
+		Models.Log_Description.Log_Description,
+		Models.Service.Service_Name,
+		Models.Log.Log_Message,
+		Query.Formatted(Models.Log.Create_Time),
+	).join(Models.Log_Level).join(Models.Log_Description).join(Models.Service).where(
+		Models.Log.Device_ID == Device_ID,
+	).order_by(desc(Models.Log.Create_Time), desc(Models.Log.Log_ID)).limit(Log_Limit)
+
+# Format Device
+def Format_Device(Device, Streams, Logs):
+
+	# Flatten Loaded Objects So Templates Cannot Trigger Lazy Loads
+	return {
+		'Device_ID': Device.Device_ID,
+		'Device_Name': Device.Device_Name,
+		'Description': Device.Description,
+		'IMEI': Device.IMEI,
+		'Last_Connection_IP': Device.Last_Connection_IP,
+		'Last_Connection_Time': Device.Last_Connection_Time,
+		'Status': Device.status.Description,
+		'Firmware': Device.version.Firmware,
+		'Model_Name': Device.model.Model_Name,
+		'Manufacturer_Name': Device.manufacturer.Manufacturer_Name,
+		'Project_Name': Device.project.Project_Name if Device.project else None,
+		'Calibrations': [{
+			'Variable_ID': Calibration.Variable_ID,
+			'Variable_Description': Calibration.variable.Variable_Description,
+			'Variable_Unit': Calibration.variable.Variable_Unit,
+			'Gain': Calibration.Gain,
+			'Offset': Calibration.Offset,
+		} for Calibration in Device.calibrations],
+		'Streams': [{
+			'Stream_ID': Stream.Stream_ID,
+			'Stream_Time': Stream.Stream_Time,
+			'IP_Address': Stream.IP_Address,
+			'Size': Stream.Size,
+			'ICCID': Stream.sim.ICCID,
+			'Operator': Stream.sim.operator.MNC_Operator_Name,
+			'Country': Stream.sim.operator.MCC_Country_Name,
+		} for Stream in Streams],
+		'Logs': [Row._asdict() for Row in Logs],
+	}
+
+# Load Device
+def Load_Device(Device_ID):
+
+	# Open a read only session
+	with Database.DB_Read_Session_Scope() as db:
+
+		# Query Device With Its Attributes And Calibrations
+		Device = db.execute(Build_Device_Query(Device_ID)).unique().scalar_one_or_none()
+		if Device is None:
+			return None
+
+		# Query Recent Streams And Logs
+		Streams = db.execute(Build_Stream_Query(Device_ID)).unique().scalars().all()
+		Logs = db.execute(Build_Log_Query(Device_ID)).all()
+
+		# Return Device Page
+		return Format_Device(Device, Streams, Logs)
+
+# Register Audited Queries
+Audit.Register_Query('Device Detail', lambda: Build_Device_Query(''))
+Audit.Register_Query('Device Recent Streams', lambda: Build_Stream_Query(''))
+Audit.Register_Query('Device Recent Logs', lambda: Build_Log_Query(''))
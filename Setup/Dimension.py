@@ -0,0 +1,123 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import threading
+from sqlalchemy import select
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Models, Query
+from Setup.Config import APP_Settings
+
+# Define Dimension Tables (Key Column, Name Column)
+Dimension_Tables = {
+	'Log_Level': (Models.Log_Level.Log_Level_ID, Models.Log_Level.Log_Level_Name),
+	'Log_Description': (Models.Log_Description.Log_Description_ID, Models.Log_Description.Log_Description),
+	'Service': (Models.Service.Service_ID, Models.Service.Service_Name),
+	'Status': (Models.Status.Status_ID, Models.Status.Description),
+	'Command': (Models.Command.Command_ID, Models.Command.Command),
+	'Data_Segment': (Models.Data_Segment.Segment_ID, Models.Data_Segment.Segment_Name),
+	'Variable': (Models.Variable.Variable_ID, Models.Variable.Variable_Description),
+}
+
+# Define Missing Marker, Since A Name Column May Itself Hold NULL
+Missing = object()
+
+# Define Dimension Cache
+class Dimension_Cache:
+
+	# Initialize Cache
+	def __init__(self, TTL):
+
+		# Set Cache State
+		self.TTL = TTL
+		self.Maps = {}
+		self.Load_Times = {}
+		self.Misses = {}
+		self.Lock = threading.Lock()
+
+	# Get Dimension Statement
+	def Get_Statement(self, Table):
+
+		# Query Only Key And Name Columns
+		return select(*Dimension_Tables[Table])
+
+	# Check Dimension Freshness
+	def Needs_Load(self, Table, Keys=()):
+
+		# Missing Or Expired
+		Now = time.monotonic()
+		if Now - self.Load_Times.get(Table, float('-inf')) > self.TTL:
+			return True
+
+		# Missing A Requested Key That Was Not Already Looked For Within The TTL
+		Misses = self.Misses.get(Table, {})
+		return any(Now - Misses.get(Key, float('-inf')) > self.TTL for Key in set(Keys) - self.Maps[Table].keys() - {None})
+
+	# Store Dimension Map
+	def Store(self, Table, Dimension_Map, Keys=()):
+
+		# Remember Requested Keys The Table Does Not Have, So They Do Not Reload It Again Until The TTL Passes
+		Now = time.monotonic()
+		Misses = {Key: Miss_Time for Key, Miss_Time in self.Misses.get(Table, {}).items() if Now - Miss_Time <= self.TTL and Key not in Dimension_Map}
+		Misses.update((Key, Now) for Key in set(Keys) - Dimension_Map.keys() - {None})
+
+		# Swap In The New Map
+		with self.Lock:
+			self.Maps[Table] = Dimension_Map
+			self.Misses[Table] = Misses
+			self.Load_Times[Table] = Now
+
+		# Return Dimension Map
+		return Dimension_Map
+
+	# Load Dimension Table
+	def Load(self, Table, Keys=()):
+
+		# Try to query the database
+		try:
+
+			# Query Only Key And Name Columns
+			Dimension_Map = dict(Query.Read_Rows(self.Get_Statement(Table)))
+
+		# Keep The Previous Map When The Load Failed
+		except SQLAlchemyError:
+			return self.Maps.get(Table, {})
+
+		# Store Dimension Map
+		return self.Store(Table, Dimension_Map, Keys)
+
+	# Get Dimension Map
+	def Get(self, Table, Keys=()):
+
+		# Reload Missing Or Expired Maps, Or Maps Missing A Key Not Yet Looked For
+		if self.Needs_Load(Table, Keys):
+			return self.Load(Table, Keys)
+
+		# Return Cached Map
+		return self.Maps[Table]
+
+	# Resolve Dimension Name
+	def Resolve(self, Table, Key, Default=None):
+
+		# Look Up Cached Name, Reloading Once Per TTL For Keys Newer Than The Cache
+		Name = self.Get(Table, (Key,)).get(Key, Missing)
+
+		# Return Name
+		return Default if Name is Missing or Name is None else Name
+
+	# Invalidate Cache
+	def Invalidate(self, Table=None):
+
+		# Drop One Or All Load Times And Misses
+		with self.Lock:
+			if Table is None:
+				self.Load_Times.clear()
+				self.Misses.clear()
+			else:
+				self.Load_Times.pop(Table, None)
+				self.Misses.pop(Table, None)
+
+# Set Dimension Cache
+Dimensions = Dimension_Cache(APP_Settings.DIMENSION_CACHE_TTL)
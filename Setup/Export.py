@@ -0,0 +1,272 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import io
+import csv
+from datetime import datetime, timezone
+from sqlalchemy import select
+from Setup import Models, Calibration, Audit, Partition
+
+# Define Rows Per Chunk
+Chunk_Size = 10000
+
+# Define Export Tables (Columns, Device Column, Time Column, Order Column)
+Export_Tables = {
+	'logs': (
+		(Models.Log.Log_ID, Models.Log.Log_Level_ID, Models.Log.Log_Description_ID, Models.Log.Service_ID, Models.Log.Device_ID, Models.Log.Log_Message, Models.Log.Create_Time),
+		Models.Log.Device_ID,
+		Models.Log.Create_Time,
+		Models.Log.Log_ID,
+	),
+	'streams': (
+		(Models.Stream.Stream_ID, Models.Stream.Device_ID, Models.Stream.Command_ID, Models.Stream.SIM_ID, Models.Stream.IP_Address, Models.Stream.Size, Models.Stream.Device_Time, Models.Stream.Stream_Time),
+		Models.Stream.Device_ID,
+		Models.Stream.Stream_Time,
+		Models.Stream.Stream_ID,
+	),
+	'measurements': (
+		(Models.Measurement.Measurement_ID, Models.Measurement.Stream_ID, Models.Stream.Device_ID, Models.Measurement.Variable_ID, Models.Measurement.Measurement_Value, Models.Stream.Stream_Time),
+		Models.Stream.Device_ID,
+		Models.Stream.Stream_Time,
+		Models.Measurement.Measurement_ID,
+	),
+}
+
+# Define Export Formats (Media Type, Extension)
+Export_Formats = {
+	'csv': ('text/csv', 'csv'),
+	'parquet': ('application/vnd.apache.parquet', 'parquet'),
+}
+
+# Parse Export Time
+def Parse_Export_Time(Value):
+
+	# Read Naive Timestamps As UTC
+	Time = datetime.fromisoformat(Value)
+	return Time if Time.tzinfo else Time.replace(tzinfo=timezone.utc)
+
+# Parse Export Arguments
+def Parse_Export_Arguments(Name, Args):
+
+	# Validate Table And Format
+	Format = Args.get('format', 'csv')
+	if Name not in Export_Tables or Format not in Export_Formats:
+		raise ValueError('Invalid export')
+
+	# Parquet Needs The Optional Writer
+	if Format == 'parquet':
+		try:
+			import pyarrow
+		except ImportError:
+			raise ValueError('Parquet export requires the pyarrow package')
+
+	# Variable Filter Only Applies To Measurements
+	if Args.get('variable') and Name != 'measurements':
+		raise ValueError('Invalid filter')
+
+	# Try to parse time range
+	try:
+		Start_Time = Parse_Export_Time(Args['start']) if Args.get('start') else None
+		End_Time = Parse_Export_Time(Args['end']) if Args.get('end') else None
+	except ValueError:
+		raise ValueError('Invalid filter')
+
+	# Return Arguments
+	return {
+		'Name': Name,
+		'Format': Format,
+		'Device_ID': Args.get('device') or None,
+		'Variable_ID': Args.get('variable') or None,
+		'Start_Time': Start_Time,
+		'End_Time': End_Time,
+	}
+
+# Build Export Query
+def Build_Export_Query(Arguments):
+
+	# Get Table Definition
+	Columns, Device_Column, Time_Column, Order_Column = Export_Tables[Arguments['Name']]
+
+	# Project Export Columns
+	Statement = select(*Columns)
+	if Arguments['Name'] == 'measurements':
+		Statement = Statement.join(Models.Stream)
+
+	# Apply Filters
+	if Arguments['Device_ID'] is not None:
+		Statement = Statement.where(Device_Column == Arguments['Device_ID'])
+	if Arguments['Variable_ID'] is not None:
+		Statement = Statement.where(Models.Measurement.Variable_ID == Arguments['Variable_ID'])
+	if Arguments['Start_Time'] is not None:
+		Statement = Statement.where(Time_Column >= Arguments['Start_Time'])
+	if Arguments['End_Time'] is not None:
+		Statement = Statement.where(Time_Column < Arguments['End_Time'])
+
+	# Let Measurement Partitions Be Pruned By The Stream Time Range
+	if Arguments['Name'] == 'measurements':
+		Statement = Statement.where(*Partition.Get_Measurement_Bounds(Arguments['Start_Time'], Arguments['End_Time']))
+
+	# Return Query In Primary Key Order
+	return Statement.order_by(Order_Column)
+
+# Get Column Names
+def Get_Column_Names(Name):
+
+	# Measurements Carry A Calibrated Copy Of The Value
+	Names = [Column.name for Column in Export_Tables[Name][0]]
+	return Names + ['Calibrated_Value'] if Name == 'measurements' else Names
+
+# Get Chunk Columns
+def Get_Columns(Name, Rows):
+
+	# Transpose Rows Into Columns
+	Columns = [list(Column) for Column in zip(*Rows)] or [[] for Column in Export_Tables[Name][0]]
+
+	# Calibrate The Whole Chunk In One Pass
+	if Name == 'measurements':
+		Columns.append([None if Value != Value else Value for Value in Calibration.Calibrations.Apply_Batch(Columns[2], Columns[3], Columns[4]).tolist()])
+
+	# Return Columns
+	return Columns
+
+# Define CSV Encoder
+class CSV_Encoder:
+
+	# Initialize Encoder
+	def __init__(self, Name):
+
+		# Set Encoder State
+		self.Name = Name
+		self.Buffer = io.StringIO()
+		self.Writer = csv.writer(self.Buffer)
+
+	# Drain Buffer
+	def Drain(self):
+
+		# Return Written Text And Reset
+		Data = self.Buffer.getvalue().encode()
+		self.Buffer.seek(0)
+		self.Buffer.truncate()
+		return Data
+
+	# Begin Export
+	def Begin(self):
+
+		# Write Header
+		self.Writer.writerow(Get_Column_Names(self.Name))
+		return self.Drain()
+
+	# Encode Chunk
+	def Encode(self, Rows):
+
+		# Write Chunk Rows
+		self.Writer.writerows(zip(*Get_Columns(self.Name, Rows)))
+		return self.Drain()
+
+	# Finish Export
+	def Finish(self):
+
+		# Nothing Left To Write
+		return b''
+
+# Define Chunk Sink
+class Chunk_Sink:
+
+	# Initialize Sink
+	def __init__(self):
+
+		# Set Sink State
+		self.Chunks = []
+		self.Position = 0
+		self.closed = False
+
+	# Write Bytes
+	def write(self, Data):
+
+		# Keep Bytes Until The Next Drain, Offsets Stay Absolute For The Footer
+		self.Chunks.append(bytes(Data))
+		self.Position += len(Data)
+		return len(Data)
+
+	# Tell Position
+	def tell(self):
+
+		# Return Bytes Written So Far
+		return self.Position
+
+	# Flush Sink
+	def flush(self):
+		pass
+
+	# Close Sink
+	def close(self):
+		self.closed = True
+
+	# Drain Sink
+	def Drain(self):
+
+		# Return Written Bytes And Reset
+		Data = b''.join(self.Chunks)
+		self.Chunks = []
+		return Data
+
+# Define Parquet Encoder
+class Parquet_Encoder:
+
+	# Initialize Encoder
+	def __init__(self, Name):
+
+		# Import Optional Writer
+		import pyarrow
+		import pyarrow.parquet
+
+		# Map Column Types To Arrow Types
+		Types = {int: pyarrow.int64(), float: pyarrow.float64(), str: pyarrow.string(), datetime: pyarrow.timestamp('us', tz='UTC')}
+		Fields = [pyarrow.field(Column.name, Types[Column.type.python_type]) for Column in Export_Tables[Name][0]]
+		if Name == 'measurements':
+			Fields.append(pyarrow.field('Calibrated_Value', pyarrow.float64()))
+
+		# Set Encoder State
+		self.Name = Name
+		self.Arrow = pyarrow
+		self.Schema = pyarrow.schema(Fields)
+		self.Sink = Chunk_Sink()
+		self.Writer = pyarrow.parquet.ParquetWriter(self.Sink, self.Schema, compression='zstd')
+
+	# Begin Export
+	def Begin(self):
+
+		# Header Is Written With The First Row Group
+		return b''
+
+	# Encode Chunk
+	def Encode(self, Rows):
+
+		# Write One Row Group Per Chunk
+		self.Writer.write_batch(self.Arrow.record_batch(Get_Columns(self.Name, Rows), schema=self.Schema))
+		return self.Sink.Drain()
+
+	# Finish Export
+	def Finish(self):
+
+		# Write Footer
+		self.Writer.close()
+		return self.Sink.Drain()
+
+# Get Encoder
+def Get_Encoder(Arguments):
+
+	# Return Encoder For The Requested Format
+	return (Parquet_Encoder if Arguments['Format'] == 'parquet' else CSV_Encoder)(Arguments['Name'])
+
+# Get Export Headers
+def Get_Export_Headers(Arguments):
+
+	# Download As An Attachment
+	return {'Content-Disposition': f'attachment; filename="{Arguments["Name"]}.{Export_Formats[Arguments["Format"]][1]}"', 'Cache-Control': 'no-store', 'X-Accel-Buffering': 'no'}
+
+# Register Audited Queries
+for Name in Export_Tables:
+	Audit.Register_Query(f'Device {Name.title()} Export', lambda Name=Name: Build_Export_Query({'Name': Name, 'Format': 'csv', 'Device_ID': '', 'Variable_ID': None, 'Start_Time': Audit.Sample_Range()[0], 'End_Time': Audit.Sample_Range()[1]}))
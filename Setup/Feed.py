@@ -0,0 +1,186 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import json
+from sqlalchemy import select, func, desc
+from Setup import Models, Pagination, Audit, Dimension, Query, Cache
+
+# Define Badge Classes
+Badge_Classes = {
+	1: 'badge-primary',
+	2: 'badge-secondary',
+	3: 'badge-success',
+	4: 'badge-danger',
+	5: 'badge-warning',
+	6: 'badge-info',
+	7: 'badge-light',
+	8: 'badge-dark'
+}
+
+# Define Log Columns
+Log_Columns = (
+	Models.Log.Log_ID,
+	Models.Log.Create_Time,
+	Query.Formatted(Models.Log.Create_Time),
+	Models.Log.Log_Level_ID,
+	Models.Log.Log_Description_ID,
+	Models.Log.Service_ID,
+	Models.Log.Device_ID,
+	Models.Log.Log_Message,
+)
+
+# Define Log Dimensions (Dimension Table, Log Column)
+Log_Dimensions = {
+	'Log_Level': 'Log_Level_ID',
+	'Log_Description': 'Log_Description_ID',
+	'Service': 'Service_ID',
+}
+
+# Define Tail Batch Size
+Tail_Batch_Size = 500
+
+# Format Log Rows
+def Format_Logs(Logs):
+
+	# Get Dimension Maps Once Per Batch
+	Levels = Dimension.Dimensions.Get('Log_Level')
+	Descriptions = Dimension.Dimensions.Get('Log_Description')
+	Services = Dimension.Dimensions.Get('Service')
+
+	# Return Display Rows
+	return [
+		{
+			'Log_ID': Log.Log_ID,
+			'Create_Time': Log.Create_Time_Text,
+			'Log_Level_ID': Levels.get(Log.Log_Level_ID) or Dimension.Dimensions.Resolve('Log_Level', Log.Log_Level_ID),
+			'Log_Level_Badge_Class': Badge_Classes.get(Log.Log_Level_ID, 'badge-primary'),
+			'Log_Description_ID': Descriptions.get(Log.Log_Description_ID) or Dimension.Dimensions.Resolve('Log_Description', Log.Log_Description_ID),
+			'Service_ID': Services.get(Log.Service_ID) or Dimension.Dimensions.Resolve('Service', Log.Service_ID),
+			'Service_Badge_Class': Badge_Classes.get(Log.Service_ID, 'badge-primary'),
+			'Device_ID': Log.Device_ID,
+			'Log_Message': Log.Log_Message,
+		} for Log in Logs
+	]
+
+# Format Tail Rows
+def Format_Tail(Logs):
+
+	# Return Raw And Display Rows
+	return [(Log.Log_ID, Log, Payload) for Log, Payload in zip(Logs, Format_Logs(Logs))]
+
+# Build Log Query
+def Build_Log_Query(Filters, Cursor_Key, Limit):
+
+	# Query only the narrow log columns
+	Query_Log = select(*Log_Columns)
+
+	# Apply Filters And Keyset
+	Query_Log = Pagination.Apply_Log_Filters(Query_Log, Filters)
+	return Pagination.Apply_Log_Keyset(Query_Log, Cursor_Key, Limit)
+
+# Build Tail Query
+def Build_Tail_Query(Log_ID, Limit=Tail_Batch_Size):
+
+	# Query logs newer than the last seen id
+	return select(*Log_Columns).where(Models.Log.Log_ID > Log_ID).order_by(Models.Log.Log_ID).limit(Limit)
+
+# Build Head Query
+def Build_Head_Query():
+
+	# Query the newest log id
+	return select(func.max(Models.Log.Log_ID))
+
+# Build Version Query
+def Build_Version_Query(Filters=None):
+
+	# Newest And Oldest Row Of The Filtered Feed, Each Read From The End Of The Index The Page Walks
+	Feed_Rows = Pagination.Apply_Log_Filters(select(Models.Log.Log_ID), Filters or {})
+	Newest = Feed_Rows.order_by(desc(Models.Log.Create_Time), desc(Models.Log.Log_ID)).limit(1)
+	Oldest = Feed_Rows.order_by(Models.Log.Create_Time, Models.Log.Log_ID).limit(1)
+	return select(
+		Newest.scalar_subquery().label('Newest_ID'),
+		Oldest.scalar_subquery().label('Oldest_ID'),
+		Newest.with_only_columns(Models.Log.Create_Time).scalar_subquery().label('Newest_Time'),
+	)
+
+# Format Version
+def Format_Version(Row):
+
+	# Keep Plain Values, So Shared Cache Backends Return The Same Version
+	return {'Newest_ID': Row.Newest_ID, 'Oldest_ID': Row.Oldest_ID, 'Newest_Time': Row.Newest_Time.isoformat() if Row.Newest_Time else None}
+
+# Split Page
+def Split_Page(Logs, Limit):
+
+	# Last Page Has No Cursor
+	if len(Logs) <= Limit:
+		return Logs, None
+
+	# Trim The Extra Row And Point The Cursor At The Last Kept Row
+	Logs = Logs[:Limit]
+	return Logs, Pagination.Encode_Cursor(Logs[-1].Create_Time, Logs[-1].Log_ID)
+
+# Parse Page Arguments
+def Parse_Page_Arguments(Args):
+
+	# Return Filters, Cursor Key And Limit
+	return (
+		Pagination.Parse_Log_Filters(Args),
+		Pagination.Decode_Cursor(Args.get('cursor')),
+		Pagination.Parse_Limit(Args.get('limit')),
+	)
+
+# Parse Stream Arguments
+def Parse_Stream_Arguments(Args, Headers):
+
+	# Resume From The Browser's Last Event Or The Rendered Page
+	Last_Log_ID = Headers.get('Last-Event-ID') or Args.get('after')
+
+	# Return Filters And Last Seen Log ID
+	return Pagination.Parse_Log_Filters(Args), int(Last_Log_ID) if Last_Log_ID else None
+
+# Get Filter Arguments
+def Get_Filter_Arguments(Args):
+
+	# Keep Filters Across Pages
+	return {Key: Args[Key] for Key in Pagination.Filter_Parameters if Args.get(Key)}
+
+# Get Stream Start
+def Get_Stream_Start(Variables, Cursor_Key):
+
+	# Stream Rows Newer Than The Page On The First Page
+	return max([Variable['Log_ID'] for Variable in Variables], default=0) if Cursor_Key is None else None
+
+# Get Page Cache Key
+def Get_Page_Cache_Key(Filters, Cursor_Key, Limit):
+
+	# Return Cache Key
+	return Cache.Make_Key('logs', sorted(Filters.items()), Cursor_Key, Limit)
+
+# Get Version Cache Key
+def Get_Version_Cache_Key(Filters):
+
+	# Return Cache Key
+	return Cache.Make_Key('logs-version', sorted(Filters.items()))
+
+# Format Events
+def Format_Events(Rows, Filters):
+
+	# Keep Idle Connections Open
+	if not Rows:
+		return ': keepalive\n\n'
+
+	# Send Matching Rows
+	return ''.join(f'id: {Log_ID}\nevent: log\ndata: {json.dumps(Payload)}\n\n' for Log_ID, Log, Payload in Rows if Pagination.Match_Log_Filters(Log, Filters))
+
+# Register Audited Queries
+Audit.Register_Query('Home Page', lambda: Build_Log_Query({}, None, Pagination.Default_Page_Size))
+Audit.Register_Query('Log Feed Page', lambda: Build_Log_Query({}, Audit.Sample_Cursor_Key(), Pagination.Default_Page_Size))
+Audit.Register_Query('Log Feed By Service', lambda: Build_Log_Query({'Service_ID': 1}, Audit.Sample_Cursor_Key(), Pagination.Default_Page_Size))
+Audit.Register_Query('Log Feed By Device', lambda: Build_Log_Query({'Device_ID': ''}, Audit.Sample_Cursor_Key(), Pagination.Default_Page_Size))
+Audit.Register_Query('Log Feed By Time Range', lambda: Build_Log_Query({'Start_Time': Audit.Sample_Cursor_Key()[0]}, None, Pagination.Default_Page_Size))
+Audit.Register_Query('Live Log Tail', lambda: Build_Tail_Query(0))
+Audit.Register_Query('Log Version', lambda: Build_Version_Query())
+Audit.Register_Query('Device Log Version', lambda: Build_Version_Query({'Device_ID': 'DEV0'}))
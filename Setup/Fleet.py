@@ -0,0 +1,214 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import base64
+import binascii
+import json
+from datetime import datetime
+from sqlalchemy import select, tuple_, asc, desc, and_, or_
+from sqlalchemy.dialects.postgresql import insert
+from Setup import Database, Models, Refresh, Audit, Query
+
+# Define Page Size
+Page_Size = 50
+
+# Define Sortable Columns
+Sort_Columns = {
+	'device': Models.Device_Summary.Device_ID,
+	'last_stream': Models.Device_Summary.Last_Stream_Time,
+	'firmware': Models.Device_Summary.Firmware,
+	'status': Models.Device_Summary.Status_Description,
+	'model': Models.Device_Summary.Model_Name,
+}
+
+# Define Column Titles
+Column_Titles = (
+	('device', 'Device'),
+	('last_stream', 'Last Stream'),
+	('firmware', 'Firmware'),
+	('status', 'Status'),
+	('model', 'Model'),
+)
+
+# Define Summary Columns
+Summary_Columns = (
+	Models.Device_Summary.Device_ID,
+	Models.Device_Summary.Device_Name,
+	Models.Device_Summary.Status_Description,
+	Models.Device_Summary.Firmware,
+	Models.Device_Summary.Model_Name,
+	Models.Device_Summary.Last_IP,
+	Query.Formatted(Models.Device_Summary.Last_Stream_Time),
+)
+
+# Sync Device Attributes
+def Sync_Devices(Connection):
+
+	# Join Device Attributes Once For The Whole Fleet
+	Attributes = select(
+		Models.Device.Device_ID,
+		Models.Device.Device_Name,
+		Models.Device.Status_ID,
+		Models.Status.Description,
+		Models.Version.Firmware,
+		Models.Model.Model_Name,
+		Models.Device.Last_Connection_IP,
+	).join(Models.Status).join(Models.Version).join(Models.Model)
+
+	# Upsert Only Rows Whose Attributes Changed
+	Statement = insert(Models.Device_Summary).from_select(['Device_ID', 'Device_Name', 'Status_ID', 'Status_Description', 'Firmware', 'Model_Name', 'Last_IP'], Attributes)
+	Changed_Columns = ('Device_Name', 'Status_ID', 'Status_Description', 'Firmware', 'Model_Name')
+	Statement = Statement.on_conflict_do_update(
+		index_elements=['Device_ID'],
+		set_={Column: Statement.excluded[Column] for Column in Changed_Columns},
+		where=tuple_(*[Models.Device_Summary.__table__.c[Column] for Column in Changed_Columns]).is_distinct_from(tuple_(*[Statement.excluded[Column] for Column in Changed_Columns])),
+	)
+
+	# Run Upsert
+	Connection.execute(Statement)
+
+# Apply Stream Batch
+def Apply_Streams(Connection, Low, High):
+
+	# Pick The Newest Stream Per Device In The Batch
+	Latest = select(
+		Models.Stream.Device_ID,
+		Models.Stream.Stream_ID,
+		Models.Stream.Stream_Time,
+		Models.Stream.IP_Address,
+	).where(
+		Models.Stream.Stream_ID > Low,
+		Models.Stream.Stream_ID <= High,
+	).distinct(Models.Stream.Device_ID).order_by(Models.Stream.Device_ID, desc(Models.Stream.Stream_ID))
+
+	# Upsert Without Moving Backwards
+	Statement = insert(Models.Device_Summary).from_select(['Device_ID', 'Last_Stream_ID', 'Last_Stream_Time', 'Last_IP'], Latest)
+	Statement = Statement.on_conflict_do_update(
+		index_elements=['Device_ID'],
+		set_={Column: Statement.excluded[Column] for Column in ('Last_Stream_ID', 'Last_Stream_Time', 'Last_IP')},
+		where=Models.Device_Summary.Last_Stream_ID.is_(None) | (Models.Device_Summary.Last_Stream_ID < Statement.excluded.Last_Stream_ID),
+	)
+
+	# Run Upsert
+	Connection.execute(Statement)
+
+# Refresh Fleet Summary
+def Refresh_Fleet(Batch_Size=100000):
+
+	# Create Summary Tables On First Refresh
+	Refresh.Ensure_Tables(Models.Device_Summary)
+
+	# Sync Device Attributes First So Stream Upserts Find Every Device
+	with Database.DB_Engine.begin() as Connection:
+		Sync_Devices(Connection)
+
+	# Fold New Streams Into The Summary
+	return Refresh.Run_Batches('Device_Summary', Models.Stream.Stream_ID, Apply_Streams, Batch_Size)
+
+# Encode Fleet Cursor
+def Encode_Cursor(Sort_Key, Device_ID):
+
+	# Build Raw Cursor, Keeping Null Sort Keys Apart From Empty Ones
+	Raw_Cursor = json.dumps([Sort_Key.isoformat() if isinstance(Sort_Key, datetime) else Sort_Key, Device_ID])
+
+	# Return URL Safe Cursor
+	return base64.urlsafe_b64encode(Raw_Cursor.encode()).decode().rstrip('=')
+
+# Decode Fleet Cursor
+def Decode_Cursor(Cursor, Sort):
+
+	# Empty Cursor Starts From The First Row
+	if not Cursor:
+		return None
+
+	# Try to decode cursor
+	try:
+
+		# Restore Padding
+		Padded_Cursor = Cursor + '=' * (-len(Cursor) % 4)
+
+		# Split Raw Cursor
+		Sort_Key, Device_ID = json.loads(base64.urlsafe_b64decode(Padded_Cursor.encode()).decode())
+		if not isinstance(Device_ID, str) or not (Sort_Key is None or isinstance(Sort_Key, str)):
+			raise ValueError('Invalid cursor')
+
+		# Return Cursor Key
+		return (datetime.fromisoformat(Sort_Key) if Sort == 'last_stream' and Sort_Key is not None else Sort_Key), Device_ID
+
+	# Handle Malformed Cursor
+	except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+
+		# Raise Error
+		raise ValueError('Invalid cursor')
+
+# Apply Fleet Keyset
+def Apply_Fleet_Keyset(Statement, Sort, Direction, After_Key):
+
+	# Seek On The Primary Key Alone
+	Sort_Key, Device_ID = After_Key
+	if Sort == 'device':
+		return Statement.where(Models.Device_Summary.Device_ID > Device_ID if Direction == 'asc' else Models.Device_Summary.Device_ID < Device_ID)
+
+	# Nulls Sort As The Smallest Value, Before Every Key Ascending And After Every Key Descending
+	Sort_Column = Sort_Columns[Sort]
+	if Direction == 'asc':
+		if Sort_Key is None:
+			return Statement.where(or_(and_(Sort_Column.is_(None), Models.Device_Summary.Device_ID > Device_ID), Sort_Column.is_not(None)))
+		return Statement.where(tuple_(Sort_Column, Models.Device_Summary.Device_ID) > tuple_(Sort_Key, Device_ID))
+	if Sort_Key is None:
+		return Statement.where(Sort_Column.is_(None), Models.Device_Summary.Device_ID < Device_ID)
+	return Statement.where(or_(tuple_(Sort_Column, Models.Device_Summary.Device_ID) < tuple_(Sort_Key, Device_ID), Sort_Column.is_(None)))
+
+# Build Fleet Query
+def Build_Fleet_Query(Sort, Direction, After_Key=None):
+
+	# Carry The Raw Sort Value For The Next Cursor
+	Order = asc if Direction == 'asc' else desc
+	Statement = select(*Summary_Columns, Sort_Columns[Sort].label('Sort_Key'))
+
+	# Order By The Primary Key Alone
+	if Sort == 'device':
+		Statement = Statement.order_by(Order(Models.Device_Summary.Device_ID))
+
+	# Order Nulls As The Smallest Value So One Index Serves Both Directions
+	else:
+		Sort_Column = Order(Sort_Columns[Sort])
+		Statement = Statement.order_by(Sort_Column.nulls_first() if Direction == 'asc' else Sort_Column.nulls_last(), Order(Models.Device_Summary.Device_ID))
+
+	# Seek Past The Last Seen Row Instead Of Skipping Earlier Pages
+	if After_Key is not None:
+		Statement = Apply_Fleet_Keyset(Statement, Sort, Direction, After_Key)
+
+	# Fetch One Extra Row To Detect The Next Page
+	return Statement.limit(Page_Size + 1)
+
+# Parse Fleet Arguments
+def Parse_Fleet_Arguments(Args):
+
+	# Get Sort Arguments
+	Sort = Args.get('sort', 'last_stream')
+	Direction = Args.get('direction', 'desc')
+
+	# Validate Sort Arguments
+	if Sort not in Sort_Columns or Direction not in ('asc', 'desc'):
+		raise ValueError('Invalid sort')
+
+	# Return Arguments
+	return Sort, Direction, Decode_Cursor(Args.get('after'), Sort)
+
+# Format Fleet Page
+def Format_Fleet(Rows):
+
+	# Last Page Has No Cursor
+	if len(Rows) <= Page_Size:
+		return [Row._asdict() for Row in Rows], None
+
+	# Trim The Extra Row And Point The Cursor At The Last Kept Row
+	Rows = Rows[:Page_Size]
+	return [Row._asdict() for Row in Rows], Encode_Cursor(Rows[-1].Sort_Key, Rows[-1].Device_ID)
+
+# Register Audited Queries
+Audit.Register_Query('Fleet By Last Stream', lambda: Build_Fleet_Query('last_stream', 'desc'))
+Audit.Register_Query('Fleet By Firmware', lambda: Build_Fleet_Query('firmware', 'asc'))
@@ -0,0 +1,305 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import asyncio
+import logging
+import threading
+from collections import deque
+from Setup.Config import APP_Settings
+
+# Define Live Logger
+Logger = logging.getLogger('PostOffice.Live')
+
+# Define Longest Wait Between Retries After A Failed Poll
+Max_Retry_Interval = 30
+
+# Get Start Position
+def Get_Start(Start_Log_ID, Head, Buffer_Size):
+
+	# Start At The Client Position, At Most One Buffer Behind And Never Past The Newest Row
+	if Start_Log_ID is None:
+		return Head
+	return min(max(Start_Log_ID, Head - Buffer_Size), Head)
+
+# Get Retry Interval
+def Get_Retry_Interval(Poll_Interval, Failures):
+
+	# Double The Wait With Each Failure In A Row
+	return min(max(Poll_Interval, 0.1) * 2 ** Failures, Max_Retry_Interval)
+
+# Collect Rows After
+def Rows_After(Buffer, Last_Log_ID):
+
+	# Walk Back From The Newest Row
+	Rows = []
+	for Row in reversed(Buffer):
+		if Row[0] <= Last_Log_ID:
+			break
+		Rows.append(Row)
+
+	# Return Rows In Ascending Order
+	Rows.reverse()
+	return Rows
+
+# Define Log Broadcaster
+class Log_Broadcaster:
+
+	# Initialize Broadcaster
+	def __init__(self, Fetch, Head, Poll_Interval=APP_Settings.LIVE_POLL_INTERVAL, Buffer_Size=APP_Settings.LIVE_BUFFER_SIZE, Heartbeat=APP_Settings.LIVE_HEARTBEAT):
+
+		# Set Data Sources
+		self.Fetch = Fetch
+		self.Head = Head
+
+		# Set Timing
+		self.Poll_Interval = Poll_Interval
+		self.Heartbeat = Heartbeat
+
+		# Set Shared State
+		self.Buffer = deque(maxlen=Buffer_Size)
+		self.Condition = threading.Condition()
+		self.Subscribers = 0
+		self.Start_Log_ID = None
+		self.First_Log_ID = None
+		self.Last_Log_ID = None
+		self.Thread = None
+
+	# Start Poller
+	def Start(self, Last_Log_ID):
+
+		# Start One Poller Per Process
+		with self.Condition:
+			if self.Thread is None:
+				self.Start_Log_ID = Last_Log_ID
+				self.Thread = threading.Thread(target=self.Run, name='Log_Broadcaster', daemon=True)
+				self.Thread.start()
+
+	# Poll Once
+	def Poll(self):
+
+		# Sleep While Nobody Is Listening
+		with self.Condition:
+			while self.Subscribers == 0:
+				self.Condition.wait()
+
+		# Find The Start Position Once The Newest Row Is Known, Head Is None While The Database Is Unreachable
+		if self.Last_Log_ID is None:
+			Head = self.Head()
+			if Head is None:
+				raise ConnectionError('Newest log unavailable')
+			with self.Condition:
+				self.First_Log_ID = self.Last_Log_ID = Get_Start(self.Start_Log_ID, Head, self.Buffer.maxlen)
+
+		# Fetch Rows Newer Than The High Water Mark
+		Rows = self.Fetch(self.Last_Log_ID)
+
+		# Publish Rows To Every Subscriber
+		if Rows:
+			with self.Condition:
+				self.Buffer.extend(Rows)
+				self.Last_Log_ID = Rows[-1][0]
+				self.Condition.notify_all()
+
+		# Return Whether To Poll Again Immediately
+		return bool(Rows)
+
+	# Run Poller
+	def Run(self):
+
+		# Poll Forever
+		Failures = 0
+		while True:
+
+			# Try to poll, keeping the shared poller alive through any failure
+			try:
+
+				# Keep Polling Immediately While Catching Up
+				if not self.Poll():
+					time.sleep(self.Poll_Interval)
+				Failures = 0
+
+			# Back Off Before Trying Again
+			except Exception as e:
+				Logger.warning('Live log poll failed, retrying: %s', e)
+				time.sleep(Get_Retry_Interval(self.Poll_Interval, Failures))
+				Failures += 1
+
+	# Subscribe To Rows
+	def Subscribe(self, Last_Log_ID=None):
+
+		# Make Sure The Poller Is Running
+		self.Start(Last_Log_ID)
+
+		# Register Subscriber
+		with self.Condition:
+			self.Subscribers += 1
+			self.Condition.notify_all()
+
+			# New Clients Only Receive Rows Published From Now On
+			if Last_Log_ID is None:
+				Last_Log_ID = self.Buffer[-1][0] if self.Buffer else 0
+
+			# Pull A Position Past The Newest Row Back To It, Or To The Poller Start Once That Is Known
+			Is_Clamped = self.Last_Log_ID is not None
+			if Is_Clamped:
+				Last_Log_ID = min(Last_Log_ID, self.Last_Log_ID)
+
+		# Try to stream rows
+		try:
+
+			# Stream Until The Client Disconnects
+			while True:
+
+				# Wait For New Rows Or Heartbeat
+				with self.Condition:
+					if not Is_Clamped and self.First_Log_ID is not None:
+						Last_Log_ID, Is_Clamped = min(Last_Log_ID, self.First_Log_ID), True
+					Rows = Rows_After(self.Buffer, Last_Log_ID)
+					if not Rows:
+						self.Condition.wait(self.Heartbeat)
+						Rows = Rows_After(self.Buffer, Last_Log_ID)
+
+				# Advance Client Position
+				if Rows:
+					Last_Log_ID = Rows[-1][0]
+
+				# Yield Batch
+				yield Rows
+
+		# Unregister Subscriber
+		finally:
+			with self.Condition:
+				self.Subscribers -= 1
+
+# Define Async Log Broadcaster
+class Async_Log_Broadcaster:
+
+	# Initialize Broadcaster
+	def __init__(self, Fetch, Head, Poll_Interval=APP_Settings.LIVE_POLL_INTERVAL, Buffer_Size=APP_Settings.LIVE_BUFFER_SIZE, Heartbeat=APP_Settings.LIVE_HEARTBEAT):
+
+		# Set Data Sources
+		self.Fetch = Fetch
+		self.Head = Head
+
+		# Set Timing
+		self.Poll_Interval = Poll_Interval
+		self.Heartbeat = Heartbeat
+
+		# Set Shared State
+		self.Buffer = deque(maxlen=Buffer_Size)
+		self.Condition = None
+		self.Subscribers = 0
+		self.Start_Log_ID = None
+		self.First_Log_ID = None
+		self.Last_Log_ID = None
+		self.Task = None
+
+	# Start Poller
+	def Start(self, Last_Log_ID):
+
+		# Start One Poller Per Event Loop
+		if self.Task is None:
+			self.Condition = asyncio.Condition()
+			self.Start_Log_ID = Last_Log_ID
+			self.Task = asyncio.get_running_loop().create_task(self.Run())
+
+	# Poll Once
+	async def Poll(self):
+
+		# Sleep While Nobody Is Listening
+		async with self.Condition:
+			await self.Condition.wait_for(lambda: self.Subscribers > 0)
+
+		# Find The Start Position Once The Newest Row Is Known, Head Is None While The Database Is Unreachable
+		if self.Last_Log_ID is None:
+			Head = await self.Head()
+			if Head is None:
+				raise ConnectionError('Newest log unavailable')
+			self.First_Log_ID = self.Last_Log_ID = Get_Start(self.Start_Log_ID, Head, self.Buffer.maxlen)
+
+		# Fetch Rows Newer Than The High Water Mark
+		Rows = await self.Fetch(self.Last_Log_ID)
+
+		# Publish Rows To Every Subscriber
+		if Rows:
+			async with self.Condition:
+				self.Buffer.extend(Rows)
+				self.Last_Log_ID = Rows[-1][0]
+				self.Condition.notify_all()
+
+		# Return Whether To Poll Again Immediately
+		return bool(Rows)
+
+	# Run Poller
+	async def Run(self):
+
+		# Poll Forever
+		Failures = 0
+		while True:
+
+			# Try to poll, keeping the shared poller alive through any failure
+			try:
+
+				# Keep Polling Immediately While Catching Up
+				if not await self.Poll():
+					await asyncio.sleep(self.Poll_Interval)
+				Failures = 0
+
+			# Back Off Before Trying Again
+			except Exception as e:
+				Logger.warning('Live log poll failed, retrying: %s', e)
+				await asyncio.sleep(Get_Retry_Interval(self.Poll_Interval, Failures))
+				Failures += 1
+
+	# Subscribe To Rows
+	async def Subscribe(self, Last_Log_ID=None):
+
+		# Make Sure The Poller Is Running
+		self.Start(Last_Log_ID)
+
+		# Register Subscriber
+		async with self.Condition:
+			self.Subscribers += 1
+			self.Condition.notify_all()
+
+			# New Clients Only Receive Rows Published From Now On
+			if Last_Log_ID is None:
+				Last_Log_ID = self.Buffer[-1][0] if self.Buffer else 0
+
+			# Pull A Position Past The Newest Row Back To It, Or To The Poller Start Once That Is Known
+			Is_Clamped = self.Last_Log_ID is not None
+			if Is_Clamped:
+				Last_Log_ID = min(Last_Log_ID, self.Last_Log_ID)
+
+		# Try to stream rows
+		try:
+
+			# Stream Until The Client Disconnects
+			while True:
+
+				# Wait For New Rows Or Heartbeat
+				async with self.Condition:
+					if not Is_Clamped and self.First_Log_ID is not None:
+						Last_Log_ID, Is_Clamped = min(Last_Log_ID, self.First_Log_ID), True
+					Rows = Rows_After(self.Buffer, Last_Log_ID)
+					if not Rows:
+						try:
+							await asyncio.wait_for(self.Condition.wait(), self.Heartbeat)
+						except asyncio.TimeoutError:
+							pass
+						Rows = Rows_After(self.Buffer, Last_Log_ID)
+
+				# Advance Client Position
+				if Rows:
+					Last_Log_ID = Rows[-1][0]
+
+				# Yield Batch
+				yield Rows
+
+		# Unregister Subscriber
+		finally:
+			async with self.Condition:
+				self.Subscribers -= 1
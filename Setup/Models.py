@@ -3,7 +3,7 @@ import sys
 sys.path.append('/home/postoffice/PostOffice/src')
 
 # Import Packages
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Float, JSON, Index, UniqueConstraint, func
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, Float, JSON, Index, UniqueConstraint, DDL, event, func
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 from sqlalchemy.orm import relationship
 from Setup.Database import Base
@@ -197,7 +197,7 @@ class Device(Base):
 		Index('idx_model_id', 'Model_ID'),
 		Index('idx_manufacturer_id', 'Manufacturer_ID'),
 		Index('idx_status_id', 'Status_ID'),
-		Index('idx_device_version_id', 'Version_ID'),
+		Index('idx_device_rollout', 'Version_ID', 'Project_ID', 'Model_ID', 'Device_ID'),
 		Index('idx_project_id', 'Project_ID'),
 	)
 
@@ -294,6 +294,11 @@ class Measurement(Base):
 	__table_args__ = (
 		Index('idx_stream_variable', 'Stream_ID', 'Variable_ID'),
 		Index('idx_measurement_value', 'Measurement_Value'),
+		Index('idx_measurement_variable_time', 'Variable_ID', 'Create_Time'),
+		Index('idx_measurement_create_time', 'Create_Time'),
+
+		# Range Partitioned By Month Once Converted With partition-tables
+		{'info': {'Partition_Column': 'Create_Time'}},
 	)
 
 # [J] Stream Database Model
@@ -321,11 +326,14 @@ class Stream(Base):
 
 	# Define Table Arguments
 	__table_args__ = (
-		Index('idx_stream_device_id', 'Device_ID'),
+		Index('idx_stream_device_time', 'Device_ID', 'Stream_Time'),
 		Index('idx_stream_sim_id', 'SIM_ID'),
 		Index('idx_stream_time', 'Stream_Time'),
 		Index('idx_stream_ip_address', 'IP_Address'),
 		Index('idx_device_time', 'Device_Time'),
+
+		# Range Partitioned By Month Once Converted With partition-tables, Measurement Then Loses Its Stream_ID Foreign Key
+		{'info': {'Partition_Column': 'Stream_Time'}},
 	)
 
 # Command Database Model
@@ -364,9 +372,13 @@ class Unknown_Data(Base):
 
 	# Define Table Arguments
 	__table_args__ = (
-		Index('idx_unknown_data_id', 'Data_ID'),
+		Index('idx_unknown_data_raw_trgm', 'RAW_Data', postgresql_using='gin', postgresql_ops={'RAW_Data': 'gin_trgm_ops'}),
+		Index('idx_unknown_data_stream_time', 'Stream_Time'),
 	)
 
+# Enable Trigram Operators Before Creating Unknown_Data
+event.listen(Unknown_Data.__table__, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+
 # Calibration Database Model
 class Calibration(Base):
 
@@ -599,7 +611,180 @@ class Log(Base):
 	__table_args__ = (
 		Index('idx_log_level_id', 'Log_Level_ID'),
 		Index('idx_log_description_id', 'Log_Description_ID'),
-		Index('idx_log_service_id', 'Service_ID'),
+		Index('idx_log_create_time_desc', Create_Time.desc(), Log_ID.desc()),
+		Index('idx_log_service_create_time', Service_ID, Create_Time.desc(), Log_ID.desc()),
+		Index('idx_log_device_create_time', Device_ID, Create_Time.desc(), Log_ID.desc()),
+
+		# Range Partitioned By Month Once Converted With partition-tables
+		{'info': {'Partition_Column': 'Create_Time'}},
+	)
+
+
+
+
+# Watermark Database Model
+class Watermark(Base):
+
+	# Define Table Name
+	__tablename__ = "Watermark"
+
+	# Define Columns
+	Watermark_Name = Column(String(100), primary_key=True, nullable=False)
+	Last_ID = Column(BigInteger, nullable=False, server_default="0")
+	Update_Time = Column(TIMESTAMP(timezone=True), nullable=True, onupdate=func.now())
+
+# Device_Summary Database Model
+class Device_Summary(Base):
+
+	# Define Table Name
+	__tablename__ = "Device_Summary"
+
+	# Define Columns
+	Device_ID = Column(String(21), ForeignKey("Device.Device_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Device_Name = Column(String(100), nullable=True)
+	Status_ID = Column(Integer, nullable=True)
+	Status_Description = Column(String(255), nullable=True)
+	Firmware = Column(String(20), nullable=True)
+	Model_Name = Column(String(100), nullable=True)
+	Last_Stream_ID = Column(Integer, nullable=True)
+	Last_Stream_Time = Column(TIMESTAMP(timezone=True), nullable=True)
+	Last_IP = Column(String(16), nullable=True)
+	Update_Time = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.now(), onupdate=func.now())
+
+	# Define Table Arguments
+	__table_args__ = (
+		Index('idx_device_summary_stream_time', Last_Stream_Time.asc().nulls_first(), Device_ID),
+		Index('idx_device_summary_firmware', Firmware.asc().nulls_first(), Device_ID),
+		Index('idx_device_summary_status', Status_Description.asc().nulls_first(), Device_ID),
+		Index('idx_device_summary_model', Model_Name.asc().nulls_first(), Device_ID),
+	)
+
+# Measurement_Rollup Database Model
+class Measurement_Rollup(Base):
+
+	# Define Table Name
+	__tablename__ = "Measurement_Rollup"
+
+	# Define Columns
+	Bucket_Width = Column(Integer, primary_key=True, nullable=False)
+	Device_ID = Column(String(21), ForeignKey("Device.Device_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Variable_ID = Column(String(30), ForeignKey("Variable.Variable_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Bucket_Time = Column(TIMESTAMP(timezone=True), primary_key=True, nullable=False)
+	Min_Value = Column(Float, nullable=False)
+	Max_Value = Column(Float, nullable=False)
+	Sum_Value = Column(Float, nullable=False)
+	Value_Count = Column(BigInteger, nullable=False)
+
+	# Define Table Arguments
+	__table_args__ = (
+		Index('idx_rollup_variable_time', 'Bucket_Width', 'Variable_ID', 'Bucket_Time'),
 	)
 
+# Rule_Trigger Database Model
+class Rule_Trigger(Base):
+
+	# Define Table Name
+	__tablename__ = "Rule_Trigger"
+
+	# Define Columns
+	Trigger_ID = Column(BigInteger, primary_key=True, autoincrement=True, nullable=False)
+	Rule_ID = Column(Integer, ForeignKey("Rules.Rule_ID", ondelete="CASCADE"), nullable=False)
+	Rule_Chain_ID = Column(Integer, nullable=False)
+	Device_ID = Column(String(21), nullable=False)
+	Variable_ID = Column(String(30), nullable=False)
+	Stream_ID = Column(Integer, nullable=False)
+	Measurement_Value = Column(Float, nullable=False)
+	Trigger_Time = Column(TIMESTAMP(timezone=True), nullable=False)
+	Clear_Time = Column(TIMESTAMP(timezone=True), nullable=True)
 
+	# Define Table Arguments
+	__table_args__ = (
+		Index('idx_rule_trigger_rule_id', 'Rule_ID'),
+		Index('idx_rule_trigger_open', 'Rule_ID', 'Device_ID', unique=True, postgresql_where=Clear_Time.is_(None)),
+	)
+
+# Operator_Daily Database Model
+class Operator_Daily(Base):
+
+	# Define Table Name
+	__tablename__ = "Operator_Daily"
+
+	# Define Columns
+	Operator_ID = Column(Integer, ForeignKey("GSM_Operator.Operator_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Day = Column(TIMESTAMP(timezone=True), primary_key=True, nullable=False)
+	Stream_Count = Column(BigInteger, nullable=False)
+	Byte_Count = Column(BigInteger, nullable=False)
+	Active_SIM_Count = Column(Integer, nullable=False)
+
+	# Define Table Arguments
+	__table_args__ = (
+		Index('idx_operator_daily_day', 'Day'),
+	)
+
+# SIM_Daily Database Model
+class SIM_Daily(Base):
+
+	# Define Table Name
+	__tablename__ = "SIM_Daily"
+
+	# Define Columns
+	Day = Column(TIMESTAMP(timezone=True), primary_key=True, nullable=False)
+	SIM_ID = Column(Integer, ForeignKey("SIM.SIM_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Operator_ID = Column(Integer, nullable=False)
+
+# Unknown_Payload Database Model
+class Unknown_Payload(Base):
+
+	# Define Table Name
+	__tablename__ = "Unknown_Payload"
+
+	# Define Columns
+	Content_Hash = Column(String(32), primary_key=True, nullable=False)
+	Sample_Data = Column(String(1024), nullable=True)
+	Payload_Count = Column(BigInteger, nullable=False)
+	First_Data_ID = Column(Integer, nullable=False)
+	Last_Data_ID = Column(Integer, nullable=False)
+	First_Seen = Column(TIMESTAMP(timezone=True), nullable=False)
+	Last_Seen = Column(TIMESTAMP(timezone=True), nullable=False)
+
+	# Define Table Arguments
+	__table_args__ = (
+		Index('idx_unknown_payload_count', 'Payload_Count', 'Content_Hash'),
+	)
+
+# Unknown_Payload_Source Database Model
+class Unknown_Payload_Source(Base):
+
+	# Define Table Name
+	__tablename__ = "Unknown_Payload_Source"
+
+	# Define Columns
+	Content_Hash = Column(String(32), ForeignKey("Unknown_Payload.Content_Hash", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Client_IP = Column(String(16), primary_key=True, nullable=False)
+	Payload_Count = Column(BigInteger, nullable=False)
+	Last_Seen = Column(TIMESTAMP(timezone=True), nullable=False)
+
+# Firmware_Rollout Database Model
+class Firmware_Rollout(Base):
+
+	# Define Table Name
+	__tablename__ = "Firmware_Rollout"
+
+	# Define Columns
+	Version_ID = Column(Integer, ForeignKey("Version.Version_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Project_ID = Column(Integer, primary_key=True, nullable=False)
+	Model_ID = Column(Integer, ForeignKey("Model.Model_ID", ondelete="CASCADE"), primary_key=True, nullable=False)
+	Device_Count = Column(Integer, nullable=False)
+	Update_Time = Column(TIMESTAMP(timezone=True), nullable=True, server_default=func.now(), onupdate=func.now())
+
+# Firmware_Rollout_Device Database Model
+class Firmware_Rollout_Device(Base):
+
+	# Define Table Name
+	__tablename__ = "Firmware_Rollout_Device"
+
+	# Define Columns
+	Device_ID = Column(String(21), primary_key=True, nullable=False)
+	Version_ID = Column(Integer, nullable=False)
+	Project_ID = Column(Integer, nullable=False)
+	Model_ID = Column(Integer, nullable=False)
@@ -0,0 +1,264 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import threading
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Models, Refresh, Audit, Query
+from Setup.Config import APP_Settings
+
+# Define Default And Longest Range In Days
+Default_Days = 30
+Max_Days = 366
+
+# Get Flag
+def Get_Flag(ISO):
+
+	# Build The Flag Emoji From Regional Indicator Letters
+	if ISO and len(ISO) == 2 and ISO.isalpha():
+		return ''.join(chr(0x1F1E6 + ord(Letter) - ord('A')) for Letter in ISO.upper())
+
+	# Return No Flag
+	return ''
+
+# Format Bytes
+def Format_Bytes(Bytes):
+
+	# Scale To The Largest Whole Unit
+	Value = float(Bytes or 0)
+	for Unit in ('B', 'KB', 'MB', 'GB', 'TB'):
+		if Value < 1024 or Unit == 'TB':
+			return f'{Value:.0f} {Unit}' if Unit == 'B' else f'{Value:.1f} {Unit}'
+		Value /= 1024
+
+# Define Operator Directory
+class Operator_Directory:
+
+	# Initialize Directory
+	def __init__(self, TTL):
+
+		# Set Directory State
+		self.TTL = TTL
+		self.Operators = {}
+		self.Load_Time = float('-inf')
+		self.Misses = {}
+		self.Lock = threading.Lock()
+
+	# Get Operator Statement
+	def Get_Statement(self):
+
+		# Query Only Display Columns
+		return select(
+			Models.GSM_Operator.Operator_ID,
+			Models.GSM_Operator.MCC_ISO,
+			Models.GSM_Operator.MCC_Country_Name,
+			Models.GSM_Operator.MNC_Brand_Name,
+			Models.GSM_Operator.MNC_Operator_Name,
+			Models.GSM_Operator.MNC_Operator_Image_URL,
+		)
+
+	# Check Directory Freshness
+	def Needs_Load(self, Keys=()):
+
+		# Missing Or Expired
+		Now = time.monotonic()
+		if Now - self.Load_Time > self.TTL:
+			return True
+
+		# Missing A Requested Operator That Was Not Already Looked For Within The TTL
+		return any(Now - self.Misses.get(Key, float('-inf')) > self.TTL for Key in set(Keys) - self.Operators.keys() - {None})
+
+	# Store Operator Map
+	def Store(self, Rows, Keys=()):
+
+		# Resolve Flags Locally Once Per Operator
+		Operators = {Row.Operator_ID: {
+			'ISO': Row.MCC_ISO,
+			'Country': Row.MCC_Country_Name,
+			'Flag': Get_Flag(Row.MCC_ISO),
+			'Brand': Row.MNC_Brand_Name,
+			'Operator': Row.MNC_Operator_Name,
+			'Logo': Row.MNC_Operator_Image_URL,
+		} for Row in Rows}
+
+		# Remember Requested Operators The Table Does Not Have, So They Do Not Reload It Again Until The TTL Passes
+		Now = time.monotonic()
+		Misses = {Key: Miss_Time for Key, Miss_Time in self.Misses.items() if Now - Miss_Time <= self.TTL and Key not in Operators}
+		Misses.update((Key, Now) for Key in set(Keys) - Operators.keys() - {None})
+
+		# Swap In The New Map
+		with self.Lock:
+			self.Operators = Operators
+			self.Misses = Misses
+			self.Load_Time = Now
+
+		# Return Operator Map
+		return Operators
+
+	# Load Operator Map
+	def Load(self, Keys=()):
+
+		# Try to query the database
+		try:
+			return self.Store(Query.Read_Rows(self.Get_Statement()), Keys)
+
+		# Keep The Previous Map When The Load Failed
+		except SQLAlchemyError:
+			return self.Operators
+
+	# Refresh Operator Map
+	def Refresh(self, Keys=()):
+
+		# Reload Missing Or Expired Maps, Or Maps Missing An Operator Not Yet Looked For
+		if self.Needs_Load(Keys):
+			self.Load(Keys)
+
+	# Get Operator
+	def Get(self, Operator_ID):
+
+		# Return Operator Or A Placeholder From The Cached Map, Callers Refresh It Before Rendering
+		return self.Operators.get(Operator_ID) or {'ISO': '', 'Country': 'Unknown', 'Flag': '', 'Brand': str(Operator_ID), 'Operator': str(Operator_ID), 'Logo': None}
+
+# Apply Stream Batch
+def Apply_Streams(Connection, Low, High):
+
+	# Select The Batch With The Operator Of Each SIM
+	Batch = select(
+		Models.SIM.Operator_ID,
+		func.date_trunc('day', Models.Stream.Stream_Time, 'UTC').label('Day'),
+		Models.Stream.SIM_ID,
+		Models.Stream.Size,
+	).join(Models.SIM, Models.SIM.SIM_ID == Models.Stream.SIM_ID).where(
+		Models.Stream.Stream_ID > Low,
+		Models.Stream.Stream_ID <= High,
+	).cte('Batch')
+
+	# Remember SIMs Seen Per Day, Returning Only Those New To The Day
+	New_SIMs = insert(Models.SIM_Daily).from_select(['Day', 'SIM_ID', 'Operator_ID'], select(Batch.c.Day, Batch.c.SIM_ID, Batch.c.Operator_ID).distinct()).on_conflict_do_nothing().returning(Models.SIM_Daily.Operator_ID, Models.SIM_Daily.Day).cte('New_SIMs')
+
+	# Total The Batch Per Operator And Day
+	Totals = select(
+		Batch.c.Operator_ID,
+		Batch.c.Day,
+		func.count(),
+		func.coalesce(func.sum(Batch.c.Size), 0),
+		select(func.count()).where(New_SIMs.c.Operator_ID == Batch.c.Operator_ID, New_SIMs.c.Day == Batch.c.Day).scalar_subquery(),
+	).group_by(Batch.c.Operator_ID, Batch.c.Day)
+
+	# Add The Batch To Existing Days
+	Statement = insert(Models.Operator_Daily).from_select(['Operator_ID', 'Day', 'Stream_Count', 'Byte_Count', 'Active_SIM_Count'], Totals)
+	Statement = Statement.on_conflict_do_update(
+		index_elements=['Operator_ID', 'Day'],
+		set_={Column: Models.Operator_Daily.__table__.c[Column] + Statement.excluded[Column] for Column in ('Stream_Count', 'Byte_Count', 'Active_SIM_Count')},
+	)
+
+	# Run Upsert With The SIM Insert At The Top Level
+	Connection.execute(Statement.add_cte(New_SIMs))
+
+# Refresh Operator Aggregates
+def Refresh_Operators(Batch_Size=100000):
+
+	# Create Aggregate Tables On First Refresh
+	Refresh.Ensure_Tables(Models.SIM_Daily, Models.Operator_Daily)
+
+	# Fold New Streams Into The Daily Aggregates
+	return Refresh.Run_Batches('Operator_Daily', Models.Stream.Stream_ID, Apply_Streams, Batch_Size)
+
+# Build Operator Query
+def Build_Operator_Query(Start_Time, End_Time):
+
+	# Total Each Operator Over The Range
+	return select(
+		Models.Operator_Daily.Operator_ID,
+		func.sum(Models.Operator_Daily.Stream_Count).label('Streams'),
+		func.sum(Models.Operator_Daily.Byte_Count).label('Bytes'),
+		func.sum(Models.Operator_Daily.Active_SIM_Count).label('SIM_Days'),
+		func.max(Models.Operator_Daily.Active_SIM_Count).label('Peak_SIMs'),
+	).where(
+		Models.Operator_Daily.Day >= Start_Time,
+		Models.Operator_Daily.Day < End_Time,
+	).group_by(Models.Operator_Daily.Operator_ID).order_by(func.sum(Models.Operator_Daily.Stream_Count).desc())
+
+# Build Daily Query
+def Build_Daily_Query(Operator_ID, Start_Time, End_Time):
+
+	# Total Each Day, For One Operator Or All Of Them
+	Statement = select(
+		Query.Formatted(Models.Operator_Daily.Day),
+		func.sum(Models.Operator_Daily.Stream_Count).label('Streams'),
+		func.sum(Models.Operator_Daily.Byte_Count).label('Bytes'),
+		func.sum(Models.Operator_Daily.Active_SIM_Count).label('Active_SIMs'),
+	).where(
+		Models.Operator_Daily.Day >= Start_Time,
+		Models.Operator_Daily.Day < End_Time,
+	).group_by(Models.Operator_Daily.Day).order_by(Models.Operator_Daily.Day)
+
+	# Filter Operator
+	if Operator_ID is not None:
+		Statement = Statement.where(Models.Operator_Daily.Operator_ID == Operator_ID)
+
+	# Return Statement
+	return Statement
+
+# Parse Operator Arguments
+def Parse_Operator_Arguments(Args):
+
+	# Try to parse the range as UTC days
+	try:
+		End_Day = date.fromisoformat(Args['end']) if Args.get('end') else datetime.now(timezone.utc).date()
+		Start_Day = date.fromisoformat(Args['start']) if Args.get('start') else End_Day - timedelta(days=Default_Days - 1)
+	except ValueError:
+		raise ValueError('Invalid date')
+
+	# Validate Range
+	if Start_Day > End_Day or (End_Day - Start_Day).days >= Max_Days:
+		raise ValueError('Invalid range')
+
+	# Parse Operator
+	try:
+		Operator_ID = int(Args['operator']) if Args.get('operator') else None
+	except ValueError:
+		raise ValueError('Invalid operator')
+
+	# Return Arguments With An Exclusive End
+	Start_Time = datetime.combine(Start_Day, datetime.min.time(), timezone.utc)
+	End_Time = datetime.combine(End_Day + timedelta(days=1), datetime.min.time(), timezone.utc)
+	return {'Start_Day': Start_Day, 'End_Day': End_Day, 'Start_Time': Start_Time, 'End_Time': End_Time, 'Operator_ID': Operator_ID}
+
+# Format Operators
+def Format_Operators(Operator_Rows, Daily_Rows):
+
+	# Attach Cached Operator Details
+	Operators = [dict(Directory.Get(Row.Operator_ID), **Row._asdict()) for Row in Operator_Rows]
+
+	# Total Each Country From The Operator Rows
+	Countries = {}
+	for Operator in Operators:
+		Country = Countries.setdefault(Operator['ISO'] or Operator['Country'], {'Country': Operator['Country'], 'Flag': Operator['Flag'], 'Operators': 0, 'Streams': 0, 'Bytes': 0, 'SIM_Days': 0})
+		Country['Operators'] += 1
+		for Column in ('Streams', 'Bytes', 'SIM_Days'):
+			Country[Column] += Operator[Column]
+
+	# Sort Countries By Traffic
+	Countries = sorted(Countries.values(), key=lambda Country: Country['Streams'], reverse=True)
+	Days = [Row._asdict() for Row in Daily_Rows]
+
+	# Add Readable Byte Counts
+	for Row in Operators + Countries + Days:
+		Row['Bytes_Text'] = Format_Bytes(Row['Bytes'])
+
+	# Return Operators, Countries And Days
+	return Operators, Countries, Days
+
+# Set Operator Directory
+Directory = Operator_Directory(APP_Settings.DIMENSION_CACHE_TTL)
+
+# Register Audited Queries
+Audit.Register_Query('Operator Totals', lambda: Build_Operator_Query(*Audit.Sample_Range()))
+Audit.Register_Query('Operator Daily', lambda: Build_Daily_Query(1, *Audit.Sample_Range()))
+Audit.Register_Query('Fleet Operator Daily', lambda: Build_Daily_Query(None, *Audit.Sample_Range()))
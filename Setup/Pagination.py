@@ -0,0 +1,152 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import base64
+import binascii
+from datetime import datetime, timezone
+from sqlalchemy import desc, tuple_
+from Setup import Models
+
+# Define Page Size Limits
+Default_Page_Size = 10
+Max_Page_Size = 500
+
+# Define Filter Parameters
+Filter_Parameters = ('level', 'service', 'device', 'start', 'end')
+
+# Encode Cursor
+def Encode_Cursor(Create_Time, Log_ID):
+
+	# Build Raw Cursor
+	Raw_Cursor = f'{Create_Time.isoformat()}|{Log_ID}'
+
+	# Return URL Safe Cursor
+	return base64.urlsafe_b64encode(Raw_Cursor.encode()).decode().rstrip('=')
+
+# Decode Cursor
+def Decode_Cursor(Cursor):
+
+	# Empty Cursor Starts From The Newest Row
+	if not Cursor:
+		return None
+
+	# Try to decode cursor
+	try:
+
+		# Restore Padding
+		Padded_Cursor = Cursor + '=' * (-len(Cursor) % 4)
+
+		# Split Raw Cursor
+		Create_Time, Log_ID = base64.urlsafe_b64decode(Padded_Cursor.encode()).decode().split('|')
+
+		# Return Cursor Key
+		return datetime.fromisoformat(Create_Time), int(Log_ID)
+
+	# Handle Malformed Cursor
+	except (binascii.Error, UnicodeDecodeError, ValueError):
+
+		# Raise Error
+		raise ValueError('Invalid cursor')
+
+# Parse Page Size
+def Parse_Limit(Value, Default=Default_Page_Size):
+
+	# Use Default Page Size
+	if Value in (None, ''):
+		return Default
+
+	# Parse Page Size
+	try:
+		Limit = int(Value)
+	except ValueError:
+		raise ValueError('Invalid limit')
+
+	# Clamp Page Size
+	return max(1, min(Limit, Max_Page_Size))
+
+# Parse Filter Time
+def Parse_Filter_Time(Value):
+
+	# Read Times Without An Offset As UTC, Log Times Are Timezone Aware
+	Time = datetime.fromisoformat(Value)
+	return Time if Time.tzinfo else Time.replace(tzinfo=timezone.utc)
+
+# Parse Log Filters
+def Parse_Log_Filters(Args):
+
+	# Define Filters
+	Filters = {}
+
+	# Try to parse filters
+	try:
+
+		# Parse Integer Filters
+		if Args.get('level'):
+			Filters['Log_Level_ID'] = int(Args['level'])
+		if Args.get('service'):
+			Filters['Service_ID'] = int(Args['service'])
+
+		# Parse Device Filter
+		if Args.get('device'):
+			Filters['Device_ID'] = Args['device']
+
+		# Parse Time Range Filters
+		if Args.get('start'):
+			Filters['Start_Time'] = Parse_Filter_Time(Args['start'])
+		if Args.get('end'):
+			Filters['End_Time'] = Parse_Filter_Time(Args['end'])
+
+	# Handle Malformed Filters
+	except ValueError:
+
+		# Raise Error
+		raise ValueError('Invalid filter')
+
+	# Return Filters
+	return Filters
+
+# Apply Log Filters
+def Apply_Log_Filters(Query, Filters):
+
+	# Apply Equality Filters
+	for Key in ('Log_Level_ID', 'Service_ID', 'Device_ID'):
+		if Key in Filters:
+			Query = Query.filter(getattr(Models.Log, Key) == Filters[Key])
+
+	# Apply Time Range Filters
+	if 'Start_Time' in Filters:
+		Query = Query.filter(Models.Log.Create_Time >= Filters['Start_Time'])
+	if 'End_Time' in Filters:
+		Query = Query.filter(Models.Log.Create_Time < Filters['End_Time'])
+
+	# Return Query
+	return Query
+
+# Apply Log Keyset
+def Apply_Log_Keyset(Query, Cursor_Key, Limit):
+
+	# Seek Past The Last Seen Row, The Plain Bound Lets Partitions Be Pruned
+	if Cursor_Key is not None:
+		Query = Query.filter(tuple_(Models.Log.Create_Time, Models.Log.Log_ID) < tuple_(*Cursor_Key), Models.Log.Create_Time <= Cursor_Key[0])
+
+	# Order By The Composite Index And Fetch One Extra Row
+	return Query.order_by(desc(Models.Log.Create_Time), desc(Models.Log.Log_ID)).limit(Limit + 1)
+
+# Match Log Filters
+def Match_Log_Filters(Log, Filters):
+
+	# Check Equality Filters
+	for Key in ('Log_Level_ID', 'Service_ID', 'Device_ID'):
+		if Key in Filters and getattr(Log, Key) != Filters[Key]:
+			return False
+
+	# Check Time Range Filters
+	if 'Start_Time' in Filters and Log.Create_Time < Filters['Start_Time']:
+		return False
+	if 'End_Time' in Filters and Log.Create_Time >= Filters['End_Time']:
+		return False
+
+	# Row Matches
+	return True
@@ -0,0 +1,276 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import re
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func, text
+from sqlalchemy.schema import CreateIndex, AddConstraint
+from Setup import Database, Models
+from Setup.Config import APP_Settings
+
+# Define Partition Bound Pattern
+Bound_Pattern = re.compile(r"FROM \((.+)\) TO \((.+)\)")
+
+# Get Partitioned Tables
+def Get_Partitioned_Tables(Metadata=Database.Base.metadata):
+
+	# Return Tables Declaring A Partition Column, Referenced Tables First
+	return [Table for Table in Metadata.sorted_tables if 'Partition_Column' in Table.info]
+
+# Get Measurement Time Bounds
+def Get_Measurement_Bounds(Start_Time=None, End_Time=None):
+
+	# Measurements Are Written With Or After Their Stream And At Most The Ingest Lag Later, So A Stream_Time Range Maps Onto Their Partition Column
+	Bounds = []
+	if Start_Time is not None:
+		Bounds.append(Models.Measurement.Create_Time >= Start_Time)
+	if End_Time is not None:
+		Bounds.append(Models.Measurement.Create_Time < End_Time + timedelta(seconds=APP_Settings.PARTITION_MEASUREMENT_LAG))
+
+	# Return Predicates
+	return Bounds
+
+# Get Batch Times
+def Get_Batch_Times(Connection, Low, High):
+
+	# Read The Oldest And Newest Create_Time Of A Measurement ID Batch, Both None When The Batch Is Empty
+	return Connection.execute(select(func.min(Models.Measurement.Create_Time), func.max(Models.Measurement.Create_Time)).where(
+		Models.Measurement.Measurement_ID > Low,
+		Models.Measurement.Measurement_ID <= High,
+	)).one()
+
+# Quote Name
+def Quote(Name):
+
+	# Return Quoted Identifier
+	return '"' + Name.replace('"', '""') + '"'
+
+# Month Start
+def Month_Start(Time, Offset=0):
+
+	# Return First Day Of The Month Offset Months Away
+	Month = Time.year * 12 + Time.month - 1 + Offset
+	return datetime(Month // 12, Month % 12 + 1, 1, tzinfo=timezone.utc)
+
+# Parse Bound
+def Parse_Bound(Value):
+
+	# MINVALUE And MAXVALUE Are Open Ends
+	if Value in ('MINVALUE', 'MAXVALUE'):
+		return None
+
+	# Return Bound Timestamp
+	return datetime.fromisoformat(Value.strip("'"))
+
+# Is Partitioned
+def Is_Partitioned(Connection, Name):
+
+	# Look Up Partitioned Table Catalog
+	return Connection.execute(text('SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:Name))'), {'Name': Quote(Name)}).scalar()
+
+# Get Partitions
+def Get_Partitions(Connection, Name):
+
+	# Print Bounds In UTC
+	Connection.execute(text("SET LOCAL timezone = 'UTC'"))
+
+	# Query Attached Partitions
+	Rows = Connection.execute(text('SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid WHERE i.inhparent = to_regclass(:Name)'), {'Name': Quote(Name)}).all()
+
+	# Return Partitions As (Name, Lower, Upper), Oldest First
+	Partitions = [(Partition_Name, *map(Parse_Bound, Bound_Pattern.search(Bound).groups())) for Partition_Name, Bound in Rows]
+	return sorted(Partitions, key=lambda Partition: Partition[2] or datetime.max.replace(tzinfo=timezone.utc))
+
+# Get Bound Constraint Name
+def Get_Bound_Name(Name):
+
+	# Return Name Of The Check Proving Legacy Rows Fit Before The Boundary
+	return f'{Name}_Legacy_Bound'
+
+# Add Bound Check
+def Add_Bound_Check(Connection, Table, Boundary):
+
+	# Declare Without Checking Existing Rows, Which Only Needs A Brief Lock
+	Name, Column = Table.name, Table.info['Partition_Column']
+	Connection.execute(text(f"ALTER TABLE {Quote(Name)} ADD CONSTRAINT {Quote(Get_Bound_Name(Name))} CHECK ({Quote(Column)} IS NOT NULL AND {Quote(Column)} < '{Boundary.isoformat()}') NOT VALID"))
+
+# Validate Bound Check
+def Validate_Bound_Check(Connection, Table):
+
+	# Scan Existing Rows While Reads And Writes Go On, So Attaching Later Can Skip The Scan
+	Connection.execute(text(f'ALTER TABLE {Quote(Table.name)} VALIDATE CONSTRAINT {Quote(Get_Bound_Name(Table.name))}'))
+
+# Drop Bound Check
+def Drop_Bound_Check(Connection, Name, Relation=None):
+
+	# Remove The Check Made For Name From Name Or A Table Copied From It, Since It Would Reject New Rows Once The Boundary Passes
+	Connection.execute(text(f'ALTER TABLE {Quote(Relation or Name)} DROP CONSTRAINT IF EXISTS {Quote(Get_Bound_Name(Name))}'))
+
+# Convert Table
+def Convert_Table(Connection, Table, Boundary):
+
+	# Get Names
+	Name, Column = Table.name, Table.info['Partition_Column']
+	Legacy = f'{Name}_Legacy'
+
+	# Drop Foreign Keys Pointing At The Table, A Partitioned Key Would Need The Partition Column That Referencing Tables Lack
+	Dropped = []
+	for Referencing, Constraint, Definition in Connection.execute(text('SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) FROM pg_constraint WHERE contype = \'f\' AND confrelid = to_regclass(:Name)'), {'Name': Quote(Name)}).all():
+		Connection.execute(text(f'ALTER TABLE {Referencing} DROP CONSTRAINT {Quote(Constraint)}'))
+		Dropped.append(f'{Referencing}.{Constraint} {Definition}')
+
+	# Move The Existing Heap Aside Together With Its Index Names
+	Connection.execute(text(f'ALTER TABLE {Quote(Name)} RENAME TO {Quote(Legacy)}'))
+	for Index_Name, in Connection.execute(text('SELECT indexname FROM pg_indexes WHERE schemaname = current_schema() AND tablename = :Legacy'), {'Legacy': Legacy}).all():
+		Connection.execute(text(f'ALTER INDEX {Quote(Index_Name)} RENAME TO {Quote("legacy_" + Index_Name)}'))
+
+	# Create The Partitioned Parent With The Same Columns And Defaults, Leaving The Bound Check On The Legacy Heap
+	Connection.execute(text(f'CREATE TABLE {Quote(Name)} (LIKE {Quote(Legacy)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE) PARTITION BY RANGE ({Quote(Column)})'))
+	Drop_Bound_Check(Connection, Name)
+	Partition_Key = ', '.join(Quote(Key) for Key in [Key.name for Key in Table.primary_key.columns] + [Column])
+	Connection.execute(text(f'ALTER TABLE {Quote(Name)} ADD PRIMARY KEY ({Partition_Key})'))
+
+	# Keep The Id Sequence Alive When The Legacy Partition Is Dropped
+	for Key in Table.primary_key.columns:
+		Sequence = Connection.execute(text('SELECT pg_get_serial_sequence(:Legacy, :Key)'), {'Legacy': Quote(Legacy), 'Key': Key.name}).scalar()
+		if Sequence is not None:
+			Connection.execute(text(f'ALTER SEQUENCE {Sequence} OWNED BY {Quote(Name)}.{Quote(Key.name)}'))
+
+	# Widen The Legacy Primary Key To Match The Parent
+	Primary_Key = Connection.execute(text('SELECT conname FROM pg_constraint WHERE contype = \'p\' AND conrelid = to_regclass(:Legacy)'), {'Legacy': Quote(Legacy)}).scalar()
+	Connection.execute(text(f'ALTER TABLE {Quote(Legacy)} DROP CONSTRAINT {Quote(Primary_Key)}, ADD PRIMARY KEY ({Partition_Key})'))
+
+	# Declare Model Indexes And Foreign Keys To Plain Tables On The Parent
+	for Index in Table.indexes:
+		Connection.execute(CreateIndex(Index))
+	for Constraint in Table.foreign_key_constraints:
+		if 'Partition_Column' not in Constraint.referred_table.info:
+			Connection.execute(AddConstraint(Constraint))
+
+	# Attach The Old Heap As The Partition Holding Everything Before The Boundary, The Validated Check Spares The Scan
+	Connection.execute(text(f"ALTER TABLE {Quote(Name)} ATTACH PARTITION {Quote(Legacy)} FOR VALUES FROM (MINVALUE) TO ('{Boundary.isoformat()}')"))
+
+	# The Partition Bound Now Enforces The Same Range
+	Drop_Bound_Check(Connection, Name, Legacy)
+
+	# Return Dropped Foreign Keys
+	return Dropped
+
+# Prepare Conversion
+def Prepare_Conversion(Table, Boundary):
+
+	# Try to prove the legacy rows fit the boundary before taking the exclusive lock
+	try:
+
+		# Add The Check In Its Own Short Transaction
+		with Database.DB_Engine.begin() as Connection:
+			Connection.execute(text(f'SET LOCAL lock_timeout = {int(APP_Settings.PARTITION_LOCK_TIMEOUT)}'))
+			Drop_Bound_Check(Connection, Table.name)
+			Add_Bound_Check(Connection, Table, Boundary)
+
+		# Validate It Without Blocking Ingest
+		with Database.DB_Engine.begin() as Connection:
+			Connection.execute(text(f'SET LOCAL lock_timeout = {int(APP_Settings.PARTITION_LOCK_TIMEOUT)}'))
+			Validate_Bound_Check(Connection, Table)
+
+	# Never Leave A Check Behind That Would Start Rejecting Rows At The Boundary
+	except Exception:
+		Abandon_Conversion(Table)
+		raise
+
+# Abandon Conversion
+def Abandon_Conversion(Table):
+
+	# Drop The Bound Check From The Still Plain Table
+	with Database.DB_Engine.begin() as Connection:
+		Drop_Bound_Check(Connection, Table.name)
+
+# Create Partitions
+def Create_Partitions(Connection, Name, Until):
+
+	# Start After The Newest Partition
+	Partitions = Get_Partitions(Connection, Name)
+	Start = Partitions[-1][2] if Partitions else Month_Start(datetime.now(timezone.utc))
+
+	# Define Created Partitions
+	Created = []
+
+	# Create One Partition Per Month
+	while Start < Until:
+		End = Month_Start(Start, 1)
+		Partition_Name = f'{Name}_{Start:%Y_%m}'
+		Connection.execute(text(f"CREATE TABLE {Quote(Partition_Name)} PARTITION OF {Quote(Name)} FOR VALUES FROM ('{Start.isoformat()}') TO ('{End.isoformat()}')"))
+		Created.append(Partition_Name)
+		Start = End
+
+	# Return Created Partitions
+	return Created
+
+# Drop Partitions
+def Drop_Partitions(Connection, Name, Cutoff):
+
+	# Define Dropped Partitions
+	Dropped = []
+
+	# Drop Whole Partitions Ending Before The Cutoff
+	for Partition_Name, Lower, Upper in Get_Partitions(Connection, Name):
+		if Upper is not None and Upper <= Cutoff:
+			Connection.execute(text(f'ALTER TABLE {Quote(Name)} DETACH PARTITION {Quote(Partition_Name)}'))
+			Connection.execute(text(f'DROP TABLE {Quote(Partition_Name)}'))
+			Dropped.append(Partition_Name)
+
+	# Return Dropped Partitions
+	return Dropped
+
+# Maintain Partitions
+def Maintain_Partitions(Months_Ahead=APP_Settings.PARTITION_MONTHS_AHEAD, Retention_Months=APP_Settings.PARTITION_RETENTION_MONTHS):
+
+	# Get Month Bounds
+	Now = datetime.now(timezone.utc)
+	Until = Month_Start(Now, Months_Ahead + 1)
+
+	# Define Report
+	Report = []
+
+	# Maintain Each Table In Its Own Transaction
+	for Table in Get_Partitioned_Tables():
+
+		# Validate The Range Of Plain Tables Before Taking The Exclusive Lock, Current Month Stays In The Legacy Partition
+		Boundary = Month_Start(Now, 1)
+		with Database.DB_Engine.connect() as Connection:
+			Is_Plain = not Is_Partitioned(Connection, Table.name)
+		if Is_Plain:
+			Prepare_Conversion(Table, Boundary)
+
+		# Try to maintain the table
+		try:
+			with Database.DB_Engine.begin() as Connection:
+
+				# Give Up Instead Of Queueing Behind Ingest
+				Connection.execute(text(f'SET LOCAL lock_timeout = {int(APP_Settings.PARTITION_LOCK_TIMEOUT)}'))
+
+				# Convert Plain Tables
+				if Is_Plain:
+					for Foreign_Key in Convert_Table(Connection, Table, Boundary):
+						Report.append((Table.name, 'dropped foreign key', Foreign_Key))
+					Report.append((Table.name, 'converted', f'{Table.name}_Legacy'))
+
+				# Create Future Partitions
+				for Partition_Name in Create_Partitions(Connection, Table.name, Until):
+					Report.append((Table.name, 'created', Partition_Name))
+
+				# Drop Expired Partitions
+				if Retention_Months > 0:
+					for Partition_Name in Drop_Partitions(Connection, Table.name, Month_Start(Now, -Retention_Months)):
+						Report.append((Table.name, 'dropped', Partition_Name))
+
+		# Leave A Table That Stayed Plain Without The Bound Check
+		except Exception:
+			if Is_Plain:
+				Abandon_Conversion(Table)
+			raise
+
+	# Return Report
+	return Report
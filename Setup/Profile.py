@@ -0,0 +1,224 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import bisect
+import logging
+import threading
+import contextvars
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from Setup import Database
+from Setup.Config import APP_Settings
+
+# Define Slow Query Logger
+Logger = logging.getLogger('PostOffice.SQL')
+
+# Define Histogram Buckets In Seconds
+Buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+Count_Buckets = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+# Define Current Request Profile
+Current_Profile = contextvars.ContextVar('Current_Profile', default=None)
+
+# Define Histogram
+class Histogram:
+
+	# Initialize Histogram
+	def __init__(self, Name, Help, Bounds=Buckets):
+
+		# Set Histogram State
+		self.Name = Name
+		self.Help = Help
+		self.Bounds = Bounds
+		self.Series = {}
+		self.Lock = threading.Lock()
+
+	# Observe Value
+	def Observe(self, Value, Endpoint):
+
+		# Add Value To Its Bucket
+		with self.Lock:
+			Counts, Total = self.Series.get(Endpoint, ([0] * (len(self.Bounds) + 1), 0.0))
+			Counts[bisect.bisect_left(self.Bounds, Value)] += 1
+			self.Series[Endpoint] = (Counts, Total + Value)
+
+	# Render Histogram
+	def Render(self):
+
+		# Write Help And Type
+		Lines = [f'# HELP {self.Name} {self.Help}', f'# TYPE {self.Name} histogram']
+
+		# Write Cumulative Buckets Per Endpoint
+		with self.Lock:
+			for Endpoint, (Counts, Total) in sorted(self.Series.items()):
+				Cumulative = 0
+				for Bound, Count in zip(self.Bounds + ('+Inf',), Counts):
+					Cumulative += Count
+					Lines.append(f'{self.Name}_bucket{{endpoint="{Endpoint}",le="{Bound}"}} {Cumulative}')
+				Lines.append(f'{self.Name}_sum{{endpoint="{Endpoint}"}} {Total}')
+				Lines.append(f'{self.Name}_count{{endpoint="{Endpoint}"}} {Cumulative}')
+
+		# Return Lines
+		return Lines
+
+# Define Request Histograms
+Histograms = {
+	'Total': Histogram('postoffice_request_seconds', 'Request handling time.'),
+	'SQL_Time': Histogram('postoffice_request_sql_seconds', 'Time spent in SQL per request.'),
+	'SQL_Count': Histogram('postoffice_request_sql_queries', 'SQL statements per request.', Count_Buckets),
+	'Pool_Wait': Histogram('postoffice_request_pool_wait_seconds', 'Time spent waiting for a pooled connection per request.'),
+	'Render_Time': Histogram('postoffice_request_render_seconds', 'Template rendering time per request.'),
+}
+
+# Start Query
+def Start_Query(Connection, Cursor, Statement, Parameters, Context, Executemany):
+
+	# Stack Start Times, Explain Queries Run Nested
+	Connection.info.setdefault('Query_Start', []).append(time.perf_counter())
+
+# End Query
+def End_Query(Connection, Cursor, Statement, Parameters, Context, Executemany):
+
+	# Get Query Time
+	Starts = Connection.info.get('Query_Start')
+	if not Starts:
+		return
+	Elapsed = time.perf_counter() - Starts.pop()
+
+	# Add To The Current Request
+	Profile = Current_Profile.get()
+	if Profile is not None:
+		Profile['SQL_Count'] += 1
+		Profile['SQL_Time'] += Elapsed
+
+	# Log Slow Queries Once, Skipping The Explain Itself
+	if Elapsed * 1000 >= APP_Settings.PROFILE_SLOW_QUERY_MS and not Connection.info.get('Explaining'):
+		Log_Slow_Query(Connection, Statement, Parameters, Executemany, Elapsed)
+
+# Log Slow Query
+def Log_Slow_Query(Connection, Statement, Parameters, Executemany, Elapsed):
+
+	# Explain Single Reads On The Same Connection
+	Plan = ''
+	if APP_Settings.PROFILE_EXPLAIN and not Executemany and Statement.lstrip().upper().startswith(('SELECT', 'WITH')):
+		Connection.info['Explaining'] = True
+		try:
+			Plan = '\n'.join(Row[0] for Row in Connection.exec_driver_sql(f'EXPLAIN {Statement}', Parameters))
+		except Exception as e:
+			Plan = f'EXPLAIN failed: {e}'
+		finally:
+			Connection.info['Explaining'] = False
+
+	# Write Log Entry
+	Logger.warning('Slow query %.1f ms\n%s\n%s', Elapsed * 1000, Statement, Plan)
+
+# Record Pool Wait
+def Record_Pool_Wait(Wait_Time):
+
+	# Add To The Current Request
+	Profile = Current_Profile.get()
+	if Profile is not None:
+		Profile['Pool_Wait'] += Wait_Time
+
+# Start Profile
+def Start_Profile():
+
+	# Open A Profile For This Request
+	Current_Profile.set({'Start': time.perf_counter(), 'SQL_Count': 0, 'SQL_Time': 0.0, 'Pool_Wait': 0.0, 'Render_Time': 0.0, 'Render_Start': []})
+
+# Finish Profile
+def Finish_Profile(Response, Endpoint):
+
+	# Skip Requests Without A Profile
+	Profile = Current_Profile.get()
+	if Profile is None:
+		return Response
+
+	# Record Totals
+	Profile['Total'] = time.perf_counter() - Profile['Start']
+	for Key, Metric in Histograms.items():
+		Metric.Observe(Profile[Key], Endpoint or 'unknown')
+
+	# Expose Timings To Browser Dev Tools
+	Response.headers['Server-Timing'] = ', '.join((
+		f'sql;dur={Profile["SQL_Time"] * 1000:.1f};desc="{Profile["SQL_Count"]} queries"',
+		f'pool;dur={Profile["Pool_Wait"] * 1000:.1f}',
+		f'render;dur={Profile["Render_Time"] * 1000:.1f}',
+		f'total;dur={Profile["Total"] * 1000:.1f}',
+	))
+
+	# Return Response
+	return Response
+
+# Start Render
+def Start_Render(*Arguments, **Keywords):
+
+	# Stamp Render Start
+	Profile = Current_Profile.get()
+	if Profile is not None:
+		Profile['Render_Start'].append(time.perf_counter())
+
+# End Render
+def End_Render(*Arguments, **Keywords):
+
+	# Add Render Time
+	Profile = Current_Profile.get()
+	if Profile is not None and Profile['Render_Start']:
+		Profile['Render_Time'] += time.perf_counter() - Profile['Render_Start'].pop()
+
+# Render Metrics
+def Render_Metrics(Engine=None):
+
+	# Write Request Histograms
+	Lines = []
+	for Metric in Histograms.values():
+		Lines += Metric.Render()
+
+	# Write Pool Counters And Gauges
+	for Key, Value in Database.Get_Pool_Status(Engine).items():
+		Name = f'postoffice_pool_{Key.lower()}'
+		Lines += [f'# TYPE {Name} {"counter" if Key in ("Checkouts", "Checkout_Timeouts", "Checkout_Wait_Total") else "gauge"}', f'{Name} {float(Value)}']
+
+	# Return Exposition Text
+	return '\n'.join(Lines) + '\n'
+
+# Install Profiling
+def Install(App, Before_Render, Rendered, Is_Async=False):
+
+	# Profiling Is Opt In
+	if not APP_Settings.PROFILE_ENABLED:
+		return
+
+	# Time Every Statement And Attribute Pool Waits To Requests
+	event.listen(Engine, 'before_cursor_execute', Start_Query)
+	event.listen(Engine, 'after_cursor_execute', End_Query)
+	Database.Checkout_Listeners.append(Record_Pool_Wait)
+
+	# Hook Template Rendering
+	if Is_Async:
+		async def Async_Start_Render(*Arguments, **Keywords):
+			Start_Render()
+		async def Async_End_Render(*Arguments, **Keywords):
+			End_Render()
+		Before_Render.connect(Async_Start_Render, App, weak=False)
+		Rendered.connect(Async_End_Render, App, weak=False)
+	else:
+		Before_Render.connect(Start_Render, App, weak=False)
+		Rendered.connect(End_Render, App, weak=False)
+
+	# Hook Requests, Quart Runs Sync Hooks In Threads So Async Apps Get Coroutines
+	if Is_Async:
+		from quart import request
+		async def Async_Start_Profile():
+			Start_Profile()
+		async def Async_Finish_Profile(Response):
+			return Finish_Profile(Response, request.endpoint)
+		App.before_request(Async_Start_Profile)
+		App.after_request(Async_Finish_Profile)
+	else:
+		from flask import request
+		App.before_request(Start_Profile)
+		App.after_request(lambda Response: Finish_Profile(Response, request.endpoint))
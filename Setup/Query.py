@@ -0,0 +1,44 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from sqlalchemy import func
+from Setup import Database
+
+# Define Timestamp Format
+Timestamp_Format = 'YYYY-MM-DD HH24:MI:SS'
+
+# Format Timestamp Column In SQL
+def Formatted(Column, Name=None):
+
+	# Let The Database Format Every Row In One Pass
+	return func.to_char(Column, Timestamp_Format).label(Name or f'{Column.key}_Text')
+
+# Read Rows
+def Read_Rows(Statement):
+
+	# Open a read only connection without a session
+	with Database.DB_Read_Connection() as Connection:
+
+		# Return Lightweight Row Tuples
+		return Connection.execute(Statement).all()
+
+# Read Scalar
+def Read_Scalar(Statement):
+
+	# Open a read only connection without a session
+	with Database.DB_Read_Connection() as Connection:
+
+		# Return First Column Of First Row
+		return Connection.execute(Statement).scalar()
+
+# Stream Rows
+def Stream_Rows(Statement, Chunk_Size):
+
+	# Open a read only connection without a session
+	with Database.DB_Read_Connection() as Connection:
+
+		# Fetch Through A Server Side Cursor One Chunk At A Time
+		for Rows in Connection.execution_options(stream_results=True, yield_per=Chunk_Size).execute(Statement).partitions():
+			yield Rows
@@ -0,0 +1,91 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+from sqlalchemy import select, func, cast, Text, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+from Setup import Database, Models
+
+# Ensure Tables
+def Ensure_Tables(*Tables):
+
+	# Create Summary Tables On First Refresh
+	Database.Base.metadata.create_all(Database.DB_Engine, tables=[Table.__table__ for Table in (Models.Watermark,) + Tables])
+
+# Lock Watermark
+def Lock_Watermark(Connection, Name):
+
+	# Make Sure The Watermark Row Exists
+	Connection.execute(insert(Models.Watermark).values(Watermark_Name=Name).on_conflict_do_nothing())
+
+	# Lock It So Concurrent Refresh Jobs Run One At A Time
+	return Connection.execute(select(Models.Watermark.Last_ID).where(Models.Watermark.Watermark_Name == Name).with_for_update()).scalar()
+
+# Set Watermark
+def Set_Watermark(Connection, Name, Last_ID):
+
+	# Store New High Water Mark
+	Connection.execute(Models.Watermark.__table__.update().where(Models.Watermark.Watermark_Name == Name).values(Last_ID=Last_ID, Update_Time=func.now()))
+
+# Define How Long To Wait For Writers Still Holding IDs Below The Newest One
+Settle_Timeout = 30
+Settle_Interval = 0.05
+
+# Get Transaction ID Expression
+def Snapshot_XID(Function):
+
+	# Compare Transaction IDs As Plain Integers
+	return cast(cast(Function(func.pg_current_snapshot()), Text), BigInteger)
+
+# Get Safe ID
+def Get_Safe_ID(Source_ID):
+
+	# Use A Read Only Connection, So This Session Never Holds Back The Snapshot It Waits On
+	with Database.DB_Primary_Read_Engine.connect() as Connection:
+
+		# Read The Newest Committed ID And The Transactions Still Running From One Snapshot
+		Newest_ID, Running_Below = Connection.execute(select(func.coalesce(func.max(Source_ID), 0), Snapshot_XID(func.pg_snapshot_xmax))).one()
+
+		# Wait Until Those Have Finished, Their Lower IDs Are Committed Or Gone By Then
+		Deadline = time.monotonic() + Settle_Timeout
+		while Connection.execute(select(Snapshot_XID(func.pg_snapshot_xmin) < Running_Below)).scalar():
+			if time.monotonic() > Deadline:
+				return None
+			time.sleep(Settle_Interval)
+
+	# Return ID Every Earlier Row Is Visible Below
+	return Newest_ID
+
+# Run Batches
+def Run_Batches(Name, Source_ID, Apply, Batch_Size):
+
+	# Define Processed Row Count
+	Processed = 0
+
+	# Stop Below Rows Whose Transactions Have Not Committed Yet, The Next Run Picks Them Up
+	Safe_ID = Get_Safe_ID(Source_ID)
+	if Safe_ID is None:
+		return Processed
+
+	# Refresh Until Caught Up
+	while True:
+
+		# Process One Batch Per Transaction
+		with Database.DB_Engine.begin() as Connection:
+
+			# Get Batch Bounds
+			Low = Lock_Watermark(Connection, Name)
+			High = min(Low + Batch_Size, Safe_ID)
+
+			# Stop When Caught Up
+			if High <= Low:
+				return Processed
+
+			# Apply Batch And Advance Watermark
+			Apply(Connection, Low, High)
+			Set_Watermark(Connection, Name, High)
+
+			# Count Source Rows In The Batch, IDs Have Gaps
+			Processed += Connection.execute(select(func.count()).where(Source_ID > Low, Source_ID <= High)).scalar()
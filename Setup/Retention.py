@@ -0,0 +1,187 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import io
+import os
+import csv
+import glob
+import gzip
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, delete, text
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Database, Models, Audit
+from Setup.Config import APP_Settings
+
+# Define Retention Tables (Model, Time Column, Retention Days)
+Retention_Tables = {
+	'Log': (Models.Log, Models.Log.Create_Time, APP_Settings.RETENTION_LOG_DAYS),
+	'Unknown_Data': (Models.Unknown_Data, Models.Unknown_Data.Stream_Time, APP_Settings.RETENTION_UNKNOWN_DATA_DAYS),
+	'Measurement': (Models.Measurement, Models.Measurement.Create_Time, APP_Settings.RETENTION_MEASUREMENT_DAYS),
+}
+
+# Define Suffix Of Archives Whose Batch Has Not Been Confirmed Committed
+Pending_Suffix = '.tmp'
+
+# Define Time Indexes The Delete Walks, Log Is Already Covered By Its Feed Index
+Time_Indexes = {
+	'Unknown_Data': 'idx_unknown_data_stream_time',
+	'Measurement': 'idx_measurement_create_time',
+}
+
+# Ensure Time Indexes
+def Ensure_Time_Indexes():
+
+	# Try to build the indexes without blocking ingest
+	try:
+		with Database.DB_Engine.connect().execution_options(isolation_level='AUTOCOMMIT') as Connection:
+			for Name, Index_Name in Time_Indexes.items():
+
+				# Partitioned Tables Carry Model Indexes From Conversion And Prune By Partition Bounds
+				Model, Time_Column = Retention_Tables[Name][:2]
+				if Connection.execute(text('SELECT relkind FROM pg_class WHERE oid = to_regclass(:Name)'), {'Name': f'"{Model.__tablename__}"'}).scalar() != 'r':
+					continue
+				Connection.exec_driver_sql(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{Index_Name}" ON "{Model.__tablename__}" ("{Time_Column.name}")')
+
+	# Pruning Still Works Without The Indexes, Only Slower
+	except SQLAlchemyError as e:
+		return str(e.orig if hasattr(e, 'orig') else e).splitlines()[0]
+
+# Estimate Backlog
+def Estimate_Backlog(Model, Time_Column, Cutoff):
+
+	# Ask The Planner How Many Rows Are Expired, Which Reads Statistics Instead Of The Rows
+	Key = Model.__mapper__.primary_key[0]
+	with Database.DB_Engine.connect() as Connection:
+		return int(Audit.Explain_Query(Connection, select(Key).where(Time_Column < Cutoff))['Plan Rows'])
+
+# Delete Batch
+def Delete_Batch(Connection, Model, Time_Column, Cutoff, Batch_Size):
+
+	# Pick The Oldest Expired Keys Through The Time Index, Skipping Rows Ingest Is Holding
+	Key = Model.__mapper__.primary_key[0]
+	Keys = select(Key).where(Time_Column < Cutoff).order_by(Time_Column).limit(Batch_Size).with_for_update(skip_locked=True)
+
+	# Delete Them And Return The Removed Rows In Key Order
+	Rows = Connection.execute(delete(Model).where(Key.in_(Keys.scalar_subquery())).returning(*Model.__table__.columns)).all()
+	return sorted(Rows, key=lambda Row: getattr(Row, Key.name))
+
+# Sync Folder
+def Sync_Folder(Path):
+
+	# Make Renames Inside The Folder Survive A Crash
+	Descriptor = os.open(Path, os.O_RDONLY)
+	try:
+		os.fsync(Descriptor)
+	finally:
+		os.close(Descriptor)
+
+# Write Archive
+def Write_Archive(Path, Columns, Rows):
+
+	# Build The Compressed File In Memory, One Batch Is Already Held There
+	Buffer = io.StringIO(newline='')
+	Writer = csv.writer(Buffer)
+	Writer.writerow([Column.name for Column in Columns])
+	Writer.writerows(Rows)
+
+	# Write It Under A Pending Name And Force It To Disk
+	Pending_Path = Path + Pending_Suffix
+	with open(Pending_Path, 'wb') as File:
+		File.write(gzip.compress(Buffer.getvalue().encode('utf-8')))
+		File.flush()
+		os.fsync(File.fileno())
+
+	# Return Pending Path
+	return Pending_Path
+
+# Publish Archive
+def Publish_Archive(Pending_Path):
+
+	# Give The File Its Final Name Once Its Delete Has Committed
+	os.replace(Pending_Path, Pending_Path[:-len(Pending_Suffix)])
+	Sync_Folder(os.path.dirname(Pending_Path))
+
+# Recover Archives
+def Recover_Archives(Name, Model):
+
+	# Find Files Left Behind By A Run That Stopped Between Writing And Publishing
+	Key = Model.__mapper__.primary_key[0]
+	for Pending_Path in sorted(glob.glob(os.path.join(APP_Settings.RETENTION_ARCHIVE_PATH, f'{Name}_*.csv.gz{Pending_Suffix}'))):
+
+		# Read The First Archived Key
+		with gzip.open(Pending_Path, 'rt', newline='') as File:
+			Reader = csv.reader(File)
+			Header = next(Reader, [])
+			First_Row = next(Reader, None)
+
+		# A Batch Deletes All Its Rows Or None, So One Surviving Row Means It Rolled Back
+		Is_Committed = False
+		if First_Row is not None:
+			First_Key = Key.type.python_type(First_Row[Header.index(Key.name)])
+			with Database.DB_Engine.connect() as Connection:
+				Is_Committed = Connection.execute(select(Key).where(Key == First_Key)).first() is None
+
+		# Publish Committed Batches, Drop Rolled Back Ones As Their Rows Are Still In The Table
+		if Is_Committed:
+			Publish_Archive(Pending_Path)
+		else:
+			os.remove(Pending_Path)
+
+# Prune Table
+def Prune_Table(Name, Days, Batch_Size=APP_Settings.RETENTION_BATCH_SIZE, Pause=APP_Settings.RETENTION_PAUSE):
+
+	# Get Table Definition
+	Model, Time_Column = Retention_Tables[Name][:2]
+	Cutoff = datetime.now(timezone.utc) - timedelta(days=Days)
+
+	# Settle What An Interrupted Run Left Behind
+	os.makedirs(APP_Settings.RETENTION_ARCHIVE_PATH, exist_ok=True)
+	Recover_Archives(Name, Model)
+
+	# Estimate The Backlog Once, Progress Counts Down From It
+	Backlog = Estimate_Backlog(Model, Time_Column, Cutoff)
+
+	# Name This Run's Archives
+	Run_Path = os.path.join(APP_Settings.RETENTION_ARCHIVE_PATH, f'{Name}_{datetime.now(timezone.utc):%Y%m%d_%H%M%S}')
+
+	# Prune Until A Batch Finds Nothing Expired
+	Batch_Number, Total = 0, 0
+	while True:
+
+		# Archive Then Delete One Batch Per Transaction
+		Start = time.monotonic()
+		Pending_Path = None
+		with Database.DB_Engine.begin() as Connection:
+
+			# Delete Batch
+			Rows = Delete_Batch(Connection, Model, Time_Column, Cutoff, Batch_Size)
+
+			# Write Rows To Disk Before Committing So A Failed Write Keeps Them
+			if Rows:
+				Batch_Number += 1
+				Pending_Path = Write_Archive(f'{Run_Path}_{Batch_Number:05d}.csv.gz', Model.__table__.columns, Rows)
+
+		# Stop When Caught Up
+		if not Rows:
+			return
+
+		# Publish The Archive Now The Delete Has Committed
+		Publish_Archive(Pending_Path)
+
+		# Report Progress
+		Total += len(Rows)
+		yield Name, len(Rows), len(Rows) / max(time.monotonic() - Start, 1e-6), Total, max(Backlog - Total, 0)
+
+		# Let Ingest, Vacuum And WAL Shipping Catch Up
+		time.sleep(Pause)
+
+# Run Retention
+def Run_Retention():
+
+	# Prune Every Table With A Retention Window
+	for Name, (Model, Time_Column, Days) in Retention_Tables.items():
+		if Days > 0:
+			yield from Prune_Table(Name, Days)
@@ -0,0 +1,217 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from sqlalchemy import select, delete, func, literal, union_all, tuple_
+from sqlalchemy.dialects.postgresql import insert
+from Setup import Database, Models, Refresh, Audit, Query
+
+# Define Page Size
+Page_Size = 50
+
+# Define Project Key For Devices Without A Project
+No_Project = 0
+
+# Get Current Device Versions
+def Get_Current():
+
+	# Read Rollout Attributes Straight From Device
+	return select(
+		Models.Device.Device_ID,
+		Models.Device.Version_ID,
+		func.coalesce(Models.Device.Project_ID, No_Project).label('Project_ID'),
+		Models.Device.Model_ID,
+	).subquery('Current')
+
+# Get Changed Devices
+def Get_Changed():
+
+	# Pair Every Device With Its Last Counted Attributes, Keeping Only Differences
+	Current, Counted = Get_Current(), Models.Firmware_Rollout_Device.__table__
+	return select(
+		Current.c.Device_ID.label('New_Device_ID'),
+		Current.c.Version_ID.label('New_Version_ID'),
+		Current.c.Project_ID.label('New_Project_ID'),
+		Current.c.Model_ID.label('New_Model_ID'),
+		Counted.c.Device_ID.label('Old_Device_ID'),
+		Counted.c.Version_ID.label('Old_Version_ID'),
+		Counted.c.Project_ID.label('Old_Project_ID'),
+		Counted.c.Model_ID.label('Old_Model_ID'),
+	).select_from(Current.join(Counted, Current.c.Device_ID == Counted.c.Device_ID, full=True)).where(
+		tuple_(Current.c.Version_ID, Current.c.Project_ID, Current.c.Model_ID).is_distinct_from(tuple_(Counted.c.Version_ID, Counted.c.Project_ID, Counted.c.Model_ID)),
+	).subquery('Changed')
+
+# Apply Counter Deltas
+def Apply_Deltas(Connection):
+
+	# Count Devices Into Their New Cell And Out Of Their Old One
+	Changed = Get_Changed()
+	Deltas = union_all(
+		select(Changed.c.New_Version_ID.label('Version_ID'), Changed.c.New_Project_ID.label('Project_ID'), Changed.c.New_Model_ID.label('Model_ID'), literal(1).label('Delta')).where(Changed.c.New_Device_ID.is_not(None)),
+		select(Changed.c.Old_Version_ID, Changed.c.Old_Project_ID, Changed.c.Old_Model_ID, literal(-1)).where(Changed.c.Old_Device_ID.is_not(None)),
+	).subquery('Deltas')
+
+	# Net The Deltas Per Cell
+	Totals = select(Deltas.c.Version_ID, Deltas.c.Project_ID, Deltas.c.Model_ID, func.sum(Deltas.c.Delta)).group_by(Deltas.c.Version_ID, Deltas.c.Project_ID, Deltas.c.Model_ID).having(func.sum(Deltas.c.Delta) != 0)
+
+	# Add Them To The Counters
+	Statement = insert(Models.Firmware_Rollout).from_select(['Version_ID', 'Project_ID', 'Model_ID', 'Device_Count'], Totals)
+	Result = Connection.execute(Statement.on_conflict_do_update(
+		index_elements=['Version_ID', 'Project_ID', 'Model_ID'],
+		set_={'Device_Count': Models.Firmware_Rollout.Device_Count + Statement.excluded.Device_Count, 'Update_Time': func.now()},
+	))
+
+	# Drop Cells No Device Is Left In
+	Connection.execute(delete(Models.Firmware_Rollout).where(Models.Firmware_Rollout.Device_Count <= 0))
+
+	# Return Changed Cell Count
+	return Result.rowcount
+
+# Apply Device Snapshot
+def Apply_Snapshot(Connection):
+
+	# Remember What Each Changed Device Was Counted As
+	Current = Get_Current()
+	Statement = insert(Models.Firmware_Rollout_Device).from_select(['Device_ID', 'Version_ID', 'Project_ID', 'Model_ID'], select(Current))
+	Connection.execute(Statement.on_conflict_do_update(
+		index_elements=['Device_ID'],
+		set_={Column: Statement.excluded[Column] for Column in ('Version_ID', 'Project_ID', 'Model_ID')},
+		where=tuple_(*[Models.Firmware_Rollout_Device.__table__.c[Column] for Column in ('Version_ID', 'Project_ID', 'Model_ID')]).is_distinct_from(tuple_(*[Statement.excluded[Column] for Column in ('Version_ID', 'Project_ID', 'Model_ID')])),
+	))
+
+	# Forget Deleted Devices
+	Connection.execute(delete(Models.Firmware_Rollout_Device).where(~select(Models.Device.Device_ID).where(Models.Device.Device_ID == Models.Firmware_Rollout_Device.Device_ID).exists()))
+
+# Refresh Rollout Counters
+def Refresh_Rollout():
+
+	# Create Counter Tables On First Refresh
+	Refresh.Ensure_Tables(Models.Firmware_Rollout, Models.Firmware_Rollout_Device)
+
+	# Queue Behind Any Running Refresh Before The Snapshot Is Taken, So A Waiting Refresh Never Reads Rows The Previous One Has Since Moved
+	with Database.DB_Engine.connect().execution_options(isolation_level='AUTOCOMMIT') as Lock_Connection:
+		Lock_Connection.execute(select(func.pg_advisory_lock(func.hashtext('Firmware_Rollout'))))
+
+		# Try to refresh under the lock
+		try:
+
+			# See One Consistent Device Table For The Whole Refresh
+			with Database.DB_Engine.connect().execution_options(isolation_level='REPEATABLE READ') as Connection:
+				with Connection.begin():
+
+					# Read The Watermark, Uncontended Now
+					Last_ID = Refresh.Lock_Watermark(Connection, 'Firmware_Rollout')
+
+					# Move Only Devices Whose Version, Project Or Model Changed
+					Changed_Cells = Apply_Deltas(Connection)
+					Apply_Snapshot(Connection)
+
+					# Record Refresh Time
+					Refresh.Set_Watermark(Connection, 'Firmware_Rollout', Last_ID)
+
+		# Release The Lock Before The Connection Goes Back To The Pool
+		finally:
+			Lock_Connection.execute(select(func.pg_advisory_unlock(func.hashtext('Firmware_Rollout'))))
+
+	# Return Changed Cell Count
+	return Changed_Cells
+
+# Build Target Query
+def Build_Target_Query():
+
+	# Newest Released Firmware Version
+	return select(func.max(Models.Firmware.Version_ID))
+
+# Build Rollout Query
+def Build_Rollout_Query():
+
+	# Read The Counters With Their Labels
+	return select(
+		Models.Firmware_Rollout.Project_ID,
+		Models.Project.Project_Name,
+		Models.Firmware_Rollout.Model_ID,
+		Models.Model.Model_Name,
+		Models.Firmware_Rollout.Version_ID,
+		Models.Version.Firmware,
+		Models.Firmware_Rollout.Device_Count,
+	).join(Models.Version, Models.Version.Version_ID == Models.Firmware_Rollout.Version_ID).join(Models.Model, Models.Model.Model_ID == Models.Firmware_Rollout.Model_ID).outerjoin(Models.Project, Models.Project.Project_ID == Models.Firmware_Rollout.Project_ID).order_by(
+		Models.Project.Project_Name,
+		Models.Model.Model_Name,
+		Models.Firmware_Rollout.Version_ID.desc(),
+	)
+
+# Build Device Query
+def Build_Device_Query(Version_ID, Project_ID, Model_ID, After_ID=None):
+
+	# Walk The Rollout Index For One Cell
+	Statement = select(
+		Models.Device.Device_ID,
+		Models.Device.Device_Name,
+		Models.Device.Last_Connection_IP,
+		Query.Formatted(Models.Device.Last_Connection_Time),
+	).where(
+		Models.Device.Version_ID == Version_ID,
+		Models.Device.Project_ID.is_(None) if Project_ID == No_Project else Models.Device.Project_ID == Project_ID,
+		Models.Device.Model_ID == Model_ID,
+	).order_by(Models.Device.Device_ID)
+
+	# Seek Past The Last Seen Device
+	if After_ID is not None:
+		Statement = Statement.where(Models.Device.Device_ID > After_ID)
+
+	# Fetch One Extra Row To Detect The Next Page
+	return Statement.limit(Page_Size + 1)
+
+# Parse Rollout Arguments
+def Parse_Rollout_Arguments(Args):
+
+	# Try to parse the integer arguments
+	try:
+		Arguments = {Key.title() + '_ID': int(Args[Key]) if Args.get(Key) else None for Key in ('target', 'version', 'project', 'model')}
+	except ValueError:
+		raise ValueError('Invalid argument')
+
+	# Drill Down Needs The Whole Cell
+	Cell = [Arguments[Key] for Key in ('Version_ID', 'Project_ID', 'Model_ID')]
+	if any(Value is not None for Value in Cell) and any(Value is None for Value in Cell):
+		raise ValueError('Drill down needs version, project and model')
+
+	# Return Arguments With The Device Cursor
+	Arguments['After_ID'] = Args.get('after') or None
+	return Arguments
+
+# Format Rollout
+def Format_Rollout(Rows, Target_ID):
+
+	# Group Cells By Project And Model
+	Groups = {}
+	for Row in Rows:
+		Group = Groups.setdefault((Row.Project_ID, Row.Model_ID), {'Project_ID': Row.Project_ID, 'Project_Name': Row.Project_Name or 'No Project', 'Model_ID': Row.Model_ID, 'Model_Name': Row.Model_Name, 'Total': 0, 'Versions': []})
+		Group['Total'] += Row.Device_Count
+		Group['Versions'].append({'Version_ID': Row.Version_ID, 'Firmware': Row.Firmware or str(Row.Version_ID), 'Device_Count': Row.Device_Count})
+
+	# Compare Each Group With The Released Target Or Its Own Newest Version
+	for Group in Groups.values():
+		Group['Target_ID'] = Target_ID if Target_ID is not None else Group['Versions'][0]['Version_ID']
+		Group['Current'] = sum(Version['Device_Count'] for Version in Group['Versions'] if Version['Version_ID'] == Group['Target_ID'])
+		Group['Lagging'] = Group['Total'] - Group['Current']
+		for Version in Group['Versions']:
+			Version['Share'] = 100 * Version['Device_Count'] / Group['Total']
+			Version['Is_Lagging'] = Version['Version_ID'] != Group['Target_ID']
+
+	# Return Groups
+	return list(Groups.values())
+
+# Format Devices
+def Format_Devices(Rows):
+
+	# Return Page Rows And Next Cursor
+	Devices = [Row._asdict() for Row in Rows[:Page_Size]]
+	return Devices, Devices[-1]['Device_ID'] if len(Rows) > Page_Size else None
+
+# Register Audited Queries
+Audit.Register_Query('Firmware Rollout', lambda: Build_Rollout_Query())
+Audit.Register_Query('Released Firmware', lambda: Build_Target_Query())
+Audit.Register_Query('Rollout Devices', lambda: Build_Device_Query(1, 1, 1))
+Audit.Register_Query('Rollout Devices Without Project', lambda: Build_Device_Query(1, No_Project, 1, 'DEV'))
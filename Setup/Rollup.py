@@ -0,0 +1,138 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from sqlalchemy import select, func, literal, union_all, cast, BigInteger
+from sqlalchemy.dialects.postgresql import insert
+from Setup import Models, Refresh, Audit, Partition
+
+# Define Rollup Widths (Seconds, Truncation Unit), Finest First
+Rollup_Widths = (
+	(60, 'minute'),
+	(3600, 'hour'),
+	(86400, 'day'),
+)
+
+# Apply Measurement Batch
+def Apply_Measurements(Connection, Low, High):
+
+	# Find The Batch's Time Span Once, So Each Width Reads Only The Partitions Holding It
+	Oldest, Newest = Partition.Get_Batch_Times(Connection, Low, High)
+	if Oldest is None:
+		return
+
+	# Roll The Batch Into Every Width
+	for Width, Unit in Rollup_Widths:
+
+		# Aggregate New Readings Per Device, Variable And Bucket
+		Bucket_Time = func.date_trunc(Unit, Models.Stream.Stream_Time, 'UTC')
+		Batch = select(
+			literal(Width),
+			Models.Stream.Device_ID,
+			Models.Measurement.Variable_ID,
+			Bucket_Time,
+			func.min(Models.Measurement.Measurement_Value),
+			func.max(Models.Measurement.Measurement_Value),
+			func.sum(Models.Measurement.Measurement_Value),
+			func.count(Models.Measurement.Measurement_Value),
+		).join(Models.Stream).where(
+			Models.Measurement.Measurement_ID > Low,
+			Models.Measurement.Measurement_ID <= High,
+			Models.Measurement.Create_Time >= Oldest,
+			Models.Measurement.Create_Time <= Newest,
+			Models.Measurement.Measurement_Value.is_not(None),
+		).group_by(Models.Stream.Device_ID, Models.Measurement.Variable_ID, Bucket_Time)
+
+		# Merge Into Existing Buckets, Late Readings Included
+		Statement = insert(Models.Measurement_Rollup).from_select(['Bucket_Width', 'Device_ID', 'Variable_ID', 'Bucket_Time', 'Min_Value', 'Max_Value', 'Sum_Value', 'Value_Count'], Batch)
+		Statement = Statement.on_conflict_do_update(
+			index_elements=['Bucket_Width', 'Device_ID', 'Variable_ID', 'Bucket_Time'],
+			set_={
+				'Min_Value': func.least(Models.Measurement_Rollup.Min_Value, Statement.excluded.Min_Value),
+				'Max_Value': func.greatest(Models.Measurement_Rollup.Max_Value, Statement.excluded.Max_Value),
+				'Sum_Value': Models.Measurement_Rollup.Sum_Value + Statement.excluded.Sum_Value,
+				'Value_Count': Models.Measurement_Rollup.Value_Count + Statement.excluded.Value_Count,
+			},
+		)
+
+		# Run Upsert
+		Connection.execute(Statement)
+
+# Refresh Rollups
+def Refresh_Rollups(Batch_Size=100000):
+
+	# Create Rollup Table On First Refresh
+	Refresh.Ensure_Tables(Models.Measurement_Rollup)
+
+	# Fold New Measurements Into Every Width
+	return Refresh.Run_Batches('Measurement_Rollup', Models.Measurement.Measurement_ID, Apply_Measurements, Batch_Size)
+
+# Pick Rollup Width
+def Pick_Width(Bucket_Seconds):
+
+	# Use The Coarsest Rollup That Still Fits In One Requested Bucket
+	Fitting = [Width for Width, Unit in Rollup_Widths if Width <= Bucket_Seconds]
+
+	# Return Width Or None For Raw Rows
+	return Fitting[-1] if Fitting else None
+
+# Build Watermark Query
+def Build_Watermark_Query():
+
+	# Last Measurement Folded Into The Rollups, No Row Before The First Refresh
+	return select(Models.Watermark.Last_ID).where(Models.Watermark.Watermark_Name == 'Measurement_Rollup')
+
+# Build Rollup Rows
+def Build_Rollup_Rows(Device_ID, Variable_ID, Start_Time, End_Time, Buckets, Width):
+
+	# Bucket Rollup Rows By Equal Time Slices
+	Epoch = func.extract('epoch', Models.Measurement_Rollup.Bucket_Time)
+	Bucket_Seconds = (End_Time - Start_Time).total_seconds() / Buckets
+	Bucket = func.floor((Epoch - Start_Time.timestamp()) / Bucket_Seconds).label('Bucket')
+
+	# Carry Sums And Counts, So Rollup Rows Combine With Raw Rows
+	Statement = select(
+		Bucket,
+		((Epoch + Width / 2) * Models.Measurement_Rollup.Value_Count).label('Time_Sum'),
+		Models.Measurement_Rollup.Min_Value.label('Min'),
+		Models.Measurement_Rollup.Max_Value.label('Max'),
+		Models.Measurement_Rollup.Sum_Value.label('Sum'),
+		Models.Measurement_Rollup.Value_Count.label('Count'),
+	).where(
+		Models.Measurement_Rollup.Bucket_Width == Width,
+		Models.Measurement_Rollup.Variable_ID == Variable_ID,
+		Models.Measurement_Rollup.Bucket_Time >= Start_Time,
+		Models.Measurement_Rollup.Bucket_Time < End_Time,
+	)
+
+	# Narrow To One Device
+	if Device_ID is not None:
+		Statement = Statement.where(Models.Measurement_Rollup.Device_ID == Device_ID)
+
+	# Return Rows
+	return Statement
+
+# Combine Buckets
+def Combine_Buckets(*Parts):
+
+	# Merge Partial Buckets With The Same Columns As The Raw Query
+	Rows = union_all(*Parts).subquery('Rows')
+	return select(
+		Rows.c.Bucket,
+		(func.sum(Rows.c.Time_Sum) / func.sum(Rows.c.Count)).label('Time'),
+		func.min(Rows.c.Min).label('Min'),
+		func.max(Rows.c.Max).label('Max'),
+		(func.sum(Rows.c.Sum) / func.sum(Rows.c.Count)).label('Avg'),
+		cast(func.sum(Rows.c.Count), BigInteger).label('Count'),
+	).group_by(Rows.c.Bucket).order_by(Rows.c.Bucket)
+
+# Build Rollup Bucket Query
+def Build_Rollup_Bucket_Query(Device_ID, Variable_ID, Start_Time, End_Time, Buckets, Width):
+
+	# Return Combined Rollup Rows
+	return Combine_Buckets(Build_Rollup_Rows(Device_ID, Variable_ID, Start_Time, End_Time, Buckets, Width))
+
+# Register Audited Queries
+Audit.Register_Query('Device Rollup Series', lambda: Build_Rollup_Bucket_Query('', '', *Audit.Sample_Range(), 1000, 3600))
+Audit.Register_Query('Fleet Rollup Series', lambda: Build_Rollup_Bucket_Query(None, '', *Audit.Sample_Range(), 1000, 3600))
@@ -0,0 +1,296 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import time
+import operator
+import threading
+from datetime import timedelta
+from sqlalchemy import select, update, values, column, desc, func, text, any_, Integer, String, TIMESTAMP
+from sqlalchemy.dialects.postgresql import insert, array
+from Setup import Database, Models, Refresh, Audit, Query, Partition
+from Setup.Config import APP_Settings
+
+# Define Rule Operators
+Operators = {
+	'>': operator.gt, 'gt': operator.gt,
+	'>=': operator.ge, 'ge': operator.ge,
+	'<': operator.lt, 'lt': operator.lt,
+	'<=': operator.le, 'le': operator.le,
+	'=': operator.eq, '==': operator.eq, 'eq': operator.eq,
+	'!=': operator.ne, '<>': operator.ne, 'ne': operator.ne,
+}
+
+# Define Page Size
+Page_Size = 50
+
+# Define Trigger Columns
+Trigger_Columns = (
+	Models.Rule_Trigger.Trigger_ID,
+	Models.Rule_Trigger.Rule_ID,
+	Models.Rules.Rule_Name,
+	Models.Rule_Trigger.Device_ID,
+	Models.Rule_Trigger.Variable_ID,
+	Models.Rule_Trigger.Measurement_Value,
+	Query.Formatted(Models.Rule_Trigger.Trigger_Time),
+	Query.Formatted(Models.Rule_Trigger.Clear_Time),
+)
+
+# Define Rule Index
+class Rule_Index:
+
+	# Initialize Index
+	def __init__(self, TTL):
+
+		# Set Index State
+		self.TTL = TTL
+		self.Chains = {}
+		self.Links = {}
+		self.Devices = frozenset()
+		self.Load_Time = float('-inf')
+		self.Lock = threading.Lock()
+
+	# Get Chain Statement
+	def Get_Statement(self):
+
+		# Query Links Of Active Rules Only, In Chain Order
+		return select(
+			Models.Rule_Chain.Device_ID,
+			Models.Rule_Chain.Variable_ID,
+			Models.Rule_Chain.Rule_ID,
+			Models.Rule_Chain.Rule_Chain_ID,
+			Models.Rule_Chain.Rule_Operator,
+			Models.Rule_Chain.Rule_Value,
+		).join(Models.Rules).where(Models.Rules.Rule_Status.is_(True)).order_by(Models.Rule_Chain.Rule_Chain_ID)
+
+	# Check Index Freshness
+	def Needs_Load(self):
+
+		# Missing Or Expired
+		return time.monotonic() - self.Load_Time > self.TTL
+
+	# Store Compiled Chains
+	def Store(self, Rows):
+
+		# Compile Each Rule's Links Per Device, Unknown Operators Never Match
+		Chains, Links = {}, {}
+		for Device_ID, Variable_ID, Rule_ID, Rule_Chain_ID, Rule_Operator, Rule_Value in Rows:
+			Compare = Operators.get(Rule_Operator.strip().lower())
+			Links.setdefault((Rule_ID, Device_ID), []).append((Rule_Chain_ID, Variable_ID, Compare, Rule_Value))
+
+			# Index The Rules Each Device And Variable Takes Part In
+			Rule_IDs = Chains.setdefault((Device_ID, Variable_ID), [])
+			if Rule_ID not in Rule_IDs:
+				Rule_IDs.append(Rule_ID)
+
+		# Swap In The New Index
+		with self.Lock:
+			self.Chains, self.Links = Chains, Links
+			self.Devices = frozenset(Device_ID for Device_ID, Variable_ID in Chains)
+			self.Load_Time = time.monotonic()
+
+	# Load Rule Index
+	def Load(self, Connection):
+
+		# Query And Compile Active Chains
+		self.Store(Connection.execute(self.Get_Statement()).all())
+
+	# Evaluate Measurements
+	def Evaluate(self, Rows, Open):
+
+		# Collect Each Stream's Readings, Only Variables Registered For Their Device Are Kept
+		Streams = {}
+		for Stream_ID, Device_ID, Variable_ID, Value, Stream_Time in Rows:
+			if (Device_ID, Variable_ID) in self.Chains and Value is not None:
+				Streams.setdefault(Stream_ID, (Device_ID, Stream_Time, {}))[2].setdefault(Variable_ID, Value)
+
+		# Define Opened Triggers And Cleared Open Triggers
+		Triggers, Clears = [], {}
+
+		# Walk Streams In Time Order, A Rule Matches When Every One Of Its Links On The Device Holds
+		for Stream_ID, (Device_ID, Stream_Time, Readings) in sorted(Streams.items(), key=lambda Item: (Item[1][1], Item[0])):
+
+			# Judge Only The Rules The Stream's Variables Take Part In
+			Rule_IDs = sorted({Rule_ID for Variable_ID in Readings for Rule_ID in self.Chains[(Device_ID, Variable_ID)]})
+			for Rule_ID in Rule_IDs:
+				Links = self.Links[(Rule_ID, Device_ID)]
+
+				# Judge Only Streams Carrying Every Linked Variable
+				if any(Variable_ID not in Readings for Rule_Chain_ID, Variable_ID, Compare, Rule_Value in Links):
+					continue
+				Is_Match = all(Compare is not None and Compare(Readings[Variable_ID], Rule_Value) for Rule_Chain_ID, Variable_ID, Compare, Rule_Value in Links)
+
+				# Open A Trigger Unless One Is Already Open For The Rule And Device
+				Key = (Rule_ID, Device_ID)
+				if Is_Match and Key not in Open:
+					Open[Key] = {
+						'Rule_ID': Rule_ID,
+						'Rule_Chain_ID': Links[0][0],
+						'Device_ID': Device_ID,
+						'Variable_ID': Links[0][1],
+						'Stream_ID': Stream_ID,
+						'Measurement_Value': Readings[Links[0][1]],
+						'Trigger_Time': Stream_Time,
+						'Clear_Time': None,
+					}
+					Triggers.append(Open[Key])
+
+				# Clear The Open Trigger Once The Rule Stops Matching
+				elif not Is_Match and Key in Open:
+					Trigger = Open.pop(Key)
+					if Trigger is None:
+						Clears[Key] = Stream_Time
+					else:
+						Trigger['Clear_Time'] = Stream_Time
+
+		# Return Triggers And Clears
+		return Triggers, Clears
+
+# Ensure Trigger Table
+def Ensure_Trigger_Table():
+
+	# Create Trigger Table On First Run
+	Refresh.Ensure_Tables(Models.Rule_Trigger)
+
+	# Add Clear Times To Tables Created Before Triggers Could Stay Open
+	with Database.DB_Engine.begin() as Connection:
+		if Connection.execute(text('SELECT 1 FROM information_schema.columns WHERE table_schema = current_schema() AND table_name = \'Rule_Trigger\' AND column_name = \'Clear_Time\'')).first() is None:
+			Connection.execute(text('ALTER TABLE "Rule_Trigger" ADD COLUMN "Clear_Time" TIMESTAMP WITH TIME ZONE'))
+
+			# Leave Only The Newest Trigger Of Each Rule And Device Open
+			Newest = select(func.max(Models.Rule_Trigger.Trigger_ID)).group_by(Models.Rule_Trigger.Rule_ID, Models.Rule_Trigger.Device_ID)
+			Connection.execute(update(Models.Rule_Trigger).where(Models.Rule_Trigger.Trigger_ID.not_in(Newest)).values(Clear_Time=Models.Rule_Trigger.Trigger_Time))
+
+		# One Open Trigger Per Rule And Device
+		for Index in Models.Rule_Trigger.__table__.indexes:
+			Index.create(Connection, checkfirst=True)
+
+# Get Open Triggers
+def Get_Open_Triggers(Connection, Rows):
+
+	# Read Open Triggers Of The Devices In The Batch
+	Devices = list({Row[1] for Row in Rows if Row[1] in Rules.Devices})
+	if not Devices:
+		return {}
+	return {Key: None for Key in Connection.execute(select(Models.Rule_Trigger.Rule_ID, Models.Rule_Trigger.Device_ID).where(
+		Models.Rule_Trigger.Clear_Time.is_(None),
+		Models.Rule_Trigger.Device_ID == any_(array(Devices)),
+	)).all()}
+
+# Record Triggers
+def Record_Triggers(Connection, Triggers, Clears):
+
+	# Close Triggers That Stopped Matching
+	if Clears:
+		Batch = values(column('Rule_ID', Integer), column('Device_ID', String), column('Clear_Time', TIMESTAMP(timezone=True)), name='Batch').data([(*Key, Clear_Time) for Key, Clear_Time in Clears.items()])
+		Connection.execute(update(Models.Rule_Trigger).where(
+			Models.Rule_Trigger.Rule_ID == Batch.c.Rule_ID,
+			Models.Rule_Trigger.Device_ID == Batch.c.Device_ID,
+			Models.Rule_Trigger.Clear_Time.is_(None),
+		).values(Clear_Time=Batch.c.Clear_Time))
+
+	# Nothing To Record
+	if not Triggers:
+		return
+
+	# Insert Trigger History In One Statement, A Trigger Still Open In The Table Wins
+	Statement = insert(Models.Rule_Trigger).on_conflict_do_nothing(index_elements=['Rule_ID', 'Device_ID'], index_where=Models.Rule_Trigger.Clear_Time.is_(None))
+	Inserted = Connection.execute(Statement.returning(Models.Rule_Trigger.Rule_ID), Triggers).scalars().all()
+
+	# Sum Recorded Triggers Per Rule
+	Counts = {}
+	for Rule_ID in Inserted:
+		Counts[Rule_ID] = Counts.get(Rule_ID, 0) + 1
+	if not Counts:
+		return
+
+	# Bump Every Rule Counter In One Update
+	Batch = values(column('Rule_ID', Integer), column('Count', Integer), name='Batch').data(list(Counts.items()))
+	Connection.execute(update(Models.Rules).where(Models.Rules.Rule_ID == Batch.c.Rule_ID).values(Rule_Trigger_Count=Models.Rules.Rule_Trigger_Count + Batch.c.Count))
+
+# Apply Measurement Batch
+def Apply_Measurements(Connection, Low, High):
+
+	# Refresh Compiled Chains
+	if Rules.Needs_Load():
+		Rules.Load(Connection)
+
+	# Skip Reading Measurements When No Rule Is Active
+	if not Rules.Chains:
+		return
+
+	# Find The Batch's Time Span, Its Streams Started At Most The Ingest Lag Earlier, So Only Partitions Around It Are Read
+	Oldest, Newest = Partition.Get_Batch_Times(Connection, Low, High)
+	if Oldest is None:
+		return
+	Bounds = Partition.Get_Measurement_Bounds(Oldest - timedelta(seconds=APP_Settings.PARTITION_MEASUREMENT_LAG), Newest)
+
+	# Judge Each Stream Once, In The Batch Holding Its Last Measurement, So Every Linked Variable Is Seen And Streams Stay In Order
+	Touched = select(Models.Measurement.Stream_ID).where(
+		Models.Measurement.Measurement_ID > Low,
+		Models.Measurement.Measurement_ID <= High,
+		Models.Measurement.Create_Time >= Oldest,
+		Models.Measurement.Create_Time <= Newest,
+	)
+	Streams = select(Models.Measurement.Stream_ID).where(Models.Measurement.Stream_ID.in_(Touched), *Bounds).group_by(Models.Measurement.Stream_ID).having(func.max(Models.Measurement.Measurement_ID) <= High)
+
+	# Read Every Measurement Of Those Streams
+	Rows = Connection.execute(select(
+		Models.Measurement.Stream_ID,
+		Models.Stream.Device_ID,
+		Models.Measurement.Variable_ID,
+		Models.Measurement.Measurement_Value,
+		Models.Stream.Stream_Time,
+	).join(Models.Stream).where(
+		Models.Measurement.Stream_ID.in_(Streams),
+		*Bounds,
+	)).all()
+
+	# Record Opened And Cleared Triggers
+	Record_Triggers(Connection, *Rules.Evaluate(Rows, Get_Open_Triggers(Connection, Rows)))
+
+# Evaluate Rules
+def Evaluate_Rules(Batch_Size=50000):
+
+	# Create Trigger Table On First Run
+	Ensure_Trigger_Table()
+
+	# Evaluate New Measurements Past The Watermark
+	return Refresh.Run_Batches('Rule_Engine', Models.Measurement.Measurement_ID, Apply_Measurements, Batch_Size)
+
+# Build Trigger Query
+def Build_Trigger_Query(Before_ID=None):
+
+	# Newest Triggers First
+	Statement = select(*Trigger_Columns).join(Models.Rules).order_by(desc(Models.Rule_Trigger.Trigger_ID))
+
+	# Seek Past The Last Seen Trigger
+	if Before_ID is not None:
+		Statement = Statement.where(Models.Rule_Trigger.Trigger_ID < Before_ID)
+
+	# Fetch One Extra Row To Detect The Next Page
+	return Statement.limit(Page_Size + 1)
+
+# Parse Trigger Arguments
+def Parse_Trigger_Arguments(Args):
+
+	# Parse Cursor
+	try:
+		return int(Args['before']) if Args.get('before') else None
+	except ValueError:
+		raise ValueError('Invalid cursor')
+
+# Format Triggers
+def Format_Triggers(Rows):
+
+	# Return Page Rows And Next Cursor
+	Triggers = [Row._asdict() for Row in Rows[:Page_Size]]
+	return Triggers, Triggers[-1]['Trigger_ID'] if len(Rows) > Page_Size else None
+
+# Set Rule Index
+Rules = Rule_Index(APP_Settings.DIMENSION_CACHE_TTL)
+
+# Register Audited Queries
+Audit.Register_Query('Recent Rule Triggers', lambda: Build_Trigger_Query())
+Audit.Register_Query('Older Rule Triggers', lambda: Build_Trigger_Query(2**31 - 1))
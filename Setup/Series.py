@@ -0,0 +1,219 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+import numpy
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, func, literal
+from Setup import Models, Audit, Calibration, Rollup, Partition
+
+# Define Point Limits
+Default_Points = 1000
+Max_Points = 5000
+
+# Define Pre Aggregation Factor For LTTB
+LTTB_Factor = 4
+
+# Define Downsampling Methods
+Methods = ('minmax', 'lttb')
+
+# Parse Series Time
+def Parse_Series_Time(Value):
+
+	# Read Naive Timestamps As UTC
+	Time = datetime.fromisoformat(Value)
+	return Time if Time.tzinfo else Time.replace(tzinfo=timezone.utc)
+
+# Parse Series Arguments
+def Parse_Series_Arguments(Args):
+
+	# Variable Is Required
+	Variable_ID = Args.get('variable')
+	if not Variable_ID:
+		raise ValueError('Missing variable')
+
+	# Try to parse arguments
+	try:
+
+		# Parse Time Range, Defaulting To The Last Day
+		End_Time = Parse_Series_Time(Args['end']) if Args.get('end') else datetime.now(timezone.utc)
+		Start_Time = Parse_Series_Time(Args['start']) if Args.get('start') else End_Time - timedelta(days=1)
+
+		# Parse Point Count
+		Points = max(2, min(int(Args.get('points', Default_Points)), Max_Points))
+
+	# Handle Malformed Arguments
+	except ValueError:
+		raise ValueError('Invalid series range')
+
+	# Validate Range And Method
+	Method = Args.get('method', 'minmax')
+	if Start_Time >= End_Time or Method not in Methods:
+		raise ValueError('Invalid series range')
+
+	# Return Arguments
+	return {
+		'Device_ID': Args.get('device') or None,
+		'Variable_ID': Variable_ID,
+		'Start_Time': Start_Time,
+		'End_Time': End_Time,
+		'Points': Points,
+		'Method': Method,
+	}
+
+# Build Raw Rows
+def Build_Raw_Rows(Device_ID, Variable_ID, Start_Time, End_Time):
+
+	# Filter On Stream_Time Like The Rollups, Bounding The Measurement Partition Column Too
+	Statement = select().select_from(Models.Measurement).join(Models.Stream).where(
+		Models.Measurement.Variable_ID == Variable_ID,
+		Models.Stream.Stream_Time >= Start_Time,
+		Models.Stream.Stream_Time < End_Time,
+		Models.Measurement.Measurement_Value.is_not(None),
+		*Partition.Get_Measurement_Bounds(Start_Time, End_Time),
+	)
+
+	# Narrow To One Device
+	if Device_ID is not None:
+		Statement = Statement.where(Models.Stream.Device_ID == Device_ID)
+
+	# Return Rows
+	return Statement
+
+# Get Bucket Expression
+def Get_Bucket(Start_Time, End_Time, Buckets):
+
+	# Bucket Rows By Equal Time Slices
+	Epoch = func.extract('epoch', Models.Stream.Stream_Time)
+	Width = (End_Time - Start_Time).total_seconds() / Buckets
+	return Epoch, func.floor((Epoch - Start_Time.timestamp()) / Width).label('Bucket')
+
+# Build Bucket Query
+def Build_Bucket_Query(Device_ID, Variable_ID, Start_Time, End_Time, Buckets):
+
+	# Aggregate Each Bucket In The Database
+	Epoch, Bucket = Get_Bucket(Start_Time, End_Time, Buckets)
+	return Build_Raw_Rows(Device_ID, Variable_ID, Start_Time, End_Time).add_columns(
+		Bucket,
+		func.avg(Epoch).label('Time'),
+		func.min(Models.Measurement.Measurement_Value).label('Min'),
+		func.max(Models.Measurement.Measurement_Value).label('Max'),
+		func.avg(Models.Measurement.Measurement_Value).label('Avg'),
+		func.count(Models.Measurement.Measurement_Value).label('Count'),
+	).group_by(Bucket).order_by(Bucket)
+
+# Build Tail Rows
+def Build_Tail_Rows(Device_ID, Variable_ID, Start_Time, End_Time, Buckets, After_ID):
+
+	# Raw Rows Not Folded Into The Rollups Yet, As Partial Buckets Of One Reading
+	Epoch, Bucket = Get_Bucket(Start_Time, End_Time, Buckets)
+	return Build_Raw_Rows(Device_ID, Variable_ID, Start_Time, End_Time).where(Models.Measurement.Measurement_ID > After_ID).add_columns(
+		Bucket,
+		Epoch.label('Time_Sum'),
+		Models.Measurement.Measurement_Value.label('Min'),
+		Models.Measurement.Measurement_Value.label('Max'),
+		Models.Measurement.Measurement_Value.label('Sum'),
+		literal(1).label('Count'),
+	)
+
+# Get Series Buckets
+def Get_Buckets(Arguments):
+
+	# Pre Aggregate Finer Buckets When LTTB Picks The Final Points
+	return Arguments['Points'] * LTTB_Factor if Arguments['Method'] == 'lttb' else Arguments['Points']
+
+# Get Series Resolution
+def Get_Resolution(Arguments):
+
+	# Read Raw Rows Until The First Rollup Refresh
+	if not Arguments.get('Rollup_ID'):
+		return None
+
+	# Pick The Coarsest Rollup That Fits One Bucket
+	return Rollup.Pick_Width((Arguments['End_Time'] - Arguments['Start_Time']).total_seconds() / Get_Buckets(Arguments))
+
+# Build Series Query
+def Build_Series_Query(Arguments):
+
+	# Read Raw Rows When No Rollup Fits Or None Exist Yet
+	Width = Get_Resolution(Arguments)
+	Range = (Arguments['Device_ID'], Arguments['Variable_ID'], Arguments['Start_Time'], Arguments['End_Time'], Get_Buckets(Arguments))
+	if Width is None:
+		return Build_Bucket_Query(*Range)
+
+	# Combine Rollups With The Raw Rows Past Their Watermark
+	return Rollup.Combine_Buckets(Rollup.Build_Rollup_Rows(*Range, Width), Build_Tail_Rows(*Range, Arguments['Rollup_ID']))
+
+# Largest Triangle Three Buckets
+def LTTB(X, Y, Threshold):
+
+	# Nothing To Reduce
+	Length = len(X)
+	if Threshold >= Length or Threshold < 3:
+		return numpy.arange(Length)
+
+	# Split Inner Points Into Threshold - 2 Buckets
+	Edges = numpy.linspace(1, Length - 1, Threshold - 1).astype(numpy.int64)
+
+	# Keep The First Point
+	Selected = numpy.empty(Threshold, dtype=numpy.int64)
+	Selected[0] = 0
+	Selected[-1] = Length - 1
+
+	# Pick The Point Forming The Largest Triangle In Each Bucket
+	Previous = 0
+	for Index in range(Threshold - 2):
+
+		# Get Current And Next Bucket Bounds
+		Start, End = Edges[Index], Edges[Index + 1]
+		Next_End = Edges[Index + 2] if Index + 2 < len(Edges) else Length
+
+		# Average The Next Bucket
+		Next_X = X[End:Next_End].mean() if Next_End > End else X[-1]
+		Next_Y = Y[End:Next_End].mean() if Next_End > End else Y[-1]
+
+		# Compute Triangle Areas For The Whole Bucket At Once
+		Areas = numpy.abs((X[Previous] - Next_X) * (Y[Start:End] - Y[Previous]) - (X[Previous] - X[Start:End]) * (Next_Y - Y[Previous]))
+
+		# Keep The Widest Point
+		Previous = Start + int(Areas.argmax())
+		Selected[Index + 1] = Previous
+
+	# Return Selected Indexes
+	return Selected
+
+# Format Series
+def Format_Series(Rows, Arguments):
+
+	# Unpack Bucket Columns Into Arrays
+	Time = numpy.fromiter((Row.Time for Row in Rows), dtype=numpy.float64, count=len(Rows))
+	Columns = numpy.array([(Row.Min, Row.Max, Row.Avg, Row.Count) for Row in Rows], dtype=numpy.float64).reshape(-1, 4)
+
+	# Calibrate Device Series, Fleet Buckets Mix Devices And Stay Raw
+	if Arguments['Device_ID'] is not None:
+		Low, High, Columns[:, 2] = (Calibration.Calibrations.Apply(Arguments['Device_ID'], Arguments['Variable_ID'], Columns[:, Index]) for Index in range(3))
+		Columns[:, 0], Columns[:, 1] = numpy.minimum(Low, High), numpy.maximum(Low, High)
+
+	# Reduce Pre Aggregated Buckets With LTTB On The Averages
+	if Arguments['Method'] == 'lttb':
+		Selected = LTTB(Time, Columns[:, 2], Arguments['Points'])
+		Time, Columns = Time[Selected], Columns[Selected]
+
+	# Return Series As Parallel Arrays
+	return {
+		'Device_ID': Arguments['Device_ID'],
+		'Variable_ID': Arguments['Variable_ID'],
+		'Method': Arguments['Method'],
+		'Calibrated': Arguments['Device_ID'] is not None,
+		'Resolution': Get_Resolution(Arguments),
+		'Time': (Time * 1000).round().astype(numpy.int64).tolist(),
+		'Min': Columns[:, 0].tolist(),
+		'Max': Columns[:, 1].tolist(),
+		'Avg': Columns[:, 2].tolist(),
+		'Count': Columns[:, 3].astype(numpy.int64).tolist(),
+	}
+
+# Register Audited Queries
+Audit.Register_Query('Device Series', lambda: Build_Bucket_Query('', '', *Audit.Sample_Range(), Default_Points))
+Audit.Register_Query('Fleet Variable Series', lambda: Build_Bucket_Query(None, '', *Audit.Sample_Range(), Default_Points))
@@ -0,0 +1,223 @@
+# Setup Root Path
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Packages
+from sqlalchemy import select, func, desc, tuple_, any_
+from sqlalchemy.dialects.postgresql import insert, array
+from sqlalchemy.exc import SQLAlchemyError
+from Setup import Database, Models, Refresh, Audit, Query
+
+# Define Page Size
+Page_Size = 50
+
+# Define Sources Shown Per Payload Group
+Source_Limit = 5
+
+# Define Shortest Search, Trigram Indexes Need Three Characters
+Min_Search_Length = 3
+
+# Get Content Hash Expression
+def Content_Hash(Column):
+
+	# Hash The Payload With Digit Runs And Whitespace Folded, So Packets Differing Only In Counters Group Together
+	Shape = func.regexp_replace(func.regexp_replace(func.lower(func.coalesce(Column, '')), '[0-9]+', '0', 'g'), '\\s+', ' ', 'g')
+	return func.md5(Shape)
+
+# Apply Unknown Data Batch
+def Apply_Payloads(Connection, Low, High):
+
+	# Select The Batch With Its Content Hash
+	Batch = select(
+		Content_Hash(Models.Unknown_Data.RAW_Data).label('Content_Hash'),
+		Models.Unknown_Data.Data_ID,
+		func.coalesce(Models.Unknown_Data.Client_IP, '').label('Client_IP'),
+		Models.Unknown_Data.RAW_Data,
+		Models.Unknown_Data.Stream_Time,
+	).where(
+		Models.Unknown_Data.Data_ID > Low,
+		Models.Unknown_Data.Data_ID <= High,
+	).subquery('Batch')
+
+	# Group The Batch, Carrying Only Keys So No Payload Text Is Collected Per Group
+	Totals = select(
+		Batch.c.Content_Hash,
+		func.count().label('Payload_Count'),
+		func.min(Batch.c.Data_ID).label('First_Data_ID'),
+		func.max(Batch.c.Data_ID).label('Last_Data_ID'),
+		func.min(Batch.c.Stream_Time).label('First_Seen'),
+		func.max(Batch.c.Stream_Time).label('Last_Seen'),
+	).group_by(Batch.c.Content_Hash).subquery('Totals')
+
+	# Merge Payload Groups, Fetching The Oldest Payload As The Sample By Its Key
+	Groups = select(
+		Totals.c.Content_Hash,
+		Models.Unknown_Data.RAW_Data,
+		Totals.c.Payload_Count,
+		Totals.c.First_Data_ID,
+		Totals.c.Last_Data_ID,
+		Totals.c.First_Seen,
+		Totals.c.Last_Seen,
+	).join(Models.Unknown_Data, Models.Unknown_Data.Data_ID == Totals.c.First_Data_ID)
+	Statement = insert(Models.Unknown_Payload).from_select(['Content_Hash', 'Sample_Data', 'Payload_Count', 'First_Data_ID', 'Last_Data_ID', 'First_Seen', 'Last_Seen'], Groups)
+	Connection.execute(Statement.on_conflict_do_update(
+		index_elements=['Content_Hash'],
+		set_={
+			'Payload_Count': Models.Unknown_Payload.Payload_Count + Statement.excluded.Payload_Count,
+			'Last_Data_ID': func.greatest(Models.Unknown_Payload.Last_Data_ID, Statement.excluded.Last_Data_ID),
+			'First_Seen': func.least(Models.Unknown_Payload.First_Seen, Statement.excluded.First_Seen),
+			'Last_Seen': func.greatest(Models.Unknown_Payload.Last_Seen, Statement.excluded.Last_Seen),
+		},
+	))
+
+	# Merge Counts Per Client IP
+	Sources = select(
+		Batch.c.Content_Hash,
+		Batch.c.Client_IP,
+		func.count(),
+		func.max(Batch.c.Stream_Time),
+	).group_by(Batch.c.Content_Hash, Batch.c.Client_IP)
+	Statement = insert(Models.Unknown_Payload_Source).from_select(['Content_Hash', 'Client_IP', 'Payload_Count', 'Last_Seen'], Sources)
+	Connection.execute(Statement.on_conflict_do_update(
+		index_elements=['Content_Hash', 'Client_IP'],
+		set_={
+			'Payload_Count': Models.Unknown_Payload_Source.Payload_Count + Statement.excluded.Payload_Count,
+			'Last_Seen': func.greatest(Models.Unknown_Payload_Source.Last_Seen, Statement.excluded.Last_Seen),
+		},
+	))
+
+# Ensure Search Index
+def Ensure_Search_Index():
+
+	# Try to build the trigram index without blocking ingest
+	try:
+		with Database.DB_Engine.connect().execution_options(isolation_level='AUTOCOMMIT') as Connection:
+			Connection.exec_driver_sql('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+			Connection.exec_driver_sql('CREATE INDEX CONCURRENTLY IF NOT EXISTS "idx_unknown_data_raw_trgm" ON "Unknown_Data" USING gin ("RAW_Data" gin_trgm_ops)')
+			Connection.exec_driver_sql('DROP INDEX CONCURRENTLY IF EXISTS "idx_unknown_data_id"')
+
+	# Search Still Works Without The Index, Only Slower
+	except SQLAlchemyError as e:
+		return str(e.orig if hasattr(e, 'orig') else e).splitlines()[0]
+
+# Refresh Payload Groups
+def Refresh_Payloads(Batch_Size=100000):
+
+	# Create Group Tables On First Refresh
+	Refresh.Ensure_Tables(Models.Unknown_Payload, Models.Unknown_Payload_Source)
+
+	# Fold New Payloads Into Their Groups
+	return Refresh.Run_Batches('Unknown_Payload', Models.Unknown_Data.Data_ID, Apply_Payloads, Batch_Size)
+
+# Escape Like Pattern
+def Escape_Like(Text):
+
+	# Match Wildcards Literally
+	return Text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+# Build Search Query
+def Build_Search_Query(Search, Before_ID=None, Client_IP=None):
+
+	# Match Substrings Through The Trigram Index, Newest First
+	Statement = select(
+		Models.Unknown_Data.Data_ID,
+		Models.Unknown_Data.Client_IP,
+		Models.Unknown_Data.RAW_Data,
+		Models.Unknown_Data.Size,
+		Query.Formatted(Models.Unknown_Data.Stream_Time),
+	).where(Models.Unknown_Data.RAW_Data.ilike(f'%{Escape_Like(Search)}%', escape='\\')).order_by(desc(Models.Unknown_Data.Data_ID))
+
+	# Filter Client IP
+	if Client_IP:
+		Statement = Statement.where(Models.Unknown_Data.Client_IP == Client_IP)
+
+	# Seek Past The Last Seen Payload
+	if Before_ID is not None:
+		Statement = Statement.where(Models.Unknown_Data.Data_ID < Before_ID)
+
+	# Fetch One Extra Row To Detect The Next Page
+	return Statement.limit(Page_Size + 1)
+
+# Build Group Query
+def Build_Group_Query(After_Key=None):
+
+	# Largest Groups First
+	Statement = select(
+		Models.Unknown_Payload.Content_Hash,
+		Models.Unknown_Payload.Sample_Data,
+		Models.Unknown_Payload.Payload_Count,
+		Query.Formatted(Models.Unknown_Payload.First_Seen),
+		Query.Formatted(Models.Unknown_Payload.Last_Seen),
+	).order_by(desc(Models.Unknown_Payload.Payload_Count), desc(Models.Unknown_Payload.Content_Hash))
+
+	# Seek Past The Last Seen Group
+	if After_Key is not None:
+		Statement = Statement.where(tuple_(Models.Unknown_Payload.Payload_Count, Models.Unknown_Payload.Content_Hash) < After_Key)
+
+	# Fetch One Extra Row To Detect The Next Page
+	return Statement.limit(Page_Size + 1)
+
+# Build Source Query
+def Build_Source_Query(Content_Hashes):
+
+	# Rank Client IPs Within Each Group On The Page
+	Rank = func.row_number().over(partition_by=Models.Unknown_Payload_Source.Content_Hash, order_by=desc(Models.Unknown_Payload_Source.Payload_Count)).label('Rank')
+	Ranked = select(
+		Models.Unknown_Payload_Source.Content_Hash,
+		Models.Unknown_Payload_Source.Client_IP,
+		Models.Unknown_Payload_Source.Payload_Count,
+		Rank,
+	).where(Models.Unknown_Payload_Source.Content_Hash == any_(array(Content_Hashes))).subquery()
+
+	# Keep The Busiest Sources Per Group
+	return select(Ranked.c.Content_Hash, Ranked.c.Client_IP, Ranked.c.Payload_Count).where(Ranked.c.Rank <= Source_Limit).order_by(Ranked.c.Content_Hash, Ranked.c.Rank)
+
+# Parse Triage Arguments
+def Parse_Triage_Arguments(Args):
+
+	# Get Search Arguments
+	Search = Args.get('q', '').strip()
+	Client_IP = Args.get('ip', '').strip() or None
+
+	# Validate Search
+	if Search and len(Search) < Min_Search_Length:
+		raise ValueError(f'Search needs at least {Min_Search_Length} characters')
+
+	# Try to parse cursors
+	try:
+		Before_ID = int(Args['before']) if Args.get('before') else None
+		After_Key = None
+		if Args.get('after'):
+			Count, Content_Hash = Args['after'].split(':', 1)
+			After_Key = (int(Count), Content_Hash)
+	except ValueError:
+		raise ValueError('Invalid cursor')
+
+	# Return Arguments
+	return {'Search': Search, 'Client_IP': Client_IP, 'Before_ID': Before_ID, 'After_Key': After_Key}
+
+# Format Search
+def Format_Search(Rows):
+
+	# Return Page Rows And Next Cursor
+	Payloads = [Row._asdict() for Row in Rows[:Page_Size]]
+	return Payloads, Payloads[-1]['Data_ID'] if len(Rows) > Page_Size else None
+
+# Format Groups
+def Format_Groups(Rows, Source_Rows):
+
+	# Collect Sources Per Group
+	Sources = {}
+	for Row in Source_Rows:
+		Sources.setdefault(Row.Content_Hash, []).append({'Client_IP': Row.Client_IP or '-', 'Payload_Count': Row.Payload_Count})
+
+	# Return Page Rows With Sources And Next Cursor
+	Groups = [dict(Row._asdict(), Sources=Sources.get(Row.Content_Hash, [])) for Row in Rows[:Page_Size]]
+	return Groups, f'{Groups[-1]["Payload_Count"]}:{Groups[-1]["Content_Hash"]}' if len(Rows) > Page_Size else None
+
+# Register Audited Queries
+Audit.Register_Query('Unknown Data Search', lambda: Build_Search_Query('timeout'))
+Audit.Register_Query('Unknown Data Search By IP', lambda: Build_Search_Query('timeout', 2**31 - 1, '10.0.0.1'))
+Audit.Register_Query('Unknown Payload Groups', lambda: Build_Group_Query())
+Audit.Register_Query('Older Unknown Payload Groups', lambda: Build_Group_Query((2**31 - 1, 'f' * 32)))
+Audit.Register_Query('Unknown Payload Sources', lambda: Build_Source_Query(['0' * 32]))
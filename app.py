@@ -3,69 +3,139 @@ import sys
 sys.path.append('/home/postoffice/PostOffice/src')
 
 # Import Libraries
-from flask import Flask, render_template
-from Setup import Database, Models
-from sqlalchemy import desc
+import click
+from flask import Flask, Response, render_template, make_response, request, jsonify, abort, send_file, before_render_template, template_rendered
+from Setup import Assets, Compression, Conditional, Database, Pagination, Audit, Live, Cache, Query, Feed, Fleet, Series, Rollup, Export, Partition, Retention, Rule_Engine, Device_Detail, Profile, Benchmark, Operators, Triage, Rollout, Calibration
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import joinedload
 
 # Create Flask App
 app = Flask(__name__)
 
+# Profile Requests When Enabled
+Profile.Install(app, before_render_template, template_rendered)
+
+# Precompile Templates And Serve Built Assets
+Static_Assets = Assets.Install(app)
+
+# Compress Responses The Client Accepts Compressed
+Compression.Install(app)
+
 
 
 # Get All Variables
-def Get_All_Variables():
-
-	# Try to open a database session
-	try:
-
-		# Open a database session
-		with Database.DB_Session_Scope() as DB:
-
-			# Query all data types
-			Query_Log = DB.query(Models.Log).options(
-					joinedload(Models.Log.level),
-					joinedload(Models.Log.description),
-					joinedload(Models.Log.service),
-				).order_by(
-					desc(Models.Log.Create_Time)
-				).limit(10).all()
-
-
-			badge_classes = {
-				1: 'badge-primary',
-				2: 'badge-secondary',
-				3: 'badge-success',
-				4: 'badge-danger',
-				5: 'badge-warning',
-				6: 'badge-info',
-				7: 'badge-light',
-				8: 'badge-dark'
-			}
-
-			# Set Data Type List
-			Data_Type_List = [
-				{
-					'Create_Time': Log.Create_Time.strftime('%Y-%m-%d %H:%M:%S'),
-					'Log_Level_ID': Log.level.Log_Level_Name,
-					'Log_Level_Badge_Class': badge_classes.get(Log.level.Log_Level_ID, 'badge-primary'),
-                    'Log_Description_ID': Log.description.Log_Description,
-					'Service_ID': Log.service.Service_Name,
-					'Service_Badge_Class': badge_classes.get(Log.Service_ID, 'badge-primary'),
-					'Device_ID': Log.Device_ID,
-					'Log_Message': Log.Log_Message,
-				} for Log in Query_Log
-			]
-
-			# Get Data Type List
-			return Data_Type_List
+def Get_All_Variables(Filters=None, Cursor_Key=None, Limit=Pagination.Default_Page_Size):
+
+	# Try to query the database
+	try:
+
+		# Read The Log Version First, So The Page Is Never Older Than Its ETag
+		Version = Get_Log_Version(Filters or {})
+
+		# Query all data types
+		Query_Log, Next_Cursor = Feed.Split_Page(Query.Read_Rows(Feed.Build_Log_Query(Filters or {}, Cursor_Key, Limit)), Limit)
+
+		# Get Data Type List
+		return Feed.Format_Logs(Query_Log), Next_Cursor, Version
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return Empty Page
+		return [], None, None
+
+# Get Logs After
+def Get_Logs_After(Log_ID):
+
+	# Try to query the database
+	try:
+
+		# Query logs newer than the last seen id
+		return Feed.Format_Tail(Query.Read_Rows(Feed.Build_Tail_Query(Log_ID)))
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return Empty List
+		return []
+
+# Get Newest Log ID
+def Get_Newest_Log_ID():
+
+	# Try to query the database
+	try:
+
+		# Query the newest log id
+		return Query.Read_Scalar(Feed.Build_Head_Query()) or 0
 
 	# Handle Exceptions
 	except SQLAlchemyError as e:
 
-		# Return Empty Dictionary
-		return {}
+		# Return No Head, So The Poller Retries Instead Of Replaying From The First Log
+		return None
+
+# Get Log Version
+def Get_Log_Version(Filters):
+
+	# Try to query the database
+	try:
+
+		# Query the newest and oldest log
+		return Feed.Format_Version(Query.Read_Rows(Feed.Build_Version_Query(Filters))[0])
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return No Version
+		return None
+
+# Set Live Log Broadcaster
+Live_Logs = Live.Log_Broadcaster(Get_Logs_After, Get_Newest_Log_ID)
+
+# Parse Page Request
+def Parse_Page_Request(Args):
+
+	# Try to parse request arguments
+	try:
+
+		# Return Page Arguments
+		return Feed.Parse_Page_Arguments(Args)
+
+	# Handle Malformed Arguments
+	except ValueError as e:
+
+		# Abort Request
+		abort(400, description=str(e))
+
+# Get Cached Log Page
+def Get_Cached_Log_Page(Filters, Cursor_Key, Limit):
+
+	# Coalesce Concurrent Loads Of The Same Page
+	return Cache.Results.Get(Feed.Get_Page_Cache_Key(Filters, Cursor_Key, Limit), lambda: Get_All_Variables(Filters, Cursor_Key, Limit))
+
+# Get Cached Log Version
+def Get_Cached_Log_Version(Filters):
+
+	# Share One Version Lookup Between Concurrent Revalidations
+	return Cache.Results.Get(Feed.Get_Version_Cache_Key(Filters), lambda: Get_Log_Version(Filters))['Value']
+
+# Get Log Validators
+def Get_Log_Validators(Version, Filters, Cursor_Key, Limit):
+
+	# Tie Log Pages To The Newest And Oldest Matching Log, To The Page And Route They Show And To The Deployed Templates
+	return Conditional.Get_Validators(Version, Static_Assets.Get_Version(), request.path, Feed.Get_Page_Cache_Key(Filters, Cursor_Key, Limit))
+
+# Set Validators
+def Set_Validators(Page, Validators):
+
+	# Set Weak ETag And Last Modified Time
+	return Conditional.Set_Validators(Page, Validators)
+
+# Get Not Modified Response
+def Get_Not_Modified(Validators):
+
+	# Return Response When The Client Copy Is Current
+	if Conditional.Is_Not_Modified(request, Validators):
+		return Set_Validators(app.response_class(status=304), Validators)
 
 
 
@@ -75,9 +145,454 @@ def Get_All_Variables():
 @app.route("/")
 def hello():
 
-	Variables = Get_All_Variables()
+	# Parse Page Request
+	Filters, Cursor_Key, Limit = Parse_Page_Request(request.args)
+
+	# Skip Querying And Rendering Unchanged Pages
+	Not_Modified = Get_Not_Modified(Get_Log_Validators(Get_Cached_Log_Version(Filters), Filters, Cursor_Key, Limit))
+	if Not_Modified is not None:
+		return Not_Modified
+
+	# Get Log Page
+	Entry = Get_Cached_Log_Page(Filters, Cursor_Key, Limit)
+
+	# Unpack Log Page
+	Variables, Next_Cursor, Version = Entry['Value']
+
+	# Keep Filters Across Pages
+	Filter_Args = Feed.Get_Filter_Arguments(request.args)
+
+	# Stream Rows Newer Than The Page On The First Page
+	Stream_After = Feed.Get_Stream_Start(Variables, Cursor_Key)
+
+	return Set_Validators(make_response(render_template("home.html", Variables=Variables, Next_Cursor=Next_Cursor, Filter_Args=Filter_Args, Is_First_Page=Cursor_Key is None, Stream_After=Stream_After, name='Gunce')), Get_Log_Validators(Version, Filters, Cursor_Key, Limit))
+
+# Log Feed API
+@app.route("/api/logs")
+def Log_Feed():
+
+	# Parse Page Request
+	Filters, Cursor_Key, Limit = Parse_Page_Request(request.args)
+
+	# Skip Querying And Serializing Unchanged Pages
+	Not_Modified = Get_Not_Modified(Get_Log_Validators(Get_Cached_Log_Version(Filters), Filters, Cursor_Key, Limit))
+	if Not_Modified is not None:
+		return Not_Modified
+
+	# Get Log Page
+	Entry = Get_Cached_Log_Page(Filters, Cursor_Key, Limit)
+
+	# Unpack Log Page
+	Logs, Next_Cursor, Version = Entry['Value']
+
+	# Return Log Page
+	return Set_Validators(jsonify({'Logs': Logs, 'Next_Cursor': Next_Cursor}), Get_Log_Validators(Version, Filters, Cursor_Key, Limit))
+
+
+
+
+
+# Fleet Page
+@app.route("/fleet")
+def Fleet_Page():
+
+	# Parse Fleet Request
+	try:
+		Sort, Direction, After_Key = Fleet.Parse_Fleet_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Devices, Next_Cursor = Fleet.Format_Fleet(Query.Read_Rows(Fleet.Build_Fleet_Query(Sort, Direction, After_Key)))
+	except SQLAlchemyError as e:
+		Devices, Next_Cursor = [], None
+
+	return render_template("fleet.html", Devices=Devices, Next_Cursor=Next_Cursor, Sort=Sort, Direction=Direction, Is_First_Page=After_Key is None, Columns=Fleet.Column_Titles)
+
+# Device Page
+@app.route("/device/<Device_ID>")
+def Device_Page(Device_ID):
+
+	# Try to query the database
+	try:
+		Device = Device_Detail.Load_Device(Device_ID)
+	except SQLAlchemyError as e:
+		abort(503)
+
+	# Unknown Device
+	if Device is None:
+		abort(404)
+
+	return render_template("device.html", Device=Device)
+
+# Rule Trigger Page
+@app.route("/rules/triggers")
+def Trigger_Page():
+
+	# Parse Trigger Request
+	try:
+		Before_ID = Rule_Engine.Parse_Trigger_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Triggers, Next_Cursor = Rule_Engine.Format_Triggers(Query.Read_Rows(Rule_Engine.Build_Trigger_Query(Before_ID)))
+	except SQLAlchemyError as e:
+		Triggers, Next_Cursor = [], None
+
+	return render_template("triggers.html", Triggers=Triggers, Next_Cursor=Next_Cursor, Is_First_Page=Before_ID is None)
+
+# Operator Page
+@app.route("/operators")
+def Operator_Page():
+
+	# Parse Operator Request
+	try:
+		Arguments = Operators.Parse_Operator_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Operator_Rows = Query.Read_Rows(Operators.Build_Operator_Query(Arguments['Start_Time'], Arguments['End_Time']))
+		Daily_Rows = Query.Read_Rows(Operators.Build_Daily_Query(Arguments['Operator_ID'], Arguments['Start_Time'], Arguments['End_Time']))
+		Operators.Directory.Refresh({Row.Operator_ID for Row in Operator_Rows} | {Arguments['Operator_ID']})
+	except SQLAlchemyError as e:
+		Operator_Rows, Daily_Rows = [], []
+
+	# Format Operators, Countries And Days
+	Operator_List, Countries, Days = Operators.Format_Operators(Operator_Rows, Daily_Rows)
+
+	return render_template("operators.html", Operators=Operator_List, Countries=Countries, Days=Days, Arguments=Arguments, Selected=Operators.Directory.Get(Arguments['Operator_ID']) if Arguments['Operator_ID'] is not None else None)
+
+# Triage Page
+@app.route("/unknown")
+def Triage_Page():
+
+	# Parse Triage Request
+	try:
+		Arguments = Triage.Parse_Triage_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+
+		# Search Payloads By Substring
+		if Arguments['Search']:
+			Payloads, Next_Cursor = Triage.Format_Search(Query.Read_Rows(Triage.Build_Search_Query(Arguments['Search'], Arguments['Before_ID'], Arguments['Client_IP'])))
+			Groups = []
+
+		# List Payload Groups With Their Busiest Sources
+		else:
+			Group_Rows = Query.Read_Rows(Triage.Build_Group_Query(Arguments['After_Key']))
+			Source_Rows = Query.Read_Rows(Triage.Build_Source_Query([Row.Content_Hash for Row in Group_Rows])) if Group_Rows else []
+			Groups, Next_Cursor = Triage.Format_Groups(Group_Rows, Source_Rows)
+			Payloads = []
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+		Payloads, Groups, Next_Cursor = [], [], None
+
+	return render_template("unknown.html", Payloads=Payloads, Groups=Groups, Next_Cursor=Next_Cursor, Arguments=Arguments, Is_First_Page=Arguments['Before_ID'] is None and Arguments['After_Key'] is None)
+
+# Firmware Rollout Page
+@app.route("/firmware")
+def Rollout_Page():
+
+	# Parse Rollout Request
+	try:
+		Arguments = Rollout.Parse_Rollout_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+
+		# Compare Counters With The Requested Or Newest Released Version
+		Target_ID = Arguments['Target_ID'] if Arguments['Target_ID'] is not None else Query.Read_Scalar(Rollout.Build_Target_Query())
+		Groups = Rollout.Format_Rollout(Query.Read_Rows(Rollout.Build_Rollout_Query()), Target_ID)
+
+		# List Devices Of One Cell
+		Devices, Next_Cursor = [], None
+		if Arguments['Version_ID'] is not None:
+			Devices, Next_Cursor = Rollout.Format_Devices(Query.Read_Rows(Rollout.Build_Device_Query(Arguments['Version_ID'], Arguments['Project_ID'], Arguments['Model_ID'], Arguments['After_ID'])))
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+		Groups, Devices, Next_Cursor = [], [], None
+
+	return render_template("firmware.html", Groups=Groups, Devices=Devices, Next_Cursor=Next_Cursor, Arguments=Arguments)
+
+# Get Rollup ID
+def Get_Rollup_ID():
+
+	# Try to query the database
+	try:
+
+		# Query the last measurement folded into the rollups
+		return Query.Read_Scalar(Rollup.Build_Watermark_Query())
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return No Rollups, So Series Read Raw Rows
+		return None
+
+# Measurement Series API
+@app.route("/api/series")
+def Series_Feed():
+
+	# Parse Series Request
+	try:
+		Arguments = Series.Parse_Series_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Find How Far The Rollups Reach
+	Arguments['Rollup_ID'] = Get_Rollup_ID()
+
+	# Try to query the database
+	try:
+		Rows = Query.Read_Rows(Series.Build_Series_Query(Arguments))
+
+		# Load Calibrations Once Per TTL
+		Calibration.Calibrations.Refresh()
+	except SQLAlchemyError as e:
+		Rows = []
+
+	# Return Downsampled Series
+	return jsonify(Series.Format_Series(Rows, Arguments))
+
+# Export API
+@app.route("/export/<Name>")
+def Export_Feed(Name):
+
+	# Parse Export Request
+	try:
+		Arguments = Export.Parse_Export_Arguments(Name, request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Generate Export Chunks
+	def Generate():
+
+		# Load Calibrations Once Per TTL
+		if Arguments['Name'] == 'measurements':
+			Calibration.Calibrations.Refresh()
+
+		# Encode One Server Side Cursor Chunk At A Time
+		Encoder = Export.Get_Encoder(Arguments)
+		yield Encoder.Begin()
+		for Rows in Query.Stream_Rows(Export.Build_Export_Query(Arguments), Export.Chunk_Size):
+			yield Encoder.Encode(Rows)
+		yield Encoder.Finish()
+
+	# Return Streaming Download
+	return Response(Generate(), mimetype=Export.Export_Formats[Arguments['Format']][0], headers=Export.Get_Export_Headers(Arguments))
+
+# Pool Status API
+@app.route("/api/pool")
+def Pool_Status():
+
+	# Return Pool Checkout Statistics
+	return jsonify(Database.Get_Pool_Status())
+
+# Metrics Endpoint
+@app.route("/metrics")
+def Metrics():
+
+	# Return Prometheus Text Exposition
+	return Response(Profile.Render_Metrics(), mimetype='text/plain; version=0.0.4')
+
+# Static Asset Endpoint
+@app.route("/assets/<Name>")
+def Static_Asset(Name):
+
+	# Find The Built Asset In The Best Encoding The Client Accepts
+	Asset = Static_Assets.Resolve(Name, request.accept_encodings)
+	if Asset is None:
+		abort(404)
+
+	# Return Asset
+	Path, Mimetype, Encoding = Asset
+	return Assets.Set_Headers(send_file(Path, mimetype=Mimetype), Encoding)
+
+# Live Log Stream
+@app.route("/stream/logs")
+def Log_Stream():
+
+	# Parse Stream Request
+	try:
+		Filters, Last_Log_ID = Feed.Parse_Stream_Arguments(request.args, request.headers)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Generate Server Sent Events
+	def Generate():
+
+		# Wait For Shared Poller Batches
+		for Rows in Live_Logs.Subscribe(Last_Log_ID):
+
+			# Send Matching Rows Or Keepalive
+			Events = Feed.Format_Events(Rows, Filters)
+			if Events:
+				yield Events
+
+	# Return Event Stream
+	return Response(Generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+# Fleet Refresh Command
+@app.cli.command("refresh-fleet")
+def Refresh_Fleet():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Refresh Device Summary
+	print(f'Device_Summary refreshed through {Fleet.Refresh_Fleet()} new streams')
+
+# Rollup Refresh Command
+@app.cli.command("refresh-rollups")
+def Refresh_Rollups():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Refresh Measurement Rollups
+	print(f'Measurement_Rollup refreshed through {Rollup.Refresh_Rollups()} new measurements')
+
+# Operator Refresh Command
+@app.cli.command("refresh-operators")
+def Refresh_Operators():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Refresh Operator Aggregates
+	print(f'Operator_Daily refreshed through {Operators.Refresh_Operators()} new streams')
+
+# Payload Refresh Command
+@app.cli.command("refresh-payloads")
+def Refresh_Payloads():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Build The Trigram Search Index Once
+	Error = Triage.Ensure_Search_Index()
+	if Error:
+		print(f'Unknown_Data search index unavailable, searches scan the table: {Error}')
+
+	# Refresh Payload Groups
+	print(f'Unknown_Payload refreshed through {Triage.Refresh_Payloads()} new payloads')
+
+# Rollout Refresh Command
+@app.cli.command("refresh-rollout")
+def Refresh_Rollout():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Refresh Firmware Rollout Counters
+	print(f'Firmware_Rollout refreshed, {Rollout.Refresh_Rollout()} counters changed')
+
+# Partition Maintenance Command
+@app.cli.command("partition-tables")
+def Partition_Tables():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Convert, Extend And Trim Partitioned Tables
+	for Table_Name, Action, Partition_Name in Partition.Maintain_Partitions():
+		print(f'[{Action.upper()}] {Table_Name}: {Partition_Name}')
+
+# Retention Command
+@app.cli.command("prune-tables")
+def Prune_Tables():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Build The Time Indexes The Deletes Walk Once
+	Error = Retention.Ensure_Time_Indexes()
+	if Error:
+		print(f'Retention time indexes unavailable, deletes scan the tables: {Error}')
+
+	# Archive And Delete Expired Rows
+	for Table_Name, Deleted, Rate, Total, Remaining in Retention.Run_Retention():
+		print(f'{Table_Name}: archived and deleted {Deleted} rows at {Rate:.0f} rows/s, {Total} so far, about {Remaining} left')
+
+# Rule Evaluation Command
+@app.cli.command("evaluate-rules")
+def Evaluate_Rules():
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Evaluate New Measurements Against Active Rules
+	print(f'Rule_Engine evaluated {Rule_Engine.Evaluate_Rules()} new measurements')
+
+# Benchmark Seed Command
+@app.cli.command("seed-benchmark")
+@click.option('--devices', default=1000, type=click.IntRange(1, 999999), help='Synthetic devices to create.')
+@click.option('--streams', default=1000000, type=click.IntRange(0), help='Streams to add, each with one measurement per benchmark variable.')
+@click.option('--logs', default=1000000, type=click.IntRange(0), help='Logs to add.')
+@click.option('--days', default=30, type=click.IntRange(1), help='Days the rows are spread over, ending now.')
+@click.option('--batch-size', default=100000, type=click.IntRange(1), help='Rows inserted per transaction.')
+def Seed_Benchmark(devices, streams, logs, days, batch_size):
+
+	# Run Without The Web Statement Timeout
+	Database.Lift_Statement_Timeout()
+
+	# Seed Synthetic Fleet
+	for Table_Name, Rows, Rate in Benchmark.Seed_Fleet(devices, streams, logs, days, batch_size):
+		print(f'{Table_Name}: {Rows} rows' + (f' at {Rate:.0f} rows/s' if Rate else ''))
+
+# Benchmark Run Command
+@app.cli.command("run-benchmark")
+@click.option('--concurrency', default=8, type=click.IntRange(1), help='Concurrent callers per target.')
+@click.option('--requests', default=200, type=click.IntRange(1), help='Measured calls per target.')
+@click.option('--warmup', default=20, type=click.IntRange(0), help='Unmeasured calls per target.')
+@click.option('--cache/--no-cache', default=False, help='Keep the result cache on.')
+@click.option('--only', default=None, help='Run only targets whose name contains this text.')
+def Run_Benchmark(concurrency, requests, warmup, cache, only):
+
+	# Run Routes And Registered Queries
+	for Name, Result in Benchmark.Run_Benchmark(app, concurrency, requests, warmup, cache, only):
+		if Result is None:
+			print(f'Results written to {Name}')
+		else:
+			print(f'{Name}: p50 {Result["P50_MS"]:.1f} ms, p95 {Result["P95_MS"]:.1f} ms, p99 {Result["P99_MS"]:.1f} ms, {Result["Throughput"]:.1f} req/s, {Result["Errors"]} errors, {Result["Peak_RSS_MB"]:.0f} MB peak')
+
+# Benchmark Compare Command
+@app.cli.command("compare-benchmark")
+@click.argument('old', type=click.Path(exists=True, dir_okay=False))
+@click.argument('new', type=click.Path(exists=True, dir_okay=False))
+def Compare_Benchmark(old, new):
+
+	# Print Change Per Target
+	for Name, Changes in Benchmark.Compare_Results(old, new):
+		print(f'{Name}: ' + ', '.join(f'{Metric} {Before} -> {After} ({Change:+.1f}%)' for Metric, (Before, After, Change) in Changes.items()))
+
+# Asset Build Command
+@app.cli.command("build-assets")
+def Build_Assets():
+
+	# Build Static Assets
+	for Asset in Assets.Build_Assets(app.static_folder):
+		print(f'{Asset["Name"]} -> {Asset["Built_Name"]}: {Asset["Source"]} bytes, minified {Asset["Minified"]}, gzip {Asset[".gz"]}, brotli {Asset[".br"] if Asset[".br"] is not None else "skipped (install brotli)"}')
+
+# Index Audit Command
+@app.cli.command("audit-indexes")
+def Audit_Indexes():
 
-	return render_template("home.html", Variables=Variables, name='Gunce')
+	# Run Index Audit
+	if not Audit.Run_Audit():
+		sys.exit(1)
 
 
 
@@ -85,4 +600,4 @@ def hello():
 
 # Run the App
 if __name__ == "__main__":
-	app.run(host='0.0.0.0', port=8000, debug=True)
\ No newline at end of file
+	app.run(host='0.0.0.0', port=8000, debug=True)
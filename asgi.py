@@ -0,0 +1,465 @@
+# Setup Library
+import sys
+sys.path.append('/home/postoffice/PostOffice/src')
+
+# Import Libraries
+from quart import Quart, Response, render_template, make_response, request, jsonify, abort, send_file, before_render_template, template_rendered
+from Setup import Assets, Compression, Conditional, Database, Pagination, Cache, Feed, Live, Async_Database, Fleet, Series, Rollup, Export, Rule_Engine, Profile, Operators, Triage, Rollout
+from sqlalchemy.exc import SQLAlchemyError
+
+# Create Quart App
+app = Quart(__name__)
+
+# Profile Requests When Enabled
+Profile.Install(app, before_render_template, template_rendered, Is_Async=True)
+
+# Precompile Templates And Serve Built Assets
+Static_Assets = Assets.Install(app, Is_Async=True)
+
+# Compress Responses The Client Accepts Compressed
+Compression.Install(app, Is_Async=True)
+
+
+
+# Get All Variables
+async def Get_All_Variables(Filters=None, Cursor_Key=None, Limit=Pagination.Default_Page_Size):
+
+	# Try to query the database
+	try:
+
+		# Read The Log Version First, So The Page Is Never Older Than Its ETag
+		Version = await Get_Log_Version(Filters or {})
+
+		# Query all data types
+		Query_Log, Next_Cursor = Feed.Split_Page(await Async_Database.Read_Rows(Feed.Build_Log_Query(Filters or {}, Cursor_Key, Limit)), Limit)
+
+		# Resolve Names Without Blocking The Event Loop
+		await Async_Database.Refresh_Dimensions(Query_Log, Feed.Log_Dimensions)
+
+		# Get Data Type List
+		return Feed.Format_Logs(Query_Log), Next_Cursor, Version
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return Empty Page
+		return [], None, None
+
+# Get Logs After
+async def Get_Logs_After(Log_ID):
+
+	# Try to query the database
+	try:
+
+		# Query logs newer than the last seen id
+		Query_Log = await Async_Database.Read_Rows(Feed.Build_Tail_Query(Log_ID))
+
+		# Resolve Names Without Blocking The Event Loop
+		await Async_Database.Refresh_Dimensions(Query_Log, Feed.Log_Dimensions)
+
+		# Return Raw And Display Rows
+		return Feed.Format_Tail(Query_Log)
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return Empty List
+		return []
+
+# Get Newest Log ID
+async def Get_Newest_Log_ID():
+
+	# Try to query the database
+	try:
+
+		# Query the newest log id
+		return await Async_Database.Read_Scalar(Feed.Build_Head_Query()) or 0
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return No Head, So The Poller Retries Instead Of Replaying From The First Log
+		return None
+
+# Get Log Version
+async def Get_Log_Version(Filters):
+
+	# Try to query the database
+	try:
+
+		# Query the newest and oldest log
+		return Feed.Format_Version((await Async_Database.Read_Rows(Feed.Build_Version_Query(Filters)))[0])
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return No Version
+		return None
+
+# Set Live Log Broadcaster
+Live_Logs = Live.Async_Log_Broadcaster(Get_Logs_After, Get_Newest_Log_ID)
+
+# Parse Page Request
+def Parse_Page_Request(Args):
+
+	# Try to parse request arguments
+	try:
+
+		# Return Page Arguments
+		return Feed.Parse_Page_Arguments(Args)
+
+	# Handle Malformed Arguments
+	except ValueError as e:
+
+		# Abort Request
+		abort(400, description=str(e))
+
+# Get Cached Log Page
+async def Get_Cached_Log_Page(Filters, Cursor_Key, Limit):
+
+	# Coalesce Concurrent Loads Of The Same Page
+	return await Cache.Results.Async_Get(Feed.Get_Page_Cache_Key(Filters, Cursor_Key, Limit), lambda: Get_All_Variables(Filters, Cursor_Key, Limit))
+
+# Get Cached Log Version
+async def Get_Cached_Log_Version(Filters):
+
+	# Share One Version Lookup Between Concurrent Revalidations
+	return (await Cache.Results.Async_Get(Feed.Get_Version_Cache_Key(Filters), lambda: Get_Log_Version(Filters)))['Value']
+
+# Get Log Validators
+def Get_Log_Validators(Version, Filters, Cursor_Key, Limit):
+
+	# Tie Log Pages To The Newest And Oldest Matching Log, To The Page And Route They Show And To The Deployed Templates
+	return Conditional.Get_Validators(Version, Static_Assets.Get_Version(), request.path, Feed.Get_Page_Cache_Key(Filters, Cursor_Key, Limit))
+
+# Set Validators
+def Set_Validators(Page, Validators):
+
+	# Set Weak ETag And Last Modified Time
+	return Conditional.Set_Validators(Page, Validators)
+
+# Get Not Modified Response
+def Get_Not_Modified(Validators):
+
+	# Return Response When The Client Copy Is Current
+	if Conditional.Is_Not_Modified(request, Validators):
+		return Set_Validators(app.response_class('', status=304), Validators)
+
+
+
+
+
+
+@app.route("/")
+async def hello():
+
+	# Parse Page Request
+	Filters, Cursor_Key, Limit = Parse_Page_Request(request.args)
+
+	# Skip Querying And Rendering Unchanged Pages
+	Not_Modified = Get_Not_Modified(Get_Log_Validators(await Get_Cached_Log_Version(Filters), Filters, Cursor_Key, Limit))
+	if Not_Modified is not None:
+		return Not_Modified
+
+	# Get Log Page
+	Entry = await Get_Cached_Log_Page(Filters, Cursor_Key, Limit)
+
+	# Unpack Log Page
+	Variables, Next_Cursor, Version = Entry['Value']
+
+	# Keep Filters Across Pages
+	Filter_Args = Feed.Get_Filter_Arguments(request.args)
+
+	# Stream Rows Newer Than The Page On The First Page
+	Stream_After = Feed.Get_Stream_Start(Variables, Cursor_Key)
+
+	return Set_Validators(await make_response(await render_template("home.html", Variables=Variables, Next_Cursor=Next_Cursor, Filter_Args=Filter_Args, Is_First_Page=Cursor_Key is None, Stream_After=Stream_After, name='Gunce')), Get_Log_Validators(Version, Filters, Cursor_Key, Limit))
+
+# Log Feed API
+@app.route("/api/logs")
+async def Log_Feed():
+
+	# Parse Page Request
+	Filters, Cursor_Key, Limit = Parse_Page_Request(request.args)
+
+	# Skip Querying And Serializing Unchanged Pages
+	Not_Modified = Get_Not_Modified(Get_Log_Validators(await Get_Cached_Log_Version(Filters), Filters, Cursor_Key, Limit))
+	if Not_Modified is not None:
+		return Not_Modified
+
+	# Get Log Page
+	Entry = await Get_Cached_Log_Page(Filters, Cursor_Key, Limit)
+
+	# Unpack Log Page
+	Logs, Next_Cursor, Version = Entry['Value']
+
+	# Return Log Page
+	return Set_Validators(jsonify({'Logs': Logs, 'Next_Cursor': Next_Cursor}), Get_Log_Validators(Version, Filters, Cursor_Key, Limit))
+
+
+
+
+
+# Fleet Page
+@app.route("/fleet")
+async def Fleet_Page():
+
+	# Parse Fleet Request
+	try:
+		Sort, Direction, After_Key = Fleet.Parse_Fleet_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Devices, Next_Cursor = Fleet.Format_Fleet(await Async_Database.Read_Rows(Fleet.Build_Fleet_Query(Sort, Direction, After_Key)))
+	except SQLAlchemyError as e:
+		Devices, Next_Cursor = [], None
+
+	return await render_template("fleet.html", Devices=Devices, Next_Cursor=Next_Cursor, Sort=Sort, Direction=Direction, Is_First_Page=After_Key is None, Columns=Fleet.Column_Titles)
+
+# Device Page
+@app.route("/device/<Device_ID>")
+async def Device_Page(Device_ID):
+
+	# Try to query the database
+	try:
+		Device = await Async_Database.Load_Device(Device_ID)
+	except SQLAlchemyError as e:
+		abort(503)
+
+	# Unknown Device
+	if Device is None:
+		abort(404)
+
+	return await render_template("device.html", Device=Device)
+
+# Rule Trigger Page
+@app.route("/rules/triggers")
+async def Trigger_Page():
+
+	# Parse Trigger Request
+	try:
+		Before_ID = Rule_Engine.Parse_Trigger_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Triggers, Next_Cursor = Rule_Engine.Format_Triggers(await Async_Database.Read_Rows(Rule_Engine.Build_Trigger_Query(Before_ID)))
+	except SQLAlchemyError as e:
+		Triggers, Next_Cursor = [], None
+
+	return await render_template("triggers.html", Triggers=Triggers, Next_Cursor=Next_Cursor, Is_First_Page=Before_ID is None)
+
+# Operator Page
+@app.route("/operators")
+async def Operator_Page():
+
+	# Parse Operator Request
+	try:
+		Arguments = Operators.Parse_Operator_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+		Operator_Rows = await Async_Database.Read_Rows(Operators.Build_Operator_Query(Arguments['Start_Time'], Arguments['End_Time']))
+		Daily_Rows = await Async_Database.Read_Rows(Operators.Build_Daily_Query(Arguments['Operator_ID'], Arguments['Start_Time'], Arguments['End_Time']))
+		await Async_Database.Refresh_Operators({Row.Operator_ID for Row in Operator_Rows} | {Arguments['Operator_ID']})
+	except SQLAlchemyError as e:
+		Operator_Rows, Daily_Rows = [], []
+
+	# Format Operators, Countries And Days
+	Operator_List, Countries, Days = Operators.Format_Operators(Operator_Rows, Daily_Rows)
+
+	return await render_template("operators.html", Operators=Operator_List, Countries=Countries, Days=Days, Arguments=Arguments, Selected=Operators.Directory.Get(Arguments['Operator_ID']) if Arguments['Operator_ID'] is not None else None)
+
+# Triage Page
+@app.route("/unknown")
+async def Triage_Page():
+
+	# Parse Triage Request
+	try:
+		Arguments = Triage.Parse_Triage_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+
+		# Search Payloads By Substring
+		if Arguments['Search']:
+			Payloads, Next_Cursor = Triage.Format_Search(await Async_Database.Read_Rows(Triage.Build_Search_Query(Arguments['Search'], Arguments['Before_ID'], Arguments['Client_IP'])))
+			Groups = []
+
+		# List Payload Groups With Their Busiest Sources
+		else:
+			Group_Rows = await Async_Database.Read_Rows(Triage.Build_Group_Query(Arguments['After_Key']))
+			Source_Rows = await Async_Database.Read_Rows(Triage.Build_Source_Query([Row.Content_Hash for Row in Group_Rows])) if Group_Rows else []
+			Groups, Next_Cursor = Triage.Format_Groups(Group_Rows, Source_Rows)
+			Payloads = []
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+		Payloads, Groups, Next_Cursor = [], [], None
+
+	return await render_template("unknown.html", Payloads=Payloads, Groups=Groups, Next_Cursor=Next_Cursor, Arguments=Arguments, Is_First_Page=Arguments['Before_ID'] is None and Arguments['After_Key'] is None)
+
+# Firmware Rollout Page
+@app.route("/firmware")
+async def Rollout_Page():
+
+	# Parse Rollout Request
+	try:
+		Arguments = Rollout.Parse_Rollout_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Try to query the database
+	try:
+
+		# Compare Counters With The Requested Or Newest Released Version
+		Target_ID = Arguments['Target_ID'] if Arguments['Target_ID'] is not None else await Async_Database.Read_Scalar(Rollout.Build_Target_Query())
+		Groups = Rollout.Format_Rollout(await Async_Database.Read_Rows(Rollout.Build_Rollout_Query()), Target_ID)
+
+		# List Devices Of One Cell
+		Devices, Next_Cursor = [], None
+		if Arguments['Version_ID'] is not None:
+			Devices, Next_Cursor = Rollout.Format_Devices(await Async_Database.Read_Rows(Rollout.Build_Device_Query(Arguments['Version_ID'], Arguments['Project_ID'], Arguments['Model_ID'], Arguments['After_ID'])))
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+		Groups, Devices, Next_Cursor = [], [], None
+
+	return await render_template("firmware.html", Groups=Groups, Devices=Devices, Next_Cursor=Next_Cursor, Arguments=Arguments)
+
+# Get Rollup ID
+async def Get_Rollup_ID():
+
+	# Try to query the database
+	try:
+
+		# Query the last measurement folded into the rollups
+		return await Async_Database.Read_Scalar(Rollup.Build_Watermark_Query())
+
+	# Handle Exceptions
+	except SQLAlchemyError as e:
+
+		# Return No Rollups, So Series Read Raw Rows
+		return None
+
+# Measurement Series API
+@app.route("/api/series")
+async def Series_Feed():
+
+	# Parse Series Request
+	try:
+		Arguments = Series.Parse_Series_Arguments(request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Find How Far The Rollups Reach
+	Arguments['Rollup_ID'] = await Get_Rollup_ID()
+
+	# Try to query the database
+	try:
+		Rows = await Async_Database.Read_Rows(Series.Build_Series_Query(Arguments))
+
+		# Load Calibrations Without Blocking The Loop
+		await Async_Database.Refresh_Calibrations()
+	except SQLAlchemyError as e:
+		Rows = []
+
+	# Return Downsampled Series
+	return jsonify(Series.Format_Series(Rows, Arguments))
+
+# Export API
+@app.route("/export/<Name>")
+async def Export_Feed(Name):
+
+	# Parse Export Request
+	try:
+		Arguments = Export.Parse_Export_Arguments(Name, request.args)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Generate Export Chunks
+	async def Generate():
+
+		# Load Calibrations Without Blocking The Loop
+		if Arguments['Name'] == 'measurements':
+			await Async_Database.Refresh_Calibrations()
+
+		# Encode One Server Side Cursor Chunk At A Time
+		Encoder = Export.Get_Encoder(Arguments)
+		yield Encoder.Begin()
+		async for Rows in Async_Database.Stream_Rows(Export.Build_Export_Query(Arguments), Export.Chunk_Size):
+			yield Encoder.Encode(Rows)
+		yield Encoder.Finish()
+
+	# Return Streaming Download Without A Response Timeout
+	Download = Response(Generate(), mimetype=Export.Export_Formats[Arguments['Format']][0], headers=Export.Get_Export_Headers(Arguments))
+	Download.timeout = None
+	return Download
+
+# Pool Status API
+@app.route("/api/pool")
+async def Pool_Status():
+
+	# Return Pool Checkout Statistics
+	return jsonify(Database.Get_Pool_Status(Async_Database.DB_Async_Engine.sync_engine))
+
+# Metrics Endpoint
+@app.route("/metrics")
+async def Metrics():
+
+	# Return Prometheus Text Exposition
+	return Response(Profile.Render_Metrics(Async_Database.DB_Async_Engine.sync_engine), mimetype='text/plain; version=0.0.4')
+
+# Static Asset Endpoint
+@app.route("/assets/<Name>")
+async def Static_Asset(Name):
+
+	# Find The Built Asset In The Best Encoding The Client Accepts
+	Asset = Static_Assets.Resolve(Name, request.accept_encodings)
+	if Asset is None:
+		abort(404)
+
+	# Return Asset
+	Path, Mimetype, Encoding = Asset
+	return Assets.Set_Headers(await send_file(Path, mimetype=Mimetype), Encoding)
+
+# Live Log Stream
+@app.route("/stream/logs")
+async def Log_Stream():
+
+	# Parse Stream Request
+	try:
+		Filters, Last_Log_ID = Feed.Parse_Stream_Arguments(request.args, request.headers)
+	except ValueError as e:
+		abort(400, description=str(e))
+
+	# Generate Server Sent Events
+	async def Generate():
+
+		# Wait For Shared Poller Batches
+		async for Rows in Live_Logs.Subscribe(Last_Log_ID):
+
+			# Send Matching Rows Or Keepalive
+			Events = Feed.Format_Events(Rows, Filters)
+			if Events:
+				yield Events.encode()
+
+	# Return Event Stream
+	Stream = Response(Generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+	Stream.timeout = None
+	return Stream
+
+
+
+
+
+# Run the App
+if __name__ == "__main__":
+	app.run(host='0.0.0.0', port=8000, debug=True)
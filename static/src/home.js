@@ -0,0 +1,39 @@
+// Prepend live log rows from the server sent event stream on the first page
+(function () {
+  var body = document.getElementById('log-rows');
+  if (!body || !body.dataset.stream || !window.EventSource) {
+    return;
+  }
+
+  var maxRows = 500;
+
+  function cell(text) {
+    var td = document.createElement('td');
+    td.textContent = text;
+    return td;
+  }
+
+  function badge(text, className) {
+    var span = document.createElement('span');
+    span.className = 'badge ' + className;
+    span.textContent = text;
+    var td = document.createElement('td');
+    td.appendChild(span);
+    return td;
+  }
+
+  var source = new EventSource(body.dataset.stream);
+  source.addEventListener('log', function (event) {
+    var log = JSON.parse(event.data);
+    var row = document.createElement('tr');
+    row.appendChild(cell(log.Create_Time));
+    row.appendChild(cell(log.Device_ID));
+    row.appendChild(badge(log.Log_Level_ID, log.Log_Level_Badge_Class));
+    row.appendChild(badge(log.Service_ID, log.Service_Badge_Class));
+    row.appendChild(cell(log.Log_Description_ID));
+    body.insertBefore(row, body.firstChild);
+    while (body.rows.length > maxRows) {
+      body.deleteRow(-1);
+    }
+  });
+})();
@@ -0,0 +1,35 @@
+# Setup Root Path
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Set Required Settings, So Modules Import Without An env File
+for Key, Value in {
+	'SERVER_NAME': 'localhost',
+	'PROJECT_ROOT': 'PostOffice',
+	'DB_HOSTNAME': 'localhost',
+	'DB_PORT': '5432',
+	'DB_PASSWORD': 'postgres',
+	'DB_NAME': 'postoffice',
+	'DB_USERNAME': 'postgres',
+}.items():
+	os.environ.setdefault(Key, Value)
+
+# Import Packages
+import pytest
+from sqlalchemy.exc import SQLAlchemyError
+
+# Database Fixture
+@pytest.fixture
+def Database_Engine():
+
+	# Skip Tests That Need PostgreSQL When It Is Not Reachable
+	from Setup import Database
+	try:
+		with Database.DB_Engine.connect() as Connection:
+			Connection.exec_driver_sql('SELECT 1')
+	except SQLAlchemyError:
+		pytest.skip('PostgreSQL is not reachable')
+
+	# Return Engine
+	return Database.DB_Engine
@@ -0,0 +1,25 @@
+# Import Packages
+from sqlalchemy import MetaData, Table, Column, Index, Integer, String, DateTime
+from Setup import Audit
+
+# Redundant Indexes
+def test_prefix_index_is_redundant():
+
+	# A Plain Index On The Leading Column Of A Wider One Adds Nothing
+	Metadata = MetaData()
+	Table('Sample', Metadata, Column('Sample_ID', Integer, primary_key=True), Column('Device_ID', String), Column('Create_Time', DateTime),
+		Index('idx_sample_device', 'Device_ID'),
+		Index('idx_sample_device_time', 'Device_ID', 'Create_Time'),
+	)
+	assert Audit.Find_Redundant_Indexes(Metadata) == [('Sample', 'idx_sample_device', 'idx_sample_device_time')]
+
+# Partial Indexes
+def test_partial_index_neither_covers_nor_is_covered():
+
+	# A Unique Partial Index Holds Only Open Rows, So The Plain Index Stays
+	Metadata = MetaData()
+	Sample = Table('Sample', Metadata, Column('Sample_ID', Integer, primary_key=True), Column('Device_ID', String), Column('Clear_Time', DateTime))
+	Index('idx_sample_device', Sample.c.Device_ID)
+	Index('idx_sample_open', Sample.c.Device_ID, Sample.c.Sample_ID, unique=True, postgresql_where=Sample.c.Clear_Time.is_(None))
+	Index('idx_sample_open_device', Sample.c.Device_ID, postgresql_where=Sample.c.Clear_Time.is_(None))
+	assert Audit.Find_Redundant_Indexes(Metadata) == []
@@ -0,0 +1,43 @@
+# Import Packages
+import asyncio
+from Setup import Cache
+
+# Bypassed Cache
+def test_bypass_loads_every_call():
+
+	# Count Loads Through A Bypassed Cache
+	Results = Cache.Result_Cache(Cache.Memory_Backend(), 60)
+	Results.Bypass = True
+	Loads = []
+	for _ in range(3):
+		assert Results.Get('Key', lambda: Loads.append(1) or len(Loads))['Value'] == len(Loads)
+	assert len(Loads) == 3
+
+	# Nothing Was Stored For Later Calls
+	assert Results.Backend.Get('Key') is None
+
+# Bypassed Async Cache
+def test_bypass_skips_async_coalescing():
+
+	# Concurrent Loads Of One Key Each Reach The Loader
+	Results = Cache.Result_Cache(Cache.Memory_Backend(), 60)
+	Results.Bypass = True
+	Loads = []
+	async def Loader():
+		Loads.append(1)
+		await asyncio.sleep(0.01)
+		return len(Loads)
+	async def Run():
+		return await asyncio.gather(*(Results.Async_Get('Key', Loader) for _ in range(3)))
+	asyncio.run(Run())
+	assert len(Loads) == 3
+
+# Cached Calls
+def test_cache_serves_repeat_calls():
+
+	# Without The Bypass The Second Call Is Served From The Backend
+	Results = Cache.Result_Cache(Cache.Memory_Backend(), 60)
+	Loads = []
+	Results.Get('Key', lambda: Loads.append(1))
+	Results.Get('Key', lambda: Loads.append(1))
+	assert len(Loads) == 1
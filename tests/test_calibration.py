@@ -0,0 +1,44 @@
+# Import Packages
+import asyncio
+import logging
+import numpy
+from sqlalchemy.exc import OperationalError
+from Setup import Calibration, Async_Database
+
+# Failed Async Refresh
+def test_failed_async_refresh_keeps_lookup(monkeypatch, caplog):
+
+	# Serve A Known Lookup That Has Expired
+	Table = Calibration.Calibration_Table(60)
+	Table.Store([('DEV0', 1, 2.0, 1.0)], [(1, None, 10.0)])
+	Table.Load_Time = float('-inf')
+	monkeypatch.setattr(Calibration, 'Calibrations', Table)
+
+	# Fail The Async Read And Any Blocking Load
+	async def Read_Rows(Statement):
+		raise OperationalError('SELECT', {}, Exception('connection refused'))
+	monkeypatch.setattr(Async_Database, 'Read_Rows', Read_Rows)
+	monkeypatch.setattr(Table, 'Load', lambda: (_ for _ in ()).throw(AssertionError('blocking load')))
+
+	# The Refresh Logs And Returns
+	with caplog.at_level(logging.WARNING, logger='PostOffice.Calibration'):
+		asyncio.run(Async_Database.Refresh_Calibrations())
+	assert 'keeping the previous lookup' in caplog.text
+
+	# The Previous Lookup Still Applies Without Reloading
+	assert Table.Apply('DEV0', 1, [3.0, 5.0]).tolist() == [7.0, 10.0]
+	assert numpy.isnan(Table.Apply('DEV0', 1, [None])[0])
+
+# Lookup Swap
+def test_reload_swaps_whole_lookup():
+
+	# A Reader Holding The Old Lookup Keeps Matching Indexes And Arrays
+	Table = Calibration.Calibration_Table(60)
+	Table.Store([('DEV0', 1, 2.0, 1.0), ('DEV1', 1, 3.0, 0.0)], [(1, None, None)])
+	Before = Table.Lookup
+	Table.Store([], [])
+	assert Before.Gain[Before.Pair_Index[('DEV1', 1)]] == 3.0
+	assert Table.Lookup is not Before
+
+	# New Calls Use The New Lookup Only
+	assert Table.Apply_Batch(['DEV0', 'DEV1'], [1, 1], [3.0, 3.0]).tolist() == [3.0, 3.0]
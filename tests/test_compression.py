@@ -0,0 +1,61 @@
+# Import Packages
+import gzip
+import asyncio
+from flask import Flask, Response, jsonify
+from Setup import Compression
+
+# Compressed App
+def Compressed_App():
+
+	# Serve A Large Page, A Small Page, A Download And An Event Stream
+	App = Flask(__name__)
+	App.add_url_rule('/large', 'Large', lambda: jsonify({'Rows': ['row'] * 1000}))
+	App.add_url_rule('/small', 'Small', lambda: jsonify({'Rows': []}))
+	App.add_url_rule('/download', 'Download', lambda: Response((f'{Index},row\n' for Index in range(1000)), mimetype='text/csv'))
+	App.add_url_rule('/events', 'Events', lambda: Response(iter(['data: 1\n\n'] * 100), mimetype='text/event-stream'))
+	Compression.Install(App)
+	return App.test_client()
+
+# Whole Bodies
+def test_large_body_is_gzipped():
+
+	# Compress For Clients Accepting Gzip
+	Client = Compressed_App()
+	Page = Client.get('/large', headers={'Accept-Encoding': 'gzip'})
+	assert Page.headers['Content-Encoding'] == 'gzip'
+	assert 'Accept-Encoding' in Page.headers['Vary']
+	assert gzip.decompress(Page.data) == Client.get('/large').data
+
+	# Leave Plain For Other Clients And For Small Bodies
+	assert 'Content-Encoding' not in Client.get('/large').headers
+	assert 'Content-Encoding' not in Client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+
+# Streamed Bodies
+def test_streamed_body_is_gzipped_in_chunks():
+
+	# Downloads Are Compressed Without A Content Length
+	Download = Compressed_App().get('/download', headers={'Accept-Encoding': 'gzip'})
+	assert Download.headers['Content-Encoding'] == 'gzip'
+	assert 'Content-Length' not in Download.headers
+	assert gzip.decompress(Download.data).decode().splitlines()[-1] == '999,row'
+
+# Event Streams
+def test_event_stream_stays_plain():
+
+	# Live Rows Are Never Held In A Compressor
+	assert 'Content-Encoding' not in Compressed_App().get('/events', headers={'Accept-Encoding': 'gzip'}).headers
+
+# Async Bodies
+def test_async_body_is_gzipped():
+
+	# Compress A Quart Response The Same Way
+	from quart import Quart
+	App = Quart(__name__)
+	App.add_url_rule('/large', 'Large', lambda: {'Rows': ['row'] * 1000})
+	Compression.Install(App, Is_Async=True)
+	async def Get():
+		Page = await App.test_client().get('/large', headers={'Accept-Encoding': 'gzip'})
+		return Page.headers.get('Content-Encoding'), await Page.get_data()
+	Encoding, Data = asyncio.run(Get())
+	assert Encoding == 'gzip'
+	assert b'"row"' in gzip.decompress(Data)
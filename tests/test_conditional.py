@@ -0,0 +1,49 @@
+# Import Packages
+from datetime import datetime, timezone
+from werkzeug.test import EnvironBuilder
+from werkzeug.wrappers import Request
+from Setup import Conditional
+
+# Define Version
+Version = {'Newest_ID': 2, 'Oldest_ID': 1, 'Newest_Time': '2024-01-01T12:00:00.500000+00:00'}
+
+# Build Request
+def Build_Request(Headers):
+
+	# Return Request With The Given Headers
+	return Request(EnvironBuilder(headers=Headers).get_environ())
+
+# Validators
+def test_validators_follow_version_and_parts():
+
+	# Any Change Of Version Or Page Changes The ETag
+	ETag, Last_Modified = Conditional.Get_Validators(Version, 'assets', '/', 'page-1')
+	assert ETag != Conditional.Get_Validators(dict(Version, Newest_ID=3), 'assets', '/', 'page-1')[0]
+	assert ETag != Conditional.Get_Validators(Version, 'assets', '/', 'page-2')[0]
+	assert Last_Modified == datetime(2024, 1, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+
+# Not Modified
+def test_not_modified_checks():
+
+	# Weak ETags Match, Which Wins Over Dates
+	Validators = Conditional.Get_Validators(Version, 'assets')
+	assert Conditional.Is_Not_Modified(Build_Request({'If-None-Match': f'W/"{Validators[0]}"'}), Validators)
+	assert not Conditional.Is_Not_Modified(Build_Request({'If-None-Match': '"other"', 'If-Modified-Since': 'Mon, 01 Jan 2024 12:00:00 GMT'}), Validators)
+
+	# Dates Compare At Second Precision
+	assert Conditional.Is_Not_Modified(Build_Request({'If-Modified-Since': 'Mon, 01 Jan 2024 12:00:00 GMT'}), Validators)
+	assert not Conditional.Is_Not_Modified(Build_Request({'If-Modified-Since': 'Mon, 01 Jan 2024 11:59:59 GMT'}), Validators)
+
+# Filtered Pages
+def test_etag_is_scoped_to_filters(Database_Engine):
+
+	# Pages With Different Filters Carry Different ETags
+	import app
+	Client = app.app.test_client()
+	Page = Client.get('/?device=DEV0')
+	assert Page.headers['ETag'] != Client.get('/?device=DEV1').headers['ETag']
+	assert Page.headers['ETag'] != Client.get('/api/logs?device=DEV0').headers['ETag']
+
+	# Only The Page The ETag Came From Answers 304
+	assert Client.get('/?device=DEV0', headers={'If-None-Match': Page.headers['ETag']}).status_code == 304
+	assert Client.get('/?device=DEV1', headers={'If-None-Match': Page.headers['ETag']}).status_code == 200
@@ -0,0 +1,45 @@
+# Import Packages
+import pytest
+from sqlalchemy import event, select, func
+from Setup import Device_Detail, Models
+
+# Define Round Trips Per Render, Device, Calibrations, Streams And Logs
+Query_Budget = 4
+
+# Busiest Device Fixture
+@pytest.fixture
+def Device_ID(Database_Engine):
+
+	# Pick The Device With The Most Streams, So Joined Loads Have Rows To Multiply
+	with Database_Engine.connect() as Connection:
+		Device_ID = Connection.execute(select(Models.Stream.Device_ID).group_by(Models.Stream.Device_ID).order_by(func.count().desc()).limit(1)).scalar()
+	if Device_ID is None:
+		pytest.skip('No streams to load')
+	return Device_ID
+
+# Device Page Statement Count
+def test_device_page_statement_count(Database_Engine, Device_ID):
+
+	# Count Every Statement Sent While The Page Loads
+	Statements = []
+	Listener = lambda Connection, Cursor, Statement, *Arguments: Statements.append(Statement)
+	event.listen(Database_Engine, 'before_cursor_execute', Listener)
+	try:
+		Device = Device_Detail.Load_Device(Device_ID)
+	finally:
+		event.remove(Database_Engine, 'before_cursor_execute', Listener)
+
+	# The Count Follows The Loader Strategies, Not The Number Of Streams Or Calibrations
+	assert Device is not None and Device['Streams']
+	assert len(Statements) == Query_Budget, '\n\n'.join(Statements)
+
+# Unplanned Lazy Loads
+def test_unplanned_lazy_load_raises(Database_Engine, Device_ID):
+
+	# Relationships Outside The Loader Options Refuse To Load
+	from sqlalchemy.exc import InvalidRequestError
+	from Setup import Database
+	with Database.DB_Read_Session_Scope() as db:
+		Device = db.execute(Device_Detail.Build_Device_Query(Device_ID)).unique().scalar_one()
+		with pytest.raises(InvalidRequestError):
+			Device.streams
@@ -0,0 +1,66 @@
+# Import Packages
+import asyncio
+from types import SimpleNamespace
+from sqlalchemy.exc import OperationalError
+from Setup import Dimension, Query, Async_Database
+
+# Counted Cache
+def Counted_Cache(monkeypatch, Rows, TTL=60):
+
+	# Serve Fixed Rows And Count Every Read
+	Reads = []
+	monkeypatch.setattr(Query, 'Read_Rows', lambda Statement: Reads.append(Statement) or Rows)
+	return Dimension.Dimension_Cache(TTL), Reads
+
+# Unknown Keys
+def test_unknown_key_reloads_once_per_ttl(monkeypatch):
+
+	# Resolve A Key The Table Does Not Have Several Times
+	Cache, Reads = Counted_Cache(monkeypatch, [(1, 'INFO')])
+	for _ in range(3):
+		assert Cache.Resolve('Log_Level', 99, 'Unknown') == 'Unknown'
+
+	# Only The First Lookup Reads The Table
+	assert len(Reads) == 1
+	assert not Cache.Needs_Load('Log_Level', {1, 99})
+
+	# A Different Unknown Key Still Triggers One Reload
+	assert Cache.Resolve('Log_Level', 98) is None
+	assert len(Reads) == 2
+	assert not Cache.Needs_Load('Log_Level', {99})
+
+# Null Names
+def test_null_name_is_cached(monkeypatch):
+
+	# A Row Whose Name Is NULL Resolves To The Default Without Reloading
+	Cache, Reads = Counted_Cache(monkeypatch, [(1, None)])
+	for _ in range(3):
+		assert Cache.Resolve('Service', 1, '-') == '-'
+	assert len(Reads) == 1
+
+# Expired Misses
+def test_misses_expire_with_the_ttl(monkeypatch):
+
+	# With No TTL Every Lookup Of An Unknown Key Reads Again
+	Cache, Reads = Counted_Cache(monkeypatch, [(1, 'INFO')], TTL=-1)
+	Cache.Resolve('Log_Level', 99)
+	Cache.Resolve('Log_Level', 99)
+	assert len(Reads) == 2
+
+# Failed Async Refresh
+def test_failed_async_refresh_keeps_map(monkeypatch):
+
+	# Serve A Known Map That Has Expired
+	Cache = Dimension.Dimension_Cache(60)
+	Cache.Store('Log_Level', {1: 'INFO'})
+	Cache.Load_Times['Log_Level'] = float('-inf')
+	monkeypatch.setattr(Dimension, 'Dimensions', Cache)
+
+	# Fail The Async Read
+	async def Read_Rows(Statement):
+		raise OperationalError('SELECT', {}, Exception('connection refused'))
+	monkeypatch.setattr(Async_Database, 'Read_Rows', Read_Rows)
+
+	# The Refresh Returns And The Previous Map Is Kept
+	asyncio.run(Async_Database.Refresh_Dimensions([SimpleNamespace(Log_Level_ID=1)], {'Log_Level': 'Log_Level_ID'}))
+	assert Cache.Maps['Log_Level'] == {1: 'INFO'}
@@ -0,0 +1,35 @@
+# Import Packages
+import pytest
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from sqlalchemy.dialects import postgresql
+from Setup import Fleet
+
+# Fleet Cursors
+def test_cursor_round_trip():
+
+	# Times, Text And Null Sort Keys Come Back As They Went In
+	Time = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+	assert Fleet.Decode_Cursor(Fleet.Encode_Cursor(Time, 'DEV|0'), 'last_stream') == (Time, 'DEV|0')
+	assert Fleet.Decode_Cursor(Fleet.Encode_Cursor('1.0', 'DEV0'), 'firmware') == ('1.0', 'DEV0')
+	assert Fleet.Decode_Cursor(Fleet.Encode_Cursor(None, 'DEV0'), 'model') == (None, 'DEV0')
+
+	# Malformed Cursors Are Rejected
+	with pytest.raises(ValueError):
+		Fleet.Decode_Cursor('not a cursor', 'device')
+
+# Fleet Keyset
+def test_fleet_query_seeks_instead_of_offset():
+
+	# Later Pages Seek Past The Last Row, Keeping Null Keys At The End Descending
+	SQL = str(Fleet.Build_Fleet_Query('firmware', 'desc', ('1.0', 'DEV0')).compile(dialect=postgresql.dialect()))
+	assert 'OFFSET' not in SQL
+	assert '("Device_Summary"."Firmware", "Device_Summary"."Device_ID") <' in SQL
+	assert '"Device_Summary"."Firmware" IS NULL' in SQL
+
+	# The Cursor Points At The Last Kept Row
+	Rows = [SimpleNamespace(Sort_Key=str(Index), Device_ID=f'DEV{Index}', _asdict=dict) for Index in range(Fleet.Page_Size + 1)]
+	Devices, Next_Cursor = Fleet.Format_Fleet(Rows)
+	assert len(Devices) == Fleet.Page_Size
+	assert Fleet.Decode_Cursor(Next_Cursor, 'firmware') == (str(Fleet.Page_Size - 1), f'DEV{Fleet.Page_Size - 1}')
+	assert Fleet.Format_Fleet(Rows[:Fleet.Page_Size])[1] is None
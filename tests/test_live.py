@@ -0,0 +1,81 @@
+# Import Packages
+import time
+import asyncio
+from Setup import Live
+
+# Build Broadcaster
+def Build_Broadcaster(Log_IDs, Heads, Failures=0):
+
+	# Serve Heads In Turn And Fail The First Fetches
+	State = {'Heads': list(Heads), 'Failures': Failures}
+	def Head():
+		return State['Heads'].pop(0) if len(State['Heads']) > 1 else State['Heads'][0]
+	def Fetch(Last_Log_ID):
+		if State['Failures']:
+			State['Failures'] -= 1
+			raise RuntimeError('Fetch failed')
+		return [(Log_ID, None, {'Log_ID': Log_ID}) for Log_ID in Log_IDs if Log_ID > Last_Log_ID]
+	return Live.Log_Broadcaster(Fetch, Head, Poll_Interval=0.01, Heartbeat=0.05)
+
+# Read Log IDs
+def Read_Log_IDs(Broadcaster, Last_Log_ID, Count):
+
+	# Collect Batches Until Enough Rows Arrived Or Two Seconds Passed
+	Log_IDs, Batches, Deadline = [], Broadcaster.Subscribe(Last_Log_ID), time.monotonic() + 2
+	for Rows in Batches:
+		Log_IDs += [Row[0] for Row in Rows]
+		if len(Log_IDs) >= Count or time.monotonic() > Deadline:
+			break
+	Batches.close()
+	return Log_IDs
+
+# Start Position
+def test_start_position_is_clamped():
+
+	# Positions Beyond The Newest Row Start At It, Old Ones At Most One Buffer Back
+	assert Live.Get_Start(None, 100, 10) == 100
+	assert Live.Get_Start(1000, 100, 10) == 100
+	assert Live.Get_Start(5, 100, 10) == 90
+	assert Live.Get_Start(95, 100, 10) == 95
+
+# Position Past The Head
+def test_position_past_head_keeps_the_tail_alive():
+
+	# A Client Claiming To Have Seen Rows That Do Not Exist Yet Still Receives The New Ones
+	Broadcaster = Build_Broadcaster([1, 2, 3, 4, 5, 6, 7], [5])
+	assert Read_Log_IDs(Broadcaster, 1000, 2) == [6, 7]
+	assert Broadcaster.Last_Log_ID == 7
+
+# Failures
+def test_poller_survives_failures():
+
+	# A Missing Head And A Failing Fetch Are Retried Instead Of Replaying Or Stopping The Tail
+	Broadcaster = Build_Broadcaster([1, 2, 3, 4], [None, 2], Failures=1)
+	assert Read_Log_IDs(Broadcaster, None, 2) == [3, 4]
+	assert Broadcaster.Thread.is_alive()
+
+# Async Failures
+def test_async_poller_survives_failures():
+
+	# The Async Poller Retries A Missing Head And A Failing Fetch The Same Way
+	State = {'Heads': [None, 5], 'Failures': 1}
+	async def Head():
+		return State['Heads'].pop(0) if len(State['Heads']) > 1 else State['Heads'][0]
+	async def Fetch(Last_Log_ID):
+		if State['Failures']:
+			State['Failures'] -= 1
+			raise RuntimeError('Fetch failed')
+		return [(Log_ID, None, {'Log_ID': Log_ID}) for Log_ID in (4, 5, 6, 7) if Log_ID > Last_Log_ID]
+	Broadcaster = Live.Async_Log_Broadcaster(Fetch, Head, Poll_Interval=0.01, Heartbeat=0.05)
+
+	# Subscribe Past The Head
+	async def Read():
+		Log_IDs, Batches = [], Broadcaster.Subscribe(1000)
+		async for Rows in Batches:
+			Log_IDs += [Row[0] for Row in Rows]
+			if len(Log_IDs) >= 2:
+				break
+		await Batches.aclose()
+		Broadcaster.Task.cancel()
+		return Log_IDs
+	assert asyncio.run(asyncio.wait_for(Read(), 5)) == [6, 7]
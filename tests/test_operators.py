@@ -0,0 +1,51 @@
+# Import Packages
+import asyncio
+from types import SimpleNamespace
+from sqlalchemy.exc import OperationalError
+from Setup import Operators, Query, Async_Database
+
+# Define Operator Row
+Operator_Row = SimpleNamespace(Operator_ID=1, MCC_ISO='TR', MCC_Country_Name='Turkey', MNC_Brand_Name='Brand', MNC_Operator_Name='Operator', MNC_Operator_Image_URL=None)
+
+# Missing Operators
+def test_missing_operator_reloads_once_per_ttl(monkeypatch):
+
+	# Count Every Read Of The Operator Table
+	Reads = []
+	monkeypatch.setattr(Query, 'Read_Rows', lambda Statement: Reads.append(Statement) or [Operator_Row])
+	Directory = Operators.Operator_Directory(60)
+
+	# Refresh For A Page Naming An Operator The Table Does Not Have
+	for _ in range(3):
+		Directory.Refresh({1, 2})
+	assert len(Reads) == 1
+
+	# Both Resolve From The Cache, The Missing One As A Placeholder
+	assert Directory.Get(1)['Flag'] == '\U0001F1F9\U0001F1F7'
+	assert Directory.Get(2)['Operator'] == '2'
+	assert len(Reads) == 1
+
+# Cache Only Lookups
+def test_get_never_reads(monkeypatch):
+
+	# Lookups Before Any Refresh Return Placeholders Without Touching The Database
+	monkeypatch.setattr(Query, 'Read_Rows', lambda Statement: (_ for _ in ()).throw(AssertionError('read')))
+	assert Operators.Operator_Directory(60).Get(1)['Country'] == 'Unknown'
+
+# Failed Async Refresh
+def test_failed_async_refresh_keeps_map(monkeypatch):
+
+	# Serve A Known Map That Has Expired
+	Directory = Operators.Operator_Directory(60)
+	Directory.Store([Operator_Row])
+	Directory.Load_Time = float('-inf')
+	monkeypatch.setattr(Operators, 'Directory', Directory)
+
+	# Fail The Async Read
+	async def Read_Rows(Statement):
+		raise OperationalError('SELECT', {}, Exception('connection refused'))
+	monkeypatch.setattr(Async_Database, 'Read_Rows', Read_Rows)
+
+	# The Refresh Returns And The Previous Map Is Kept
+	asyncio.run(Async_Database.Refresh_Operators({1}))
+	assert Directory.Get(1)['Country'] == 'Turkey'
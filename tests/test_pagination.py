@@ -0,0 +1,78 @@
+# Import Packages
+import pytest
+from types import SimpleNamespace
+from datetime import datetime, timezone
+from Setup import Pagination, Live
+
+# Filter Times
+def test_filter_times_are_utc():
+
+	# Times Without An Offset Are Read As UTC, Others Keep Their Offset
+	Filters = Pagination.Parse_Log_Filters({'start': '2024-01-01T00:00:00', 'end': '2024-01-02T00:00:00+02:00'})
+	assert Filters['Start_Time'] == datetime(2024, 1, 1, tzinfo=timezone.utc)
+	assert Filters['End_Time'] == datetime(2024, 1, 1, 22, tzinfo=timezone.utc)
+
+# Stream With Start Filter
+def test_stream_with_start_filter(monkeypatch):
+
+	# Feed The Stream Two Logs, One Before And One After The Start Filter
+	import app
+	Logs = [
+		SimpleNamespace(Log_ID=1, Log_Level_ID=1, Service_ID=1, Device_ID='DEV0', Create_Time=datetime(2023, 12, 31, tzinfo=timezone.utc)),
+		SimpleNamespace(Log_ID=2, Log_Level_ID=1, Service_ID=1, Device_ID='DEV0', Create_Time=datetime(2024, 1, 2, tzinfo=timezone.utc)),
+	]
+	Fetch = lambda Last_Log_ID: [(Log.Log_ID, Log, {'Log_ID': Log.Log_ID}) for Log in Logs if Log.Log_ID > Last_Log_ID]
+	monkeypatch.setattr(app, 'Live_Logs', Live.Log_Broadcaster(Fetch, lambda: 0, Poll_Interval=0.01, Heartbeat=1))
+
+	# Read The First Event Batch
+	Response = app.app.test_client().get('/stream/logs?start=2024-01-01T00:00:00&after=0', buffered=False)
+	try:
+		Events = next(iter(Response.response))
+	finally:
+		Response.close()
+
+	# Only The Log After The Start Time Is Sent
+	Events = Events.decode() if isinstance(Events, bytes) else Events
+	assert Response.status_code == 200
+	assert 'id: 2\n' in Events
+	assert 'id: 1\n' not in Events
+
+# Cursor Round Trip
+def test_cursor_round_trip():
+
+	# Encode And Decode The Same Key
+	Create_Time = datetime(2024, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+	assert Pagination.Decode_Cursor(Pagination.Encode_Cursor(Create_Time, 42)) == (Create_Time, 42)
+
+# Empty Cursor
+def test_empty_cursor_starts_at_newest():
+
+	# No Cursor Means The First Page
+	assert Pagination.Decode_Cursor(None) is None
+	assert Pagination.Decode_Cursor('') is None
+
+# Malformed Cursor
+@pytest.mark.parametrize('Cursor', ['not base64!', 'Zm9v', 'MjAyNC0wMS0wMXx4'])
+def test_malformed_cursor_is_rejected(Cursor):
+
+	# Broken Cursors Become A Value Error The Routes Turn Into 400
+	with pytest.raises(ValueError):
+		Pagination.Decode_Cursor(Cursor)
+
+# Keyset Query
+def test_keyset_seeks_past_cursor():
+
+	# The Page Continues Strictly Below The Cursor Row And Fetches One Extra Row
+	from Setup import Feed
+	Statement = str(Feed.Build_Log_Query({}, (datetime(2024, 1, 1, tzinfo=timezone.utc), 7), 10).compile())
+	assert '("Log"."Create_Time", "Log"."Log_ID") < (' in Statement
+	assert 'ORDER BY "Log"."Create_Time" DESC, "Log"."Log_ID" DESC' in Statement
+	assert Feed.Build_Log_Query({}, None, 10)._limit == 11
+
+# Limit Clamping
+def test_limit_is_clamped():
+
+	# Limits Stay Between One And The Maximum Page Size
+	assert Pagination.Parse_Limit(None) == Pagination.Default_Page_Size
+	assert Pagination.Parse_Limit('0') == 1
+	assert Pagination.Parse_Limit('100000') == Pagination.Max_Page_Size
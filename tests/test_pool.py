@@ -0,0 +1,35 @@
+# Import Packages
+import pytest
+from Setup import Database
+from Setup.Config import APP_Settings
+
+# Derived Pool Limits
+@pytest.mark.parametrize('Workers, Expected', [(1, (10, 10)), (8, (5, 5)), (100, (1, 1))])
+def test_pool_limits_follow_worker_count(monkeypatch, Workers, Expected):
+
+	# Split The Default Budget Between Workers
+	monkeypatch.setattr(APP_Settings, 'DB_POOL_SIZE', 0)
+	monkeypatch.setattr(APP_Settings, 'DB_MAX_OVERFLOW', -1)
+	monkeypatch.setattr(APP_Settings, 'WEB_CONCURRENCY', Workers)
+	assert Database.Get_Pool_Limits() == Expected
+	assert Workers * sum(Expected) <= max(APP_Settings.DB_MAX_CONNECTIONS, 2 * Workers)
+
+# Explicit Pool Limits
+def test_explicit_pool_limits_win(monkeypatch):
+
+	# Configured Sizes Are Used As Given
+	monkeypatch.setattr(APP_Settings, 'DB_POOL_SIZE', 30)
+	monkeypatch.setattr(APP_Settings, 'DB_MAX_OVERFLOW', 0)
+	assert Database.Get_Pool_Limits() == (30, 0)
+
+# Statement Timeout
+def test_statement_timeout_is_lifted(monkeypatch):
+
+	# New Connections Carry The Web Timeout Until A Maintenance Command Lifts It
+	monkeypatch.setitem(Database.Statement_Timeout, 'Milliseconds', 1500)
+	Params = {}
+	Database.Set_Connect_Options(None, None, [], Params)
+	assert Params['options'] == '-c statement_timeout=1500'
+	Database.Lift_Statement_Timeout()
+	Database.Set_Connect_Options(None, None, [], Params)
+	assert 'options' not in Params
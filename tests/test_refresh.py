@@ -0,0 +1,68 @@
+# Import Packages
+import pytest
+from sqlalchemy import Table, Column, BigInteger, MetaData, insert, delete
+from Setup import Refresh, Models
+
+# Define Scratch Source Table
+Source = Table('Test_Refresh_Source', MetaData(), Column('Source_ID', BigInteger, primary_key=True, autoincrement=False))
+
+# Scratch Source Fixture
+@pytest.fixture
+def Source_Table(Database_Engine):
+
+	# Create An Empty Source And Forget Its Watermark
+	Refresh.Ensure_Tables()
+	Source.drop(Database_Engine, checkfirst=True)
+	Source.create(Database_Engine)
+	with Database_Engine.begin() as Connection:
+		Connection.execute(delete(Models.Watermark).where(Models.Watermark.Watermark_Name == Source.name))
+
+	# Hand Over Table
+	yield Source
+
+	# Drop Table And Watermark
+	Source.drop(Database_Engine, checkfirst=True)
+	with Database_Engine.begin() as Connection:
+		Connection.execute(delete(Models.Watermark).where(Models.Watermark.Watermark_Name == Source.name))
+
+# Collect Batches
+def Collect(Batches):
+
+	# Remember Each Batch Range
+	return lambda Connection, Low, High: Batches.append((Low, High))
+
+# Batches Over Gapped IDs
+def test_run_batches_counts_rows(Database_Engine, Source_Table):
+
+	# Insert IDs With Gaps
+	with Database_Engine.begin() as Connection:
+		Connection.execute(insert(Source_Table), [{'Source_ID': ID} for ID in (1, 2, 3, 10, 11, 25)])
+
+	# Every Row Is Folded In Once, In Bounded Batches, And Counted As A Row
+	Batches = []
+	assert Refresh.Run_Batches(Source_Table.name, Source_Table.c.Source_ID, Collect(Batches), 10) == 6
+	assert Batches == [(0, 10), (10, 20), (20, 25)]
+
+	# Nothing Left On The Next Run
+	assert Refresh.Run_Batches(Source_Table.name, Source_Table.c.Source_ID, Collect([]), 10) == 0
+
+# Batches Wait For Writers In Flight
+def test_run_batches_skips_uncommitted_lower_ids(Database_Engine, Source_Table, monkeypatch):
+
+	# Hold Back A Lower ID In An Open Transaction While A Higher One Commits
+	monkeypatch.setattr(Refresh, 'Settle_Timeout', 0.2)
+	Writer = Database_Engine.connect()
+	try:
+		Transaction = Writer.begin()
+		Writer.execute(insert(Source_Table).values(Source_ID=5))
+		with Database_Engine.begin() as Connection:
+			Connection.execute(insert(Source_Table).values(Source_ID=6))
+
+		# The Watermark Must Not Move Past The Row Still Being Written
+		assert Refresh.Run_Batches(Source_Table.name, Source_Table.c.Source_ID, Collect([]), 100) == 0
+
+		# Once It Commits, Both Rows Are Folded In
+		Transaction.commit()
+		assert Refresh.Run_Batches(Source_Table.name, Source_Table.c.Source_ID, Collect([]), 100) == 2
+	finally:
+		Writer.close()
@@ -0,0 +1,65 @@
+# Import Packages
+from datetime import datetime, timedelta, timezone
+from Setup import Rule_Engine
+
+# Define Start Time
+Start_Time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Compiled Rules
+def Compiled_Rules():
+
+	# Rule 1 Needs Both Temperature And Humidity High On DEV1
+	Rules = Rule_Engine.Rule_Index(60)
+	Rules.Store([('DEV1', 'AT', 1, 10, '>', 30.0), ('DEV1', 'AH', 1, 11, '>', 80.0)])
+	return Rules
+
+# Stream Rows
+def Stream_Rows(*Readings):
+
+	# One Stream Per Reading Pair, A Minute Apart
+	return [Row for Index, (Temperature, Humidity) in enumerate(Readings) for Row in (
+		(Index, 'DEV1', 'AT', Temperature, Start_Time + timedelta(minutes=Index)),
+		(Index, 'DEV1', 'AH', Humidity, Start_Time + timedelta(minutes=Index)),
+	)]
+
+# Chained Links
+def test_every_link_must_match():
+
+	# A Stream Fires Only When Both Links Hold
+	Triggers, Clears = Compiled_Rules().Evaluate(Stream_Rows((31, 50), (20, 90), (31, 90)), {})
+	assert [Trigger['Stream_ID'] for Trigger in Triggers] == [2]
+	assert Triggers[0]['Rule_Chain_ID'] == 10 and Triggers[0]['Clear_Time'] is None
+	assert Clears == {}
+
+# Open Triggers
+def test_open_trigger_is_not_repeated():
+
+	# Matching Streams Extend One Open Trigger, Which Clears When The Rule Stops Matching
+	Triggers, Clears = Compiled_Rules().Evaluate(Stream_Rows((31, 90), (32, 91), (20, 90), (31, 90)), {})
+	assert [(Trigger['Stream_ID'], Trigger['Clear_Time']) for Trigger in Triggers] == [(0, Start_Time + timedelta(minutes=2)), (3, None)]
+
+	# A Trigger Already Open In The Table Is Cleared Instead Of Reopened
+	Triggers, Clears = Compiled_Rules().Evaluate(Stream_Rows((31, 90), (20, 90)), {(1, 'DEV1'): None})
+	assert Triggers == []
+	assert Clears == {(1, 'DEV1'): Start_Time + timedelta(minutes=1)}
+
+# Incomplete Streams
+def test_stream_missing_a_link_is_not_judged():
+
+	# A Stream Without Humidity Neither Opens Nor Clears
+	Triggers, Clears = Compiled_Rules().Evaluate([(0, 'DEV1', 'AT', 10, Start_Time)], {(1, 'DEV1'): None})
+	assert (Triggers, Clears) == ([], {})
+
+# Variable Index
+def test_rules_are_indexed_by_device_and_variable():
+
+	# Each Device And Variable Lists Only The Rules It Takes Part In
+	Rules = Compiled_Rules()
+	Rules.Store([('DEV1', 'AT', 1, 10, '>', 30.0), ('DEV1', 'AH', 1, 11, '>', 80.0), ('DEV1', 'PM', 2, 12, '>', 5.0), ('DEV2', 'AT', 3, 13, '<', 0.0)])
+	assert Rules.Chains == {('DEV1', 'AT'): [1], ('DEV1', 'AH'): [1], ('DEV1', 'PM'): [2], ('DEV2', 'AT'): [3]}
+	assert Rules.Devices == {'DEV1', 'DEV2'}
+
+	# Readings Of Unregistered Variables Are Dropped And Rules On Other Variables Are Not Judged
+	Triggers, Clears = Rules.Evaluate(Stream_Rows((31, 90)) + [(0, 'DEV1', 'XX', 1, Start_Time)], {(2, 'DEV1'): None})
+	assert [Trigger['Rule_ID'] for Trigger in Triggers] == [1]
+	assert Clears == {}
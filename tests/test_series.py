@@ -0,0 +1,59 @@
+# Import Packages
+import numpy
+from datetime import datetime, timedelta, timezone
+from Setup import Series
+
+# Short Series
+def test_lttb_keeps_short_series():
+
+	# Series Already Within The Threshold Come Back Whole
+	X = numpy.arange(10, dtype=float)
+	assert list(Series.LTTB(X, X, 10)) == list(range(10))
+	assert list(Series.LTTB(X, X, 2)) == list(range(10))
+
+# Reduced Series
+def test_lttb_keeps_ends_and_order():
+
+	# Reduce A Noisy Series To The Threshold, Keeping Both Ends In Time Order
+	X = numpy.arange(1000, dtype=float)
+	Y = numpy.sin(X / 25) + numpy.random.default_rng(1).normal(0, 0.1, 1000)
+	Selected = Series.LTTB(X, Y, 100)
+	assert len(Selected) == 100
+	assert Selected[0] == 0 and Selected[-1] == 999
+	assert (numpy.diff(Selected) > 0).all()
+
+# Spikes
+def test_lttb_keeps_spikes():
+
+	# A Lone Spike Forms The Largest Triangle In Its Bucket
+	X = numpy.arange(1000, dtype=float)
+	Y = numpy.zeros(1000)
+	Y[[137, 642]] = [50, -50]
+	Selected = list(Series.LTTB(X, Y, 20))
+	assert 137 in Selected and 642 in Selected
+
+# Series Arguments
+def Series_Arguments(Rollup_ID, Device_ID=None):
+
+	# One Day At The Default Point Count, Where The Hourly Rollup Fits
+	End_Time = datetime(2024, 1, 2, tzinfo=timezone.utc)
+	return {'Device_ID': Device_ID, 'Variable_ID': 'AT', 'Start_Time': End_Time - timedelta(days=30), 'End_Time': End_Time, 'Points': 100, 'Method': 'minmax', 'Rollup_ID': Rollup_ID}
+
+# Raw Fallback
+def test_series_reads_raw_rows_before_first_rollup():
+
+	# Without A Rollup Watermark The Raw Rows Are Read, On Stream_Time For Device And Fleet Alike
+	for Device_ID in (None, 'DEV0'):
+		Statement = str(Series.Build_Series_Query(Series_Arguments(None, Device_ID)).compile())
+		assert Series.Get_Resolution(Series_Arguments(None, Device_ID)) is None
+		assert '"Measurement_Rollup"' not in Statement
+		assert '"Stream"."Stream_Time" >=' in Statement and '"Measurement"."Create_Time" >=' in Statement
+
+# Rollup Tail
+def test_series_fills_past_rollup_watermark():
+
+	# Rollups Cover Measurements Up To The Watermark, Newer Ones Come From Raw Rows
+	Statement = str(Series.Build_Series_Query(Series_Arguments(500)).compile())
+	assert Series.Get_Resolution(Series_Arguments(500)) == 3600
+	assert 'UNION ALL' in Statement and '"Measurement_Rollup"' in Statement
+	assert '"Measurement"."Measurement_ID" >' in Statement